@@ -1,26 +1,70 @@
-import json
-
-import requests
-
-# Request ee scale offset catalog
-eeCatalogScaleOffset = requests.get(
-    "https://raw.githubusercontent.com/davemlz/ee-catalog-scale-offset-params/main/list/ee-catalog-scale-offset-parameters.json"
-).json()
-# Get the datasets
-eeScaleDict = dict()
-eeOffsetDict = dict()
-datasets = list(eeCatalogScaleOffset.keys())
-for dataset in datasets:
-    datasetScaleDict = dict()
-    datasetOffsetDict = dict()
-    bands = list(eeCatalogScaleOffset[dataset].keys())
-    for band in bands:
-        datasetScaleDict[band] = eeCatalogScaleOffset[dataset][band]["scale"]
-        datasetOffsetDict[band] = eeCatalogScaleOffset[dataset][band]["offset"]
-    eeScaleDict[dataset] = datasetScaleDict
-    eeOffsetDict[dataset] = datasetOffsetDict
-# Save the dicts as json files
-with open("./eemont/data/ee-catalog-scale.json", "w") as fp:
-    json.dump(eeScaleDict, fp, indent=4, sort_keys=True)
-with open("./eemont/data/ee-catalog-offset.json", "w") as fp:
-    json.dump(eeOffsetDict, fp, indent=4, sort_keys=True)
+import json
+import struct
+
+import requests
+
+
+def write_packed_catalog(eeScaleDict, eeOffsetDict, path):
+    """Writes the scale and offset parameters as a packed, memory-mappable catalog.
+
+    Layout (little-endian):
+        - Header: magic b"EEMSO001", number of datasets (uint32), number of bands (uint32).
+        - Scale factors of all bands (float64[nBands]).
+        - Offset factors of all bands (float64[nBands]).
+        - Start of each dataset ID in the dataset IDs blob (uint32[nDatasets + 1]).
+        - Index of the first band of each dataset (uint32[nDatasets + 1]).
+        - Start of each band name in the band names blob (uint32[nBands + 1]).
+        - Dataset IDs blob (UTF-8, sorted by their UTF-8 bytes).
+        - Band names blob (UTF-8).
+    """
+    datasets = sorted(eeScaleDict.keys(), key=lambda x: x.encode("utf-8"))
+    datasetOffsets, bandStarts, bandOffsets = [0], [0], [0]
+    scales, offsets = [], []
+    datasetBlob, bandBlob = b"", b""
+    for dataset in datasets:
+        datasetBlob += dataset.encode("utf-8")
+        datasetOffsets.append(len(datasetBlob))
+        for band in sorted(eeScaleDict[dataset].keys()):
+            bandBlob += band.encode("utf-8")
+            bandOffsets.append(len(bandBlob))
+            scales.append(eeScaleDict[dataset][band])
+            offsets.append(eeOffsetDict[dataset][band])
+        bandStarts.append(len(scales))
+    with open(path, "wb") as fp:
+        fp.write(struct.pack("<8sII", b"EEMSO001", len(datasets), len(scales)))
+        fp.write(struct.pack(f"<{len(scales)}d", *scales))
+        fp.write(struct.pack(f"<{len(offsets)}d", *offsets))
+        fp.write(struct.pack(f"<{len(datasetOffsets)}I", *datasetOffsets))
+        fp.write(struct.pack(f"<{len(bandStarts)}I", *bandStarts))
+        fp.write(struct.pack(f"<{len(bandOffsets)}I", *bandOffsets))
+        fp.write(datasetBlob)
+        fp.write(bandBlob)
+
+
+if __name__ == "__main__":
+    # Request ee scale offset catalog
+    eeCatalogScaleOffset = requests.get(
+        "https://raw.githubusercontent.com/davemlz/ee-catalog-scale-offset-params/main/list/ee-catalog-scale-offset-parameters.json"
+    ).json()
+    # Get the datasets
+    eeScaleDict = dict()
+    eeOffsetDict = dict()
+    datasets = list(eeCatalogScaleOffset.keys())
+    for dataset in datasets:
+        datasetScaleDict = dict()
+        datasetOffsetDict = dict()
+        bands = list(eeCatalogScaleOffset[dataset].keys())
+        for band in bands:
+            datasetScaleDict[band] = eeCatalogScaleOffset[dataset][band]["scale"]
+            datasetOffsetDict[band] = eeCatalogScaleOffset[dataset][band]["offset"]
+        eeScaleDict[dataset] = datasetScaleDict
+        eeOffsetDict[dataset] = datasetOffsetDict
+    # Save the dicts as json files
+    with open("./eemont/data/ee-catalog-scale.json", "w") as fp:
+        json.dump(eeScaleDict, fp, indent=4, sort_keys=True)
+    with open("./eemont/data/ee-catalog-offset.json", "w") as fp:
+        json.dump(eeOffsetDict, fp, indent=4, sort_keys=True)
+    # Save the packed catalog used by eemont for the lookups
+    write_packed_catalog(
+        eeScaleDict, eeOffsetDict, "./eemont/data/ee-catalog-scale-offset.bin"
+    )
@@ -0,0 +1,94 @@
+"""Client-side cost of pd.DataFrame.toEEFeatureCollection().
+
+Compares one ee.Feature per row built with DataFrame.apply() (before) against the rows
+encoded column-wise into a single JSON string decoded by Earth Engine (after). The time
+to build the ee.FeatureCollection and to serialize its request is measured for 10k,
+100k and 1M rows. The per-row version is skipped above MAX_BEFORE rows.
+
+By default only the client side is measured: the JSON string of the rows is decoded by
+String.decodeJSON() and List.map() on the server when the collection is evaluated, and
+that cost is not included. With --server, the wall time of size().getInfo() is measured
+too (an authenticated Earth Engine account is required). Requests above the request size
+limit of Earth Engine fail and are reported as such.
+
+Usage: python benchmarks/dataframe_to_feature_collection.py [--server]
+"""
+
+import sys
+import time
+
+import ee
+import numpy as np
+import pandas as pd
+
+import eemont
+
+SIZES = [10_000, 100_000, 1_000_000]
+
+MAX_BEFORE = 100_000
+
+
+def perRow(dataFrame, latitude, longitude):
+    def getFeature(r):
+        point = ee.Geometry.Point([r[longitude], r[latitude]])
+        return ee.Feature(point, r.to_dict())
+
+    dataFrame = dataFrame.copy()
+    dataFrame["feature"] = dataFrame.apply(getFeature, axis=1)
+    return ee.FeatureCollection(dataFrame["feature"].tolist())
+
+
+def makeDataFrame(size, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame(
+        {
+            "lat": rng.uniform(-60, 60, size),
+            "lon": rng.uniform(-180, 180, size),
+            "ID": np.arange(size),
+            "class": rng.choice(["forest", "crop", "urban", "water"], size),
+            "value": rng.normal(size=size),
+        }
+    )
+
+
+def run(method, dataFrame, server=False):
+    start = time.perf_counter()
+    featureCollection = method(dataFrame, "lat", "lon")
+    built = time.perf_counter()
+    serialized = ee.serializer.toJSON(featureCollection)
+    end = time.perf_counter()
+    evaluate = None
+    if server:
+        try:
+            featureCollection.size().getInfo()
+            evaluate = f"{time.perf_counter() - end:.3f}"
+        except ee.EEException:
+            evaluate = "failed"
+    return built - start, end - built, len(serialized), evaluate
+
+
+if __name__ == "__main__":
+    ee.Initialize()
+
+    server = "--server" in sys.argv[1:]
+
+    methods = [
+        ("before", perRow),
+        ("after", lambda df, lat, lon: df.toEEFeatureCollection(lat, lon)),
+    ]
+
+    header = f"{'rows':>10}  {'':<8}{'build (s)':>12}{'serialize (s)':>16}{'bytes':>14}"
+    if server:
+        header += f"{'server (s)':>14}"
+    print(header)
+    for size in SIZES:
+        dataFrame = makeDataFrame(size)
+        for label, method in methods:
+            if label == "before" and size > MAX_BEFORE:
+                print(f"{size:>10}  {label:<8}{'skipped':>12}")
+                continue
+            build, serialize, nbytes, evaluate = run(method, dataFrame, server)
+            line = f"{size:>10}  {label:<8}{build:>12.3f}{serialize:>16.3f}{nbytes:>14}"
+            if server:
+                line += f"{evaluate:>14}"
+            print(line)
@@ -0,0 +1,73 @@
+"""Import time of eemont and cost of the first catalog lookups.
+
+Each measurement runs in a fresh interpreter, so nothing is cached between runs. 'import'
+is the wall time of `import eemont`. The catalog rows time the first call that needs each
+bundled catalog (parsed once and then reused) and a second call in the same process. The
+slowest modules reported by `python -X importtime` are listed at the end.
+
+Usage: python benchmarks/import_time.py [repeat]
+"""
+
+import statistics
+import subprocess
+import sys
+
+STATEMENTS = [
+    ("listDatasets()", "eemont.listDatasets()"),
+    ("indices()", "eemont.indices()"),
+    ("scale params", "eemont._catalog._get_dataset_params('COPERNICUS/S2_SR')"),
+]
+
+TIMER = """
+import time
+start = time.perf_counter()
+import eemont
+imported = time.perf_counter()
+{statement}
+first = time.perf_counter()
+{statement}
+second = time.perf_counter()
+print(imported - start, first - imported, second - first)
+"""
+
+
+def run(statement, repeat):
+    times = []
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, "-c", TIMER.format(statement=statement)],
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout
+        times.append([float(value) * 1000 for value in output.split()])
+    return [statistics.median(column) for column in zip(*times)]
+
+
+def slowestModules(top=10):
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import eemont"],
+        capture_output=True,
+        check=True,
+        text=True,
+    ).stderr
+    modules = []
+    for line in stderr.splitlines()[1:]:
+        _, cumulative, name = line.split("|")
+        modules.append((int(cumulative) / 1000, name.strip()))
+    return sorted(modules, reverse=True)[:top]
+
+
+if __name__ == "__main__":
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+
+    importTime = run("pass", repeat)[0]
+    print(f"{'import':<20}{importTime:>12.1f} ms")
+    print(f"\n{'first call':<20}{'cold (ms)':>12}{'warm (ms)':>12}")
+    for name, statement in STATEMENTS:
+        _, cold, warm = run(statement, repeat)
+        print(f"{name:<20}{cold:>12.2f}{warm:>12.2f}")
+
+    print(f"\n{'module':<40}{'cumulative (ms)':>16}")
+    for cumulative, name in slowestModules():
+        print(f"{name:<40}{cumulative:>16.1f}")
@@ -0,0 +1,71 @@
+"""Cost of index-style expressions written with the overloaded operators of ee.Image.
+
+Compares the default operators (before), which add one call to the graph per operation
+and per band selection, against the lazy operators (after), which fuse the whole
+expression into a single ee.Image.expression() call. For each expression, the size of
+the serialized request, the number of function calls in it and the time Earth Engine
+takes to compute the mean of the result over a 10 km square are measured.
+
+Usage: python benchmarks/lazy_image_operators.py
+"""
+
+import json
+import time
+
+import ee
+
+import eemont
+
+EXPRESSIONS = {
+    "NDVI": lambda i: (i["B8"] - i["B4"]) / (i["B8"] + i["B4"]),
+    "EVI": lambda i: 2.5
+    * (i["B8"] - i["B4"])
+    / (i["B8"] + 6.0 * i["B4"] - 7.5 * i["B2"] + 1.0),
+    "SAVI": lambda i: 1.5 * (i["B8"] - i["B4"]) / (i["B8"] + i["B4"] + 0.5),
+    "NDWI": lambda i: (i["B3"] - i["B8"]) / (i["B3"] + i["B8"]),
+    "snow": lambda i: ((i["B3"] - i["B11"]) / (i["B3"] + i["B11"]) > 0.4)
+    & (i["B8"] >= 0.1)
+    & (i["B3"] > 0.11),
+}
+
+
+def build(expression, image, lazy):
+    if lazy:
+        eemont.enableLazyOperators()
+    try:
+        return expression(image)
+    finally:
+        eemont.disableLazyOperators()
+
+
+def requestStats(image):
+    serialized = ee.serializer.toJSON(image)
+    calls = json.dumps(json.loads(ee.serializer.toJSON(image, False)))
+    return len(serialized), calls.count("functionInvocationValue")
+
+
+def evaluate(image, region):
+    start = time.perf_counter()
+    image.reduceRegion(ee.Reducer.mean(), region, 10).getInfo()
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    ee.Initialize()
+
+    S2 = (
+        ee.ImageCollection("COPERNICUS/S2_SR")
+        .filterDate("2020-06-01", "2020-07-01")
+        .filterBounds(ee.Geometry.Point([3.98, 48.77]))
+        .first()
+        .scaleAndOffset()
+    )
+    region = ee.Geometry.Point([3.98, 48.77]).buffer(5000).bounds()
+
+    print(f"{'expression':>10}  {'':<8}{'bytes':>8}{'calls':>8}{'evaluation (s)':>16}")
+    for name, expression in EXPRESSIONS.items():
+        for label, lazy in [("before", False), ("after", True)]:
+            image = build(expression, S2, lazy)
+            nbytes, calls = requestStats(image)
+            seconds = evaluate(image, region)
+            print(f"{name:>10}  {label:<8}{nbytes:>8}{calls:>8}{seconds:>16.3f}")
@@ -0,0 +1,76 @@
+"""Client-side cost of the Plus Codes conversions.
+
+Compares the recursive conversion (before), which deep-copies the array at every level and
+calls openlocationcode one coordinate at a time, against the vectorized NumPy encoder and
+decoder (after). A polygon with 1k, 10k and 50k vertices, in the structure returned by
+ee.Geometry.coordinates().getInfo(), is encoded to Plus Codes (ee.Geometry.plusCodes()) and
+decoded back (ee.Geometry.PolygonFromPlusCodes()). The recursive version requires the
+openlocationcode package.
+
+Usage: python benchmarks/plus_codes.py
+"""
+
+import copy
+import time
+
+import numpy as np
+from openlocationcode import openlocationcode as olc
+
+from eemont._pluscodes import (
+    _convert_lnglats_to_pluscodes,
+    _convert_pluscodes_to_lnglats,
+)
+
+SIZES = [1_000, 10_000, 50_000]
+
+
+def encodeRecursive(arr, codeLength):
+    converted = copy.deepcopy(arr)
+    if len(arr) == 2 and all(isinstance(x, (int, float)) for x in arr):
+        return olc.encode(arr[1], arr[0], codeLength)
+    for i, element in enumerate(arr):
+        converted[i] = encodeRecursive(element, codeLength)
+    return converted
+
+
+def decodeRecursive(arr):
+    converted = copy.deepcopy(arr)
+    if isinstance(arr, str):
+        area = olc.decode(arr)
+        return [area.longitudeCenter, area.latitudeCenter]
+    for i, element in enumerate(arr):
+        converted[i] = decodeRecursive(element)
+    return converted
+
+
+def makePolygon(size, seed=0):
+    rng = np.random.default_rng(seed)
+    angles = np.sort(rng.uniform(0, 2 * np.pi, size))
+    lng = -105 + 0.5 * np.cos(angles)
+    lat = 40 + 0.5 * np.sin(angles)
+    return [np.column_stack([lng, lat]).tolist()]
+
+
+def timeit(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return time.perf_counter() - start, result
+
+
+if __name__ == "__main__":
+    methods = [
+        ("before", encodeRecursive, decodeRecursive),
+        (
+            "after",
+            _convert_lnglats_to_pluscodes,
+            lambda codes: _convert_pluscodes_to_lnglats(codes, "nominatim"),
+        ),
+    ]
+
+    print(f"{'vertices':>10}  {'':<8}{'encode (s)':>12}{'decode (s)':>12}")
+    for size in SIZES:
+        polygon = makePolygon(size)
+        for label, encode, decode in methods:
+            encodeTime, codes = timeit(encode, polygon, 10)
+            decodeTime, _ = timeit(decode, codes)
+            print(f"{size:>10}  {label:<8}{encodeTime:>12.3f}{decodeTime:>12.3f}")
@@ -0,0 +1,56 @@
+"""Serialized graph size and node count of spectralIndices().
+
+Compares the per-index expressions built by ee_extra (before) against the formulas
+compiled together by eemont (after).
+
+Usage: python benchmarks/spectral_indices_graph.py
+"""
+
+import time
+import warnings
+
+import ee
+import ee_extra.Spectral.core
+
+import eemont
+
+warnings.simplefilter("ignore", UserWarning)
+
+
+def graphStats(x):
+    serialized = ee.serializer.toJSON(x)
+    return len(serialized), serialized.count('"functionInvocationValue"')
+
+
+def run(x, index):
+    rows = []
+    for label, method in [
+        ("before", ee_extra.Spectral.core.spectralIndices),
+        ("after", eemont._formulas._spectral_indices),
+    ]:
+        start = time.perf_counter()
+        result = method(x, index)
+        elapsed = time.perf_counter() - start
+        size, nodes = graphStats(result)
+        rows.append((label, size, nodes, elapsed))
+    return rows
+
+
+if __name__ == "__main__":
+    ee.Initialize()
+
+    S2 = ee.ImageCollection("COPERNICUS/S2_SR")
+    cases = [
+        ("ee.Image", S2.first(), "vegetation"),
+        ("ee.Image", S2.first(), "all"),
+        ("ee.ImageCollection", S2, "all"),
+    ]
+
+    print(
+        f"{'input':<20}{'index':<12}{'':<8}{'bytes':>12}{'nodes':>8}{'build (s)':>12}"
+    )
+    for name, x, index in cases:
+        for label, size, nodes, elapsed in run(x, index):
+            print(
+                f"{name:<20}{index:<12}{label:<8}{size:>12}{nodes:>8}{elapsed:>12.3f}"
+            )
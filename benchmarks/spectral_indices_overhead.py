@@ -0,0 +1,47 @@
+"""Per-call overhead of spectralIndices() for 1, 10 and 200 indices.
+
+'cold' clears the catalog caches before every call, so formulas are parsed and
+compiled each time (as they were before the formula table). 'warm' reuses the parsed
+formulas and the compiled graph, so only the images are built.
+
+Usage: python benchmarks/spectral_indices_overhead.py
+"""
+
+import time
+import warnings
+
+import ee
+
+import eemont
+
+warnings.simplefilter("ignore", UserWarning)
+
+
+def perCall(x, index, repeat, cold):
+    elapsed = 0.0
+    for _ in range(repeat):
+        if cold:
+            eemont.clearCatalogCache()
+            eemont._catalog._load_JSON("spectral-indices-dict.json")
+        start = time.perf_counter()
+        x.spectralIndices(index)
+        elapsed += time.perf_counter() - start
+    return elapsed / repeat * 1000
+
+
+if __name__ == "__main__":
+    ee.Initialize()
+
+    S2 = ee.ImageCollection("COPERNICUS/S2_SR")
+    indices = [
+        idx
+        for idx in eemont.listIndices()
+        if eemont.indices()[idx].application_domain != "radar"
+    ]
+
+    print(f"{'input':<20}{'indices':>8}{'cold (ms)':>12}{'warm (ms)':>12}")
+    for name, x in [("ee.Image", S2.first()), ("ee.ImageCollection", S2)]:
+        for n in [1, 10, 200]:
+            cold = perCall(x, indices[:n], 20, True)
+            warm = perCall(x, indices[:n], 20, False)
+            print(f"{name:<20}{n:>8}{cold:>12.2f}{warm:>12.2f}")
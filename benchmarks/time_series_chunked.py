@@ -0,0 +1,110 @@
+"""Wall time of getTimeSeriesByRegionsChunked() with a local stand-in for the EE client.
+
+No Earth Engine account is needed: the algorithm definitions bundled with the
+earthengine-api test utilities are used to build the requests, and ee.data.computeValue
+is replaced by a stand-in that sleeps for a simulated latency (a fixed overhead plus a
+cost per returned row), fails a fraction of the requests, fails every request above a
+row limit (as a memory limit would) and returns synthetic rows.
+
+Usage: python benchmarks/time_series_chunked.py
+"""
+
+import random
+import threading
+import time
+
+import ee
+from ee import apitestcase
+
+import eemont
+
+FEATURES = 10000
+DATES = 12
+OVERHEAD = 0.25
+ROW_COST = 0.00002
+FAILURE_RATE = 0.1
+MAX_ROWS = 50000
+
+
+class StandInClient:
+    """Stand-in for ee.data.computeValue."""
+
+    def __init__(self, chunkSize):
+        self.chunkSize = chunkSize
+        self.requests = 0
+        self.failures = 0
+        self._lock = threading.Lock()
+        self._random = random.Random(4)
+
+    def __call__(self, obj):
+        with self._lock:
+            self.requests += 1
+            fail = self._random.random() < FAILURE_RATE
+        if isinstance(obj, ee.List):
+            time.sleep(OVERHEAD)
+            return [FEATURES, 1577836800000, 1609372800000]
+        rows = min(self.chunkSize, FEATURES) * DATES
+        time.sleep(OVERHEAD + rows * ROW_COST)
+        if rows > MAX_ROWS:
+            raise ee.EEException("User memory limit exceeded.")
+        if fail:
+            with self._lock:
+                self.failures += 1
+            raise ee.EEException("Computation timed out.")
+        return {
+            "type": "FeatureCollection",
+            "features": [
+                {
+                    "type": "Feature",
+                    "geometry": None,
+                    "properties": {"id": i, "B2": 0.1},
+                }
+                for i in range(rows)
+            ],
+        }
+
+
+def initialize():
+    ee.Reset()
+    ee.data._install_cloud_api_resource = lambda: None
+    ee.data.getAlgorithms = apitestcase.GetAlgorithms
+    ee.Initialize(None, "", project="benchmark")
+
+
+def run(chunkSize, maxWorkers):
+    client = StandInClient(chunkSize)
+    ee.data.computeValue = client
+    fc = ee.FeatureCollection("projects/benchmark/assets/regions")
+    S2 = ee.ImageCollection("COPERNICUS/S2_SR")
+    start = time.perf_counter()
+    try:
+        rows = len(
+            S2.getTimeSeriesByRegionsChunked(
+                ee.Reducer.mean(),
+                fc,
+                "B2",
+                10,
+                chunkSize=chunkSize,
+                maxWorkers=maxWorkers,
+                backoff=0.05,
+            )
+        )
+    except ee.EEException as error:
+        rows = str(error)
+    elapsed = time.perf_counter() - start
+    return elapsed, rows, client.requests, client.failures
+
+
+if __name__ == "__main__":
+    initialize()
+
+    print(
+        f"{'chunkSize':>10}{'workers':>9}{'time (s)':>10}  {'rows':<28}"
+        f"{'requests':>10}{'retried':>9}"
+    )
+    for chunkSize, maxWorkers in [(FEATURES, 1), (500, 1), (500, 8), (500, 16)]:
+        elapsed, rows, requests, failures = run(chunkSize, maxWorkers)
+        print(
+            f"{chunkSize:>10}{maxWorkers:>9}{elapsed:>10.2f}  {rows!s:<28}"
+            f"{requests:>10}{failures:>9}"
+        )
@@ -0,0 +1,147 @@
+import collections
+import json
+import re
+import sqlite3
+import threading
+import time
+
+
+class _LRUCache:
+    """Thread-safe least recently used cache with hit and miss counters.
+
+    Parameters
+    ----------
+    maxsize : int, default = 128
+        Maximum number of items to keep.
+    ttl : float, default = None
+        Seconds an item is kept. If None, items don't expire.
+    """
+
+    def __init__(self, maxsize=128, ttl=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._items = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key in self._items:
+                value, expires = self._items[key]
+                if expires is None or expires > time.time():
+                    self._items.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._items[key]
+            self.misses += 1
+            return default
+
+    def set(self, key, value):
+        expires = None if self.ttl is None else time.time() + self.ttl
+        with self._lock:
+            self._items[key] = (value, expires)
+            self._items.move_to_end(key)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+
+    def info(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "maxsize": self.maxsize,
+            "currsize": len(self._items),
+        }
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+class _SQLiteCache:
+    """Least recently used cache persisted to a local SQLite database.
+
+    It has the same interface as _LRUCache. Keys are strings and values must be JSON
+    serializable. Several caches can share a database file by using different tables.
+
+    Parameters
+    ----------
+    path : str
+        Path to the database file. It is created if it doesn't exist.
+    table : str
+        Name of the table of the cache.
+    maxsize : int, default = 128
+        Maximum number of items to keep.
+    ttl : float, default = None
+        Seconds an item is kept. If None, items don't expire.
+    """
+
+    def __init__(self, path, table, maxsize=128, ttl=None):
+        if not re.match(r"^[A-Za-z_][A-Za-z0-9_]*$", table):
+            raise Exception(f"Invalid table name! Value passed: table = {table}")
+        self.path = path
+        self.table = table
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._connection:
+            self._connection.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} (key TEXT PRIMARY KEY, "
+                "value TEXT NOT NULL, expires REAL, accessed REAL NOT NULL)"
+            )
+
+    def get(self, key, default=None):
+        now = time.time()
+        with self._lock, self._connection:
+            row = self._connection.execute(
+                f"SELECT value, expires FROM {self.table} WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and (row[1] is None or row[1] > now):
+                self._connection.execute(
+                    f"UPDATE {self.table} SET accessed = ? WHERE key = ?", (now, key)
+                )
+                self.hits += 1
+                return json.loads(row[0])
+            if row is not None:
+                self._connection.execute(
+                    f"DELETE FROM {self.table} WHERE key = ?", (key,)
+                )
+            self.misses += 1
+            return default
+
+    def set(self, key, value):
+        now = time.time()
+        expires = None if self.ttl is None else now + self.ttl
+        with self._lock, self._connection:
+            self._connection.execute(
+                f"INSERT OR REPLACE INTO {self.table} VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value), expires, now),
+            )
+            self._connection.execute(
+                f"DELETE FROM {self.table} WHERE expires <= ? OR key IN (SELECT key "
+                f"FROM {self.table} ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+                (now, self.maxsize),
+            )
+
+    def info(self):
+        with self._lock:
+            currsize = self._connection.execute(
+                f"SELECT COUNT(*) FROM {self.table}"
+            ).fetchone()[0]
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "maxsize": self.maxsize,
+            "currsize": currsize,
+        }
+
+    def clear(self):
+        with self._lock, self._connection:
+            self._connection.execute(f"DELETE FROM {self.table}")
+            self.hits = 0
+            self.misses = 0
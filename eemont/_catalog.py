@@ -0,0 +1,582 @@
+import functools
+import hashlib
+import json
+import mmap
+import os
+import struct
+import warnings
+
+import ee
+import ee_extra.QA.clouds
+import numpy as np
+import requests
+
+from ._caching import _LRUCache
+from ._operators import _function_name
+
+_PLATFORM_CACHE = _LRUCache(maxsize=256)
+
+
+def _expression_key(x):
+    """Gets a hashable key of an ee object from its serialized expression.
+
+    Parameters
+    ----------
+    x : ee.ComputedObject
+        Object to get the key from.
+
+    Returns
+    -------
+    tuple
+        Name of the class of the object and hash of its serialized expression.
+    """
+    serialized = ee.serializer.toJSON(x).encode("utf-8")
+    return (type(x).__name__, hashlib.sha1(serialized).hexdigest())
+
+
+@functools.lru_cache(maxsize=None)
+def _load_JSON(x="ee-catalog-ids.json"):
+    """Loads the specified JSON file from the eemont data directory.
+
+    The file is read and parsed the first time it is requested and the parsed object is
+    reused afterwards, so importing eemont does not touch any of the bundled catalogs.
+    The returned object is shared between calls and must not be modified.
+
+    Parameters
+    ----------
+    x : str, default = 'ee-catalog-ids.json'
+        JSON filename.
+
+    Returns
+    -------
+    dict
+        Parsed JSON file.
+    """
+    path = os.path.join(os.path.dirname(__file__), "data", x)
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _get_indices(online):
+    """Retrieves the dictionary of spectral indices from the Awesome Spectral Indices.
+
+    Parameters
+    ----------
+    online : boolean
+        Whether to retrieve the most recent list of indices directly from the GitHub
+        repository and not from the local copy.
+
+    Returns
+    -------
+    dict
+        Spectral indices.
+    """
+    if online:
+        url = "https://raw.githubusercontent.com/awesome-spectral-indices/awesome-spectral-indices/main/output/spectral-indices-dict.json"
+        indices = requests.get(url).json()
+    else:
+        indices = _load_JSON("spectral-indices-dict.json")
+
+    return indices["SpectralIndices"]
+
+
+_ID_PRESERVING_ARGUMENTS = {
+    "Collection.filter": "collection",
+    "Collection.first": "collection",
+    "Collection.limit": "collection",
+    "Image.addBands": "dstImg",
+    "Image.clip": "input",
+    "Image.rename": "input",
+    "Image.select": "input",
+    "Image.updateMask": "image",
+}
+
+
+def _get_ID_from_graph(x):
+    """Gets the ID of the asset an image or image collection was loaded from by walking
+    its client-side expression graph.
+
+    Only functions that preserve the ID of their input (filtering, band selection,
+    masking, setting properties other than system:id, mapping functions that preserve
+    the ID of their argument, ...) are followed. For images, functions that preserve the
+    elements of a collection (joins and collections built from the image itself) are
+    followed as well.
+
+    Parameters
+    ----------
+    x : ee.Image | ee.ImageCollection
+        Image or image collection to get the ID from.
+
+    Returns
+    -------
+    tuple | None
+        Asset ID and whether it is the ID of an image collection, or None if the ID can't
+        be determined without a server call.
+    """
+    x = _get_ID_source(x, isinstance(x, ee.image.Image))
+
+    if _function_name(x) in ["Image.load", "ImageCollection.load"]:
+        ID = x.args.get("id")
+        if isinstance(ID, str):
+            return ID, _function_name(x) == "ImageCollection.load"
+
+    return None
+
+
+def _get_ID_source(x, element):
+    """Walks back the client-side expression graph of an object through the functions
+    that preserve its ID. See _get_ID_from_graph().
+
+    Parameters
+    ----------
+    x : ee.ComputedObject
+        Object to walk from.
+    element : boolean
+        Whether x is an element (image) of a collection, in which case functions that
+        preserve the elements of a collection are followed too.
+
+    Returns
+    -------
+    ee.ComputedObject | None
+        First object that is not computed by an ID-preserving function (e.g. the
+        Image.load call, or the argument of a mapped function), or None if the graph
+        can't be followed.
+    """
+    while isinstance(x, ee.computedobject.ComputedObject) and isinstance(
+        x.func, ee.apifunction.ApiFunction
+    ):
+        name = x.func.getSignature()["name"]
+        if name in ["Element.copyProperties", "Image.copyProperties"]:
+            if x.args.get("properties") is None:
+                x = x.args.get("destination")
+            else:
+                x = x.args.get("source")
+        elif name == "ImageCollection.fromImages" and element:
+            images = x.args.get("images")
+            x = images[0] if isinstance(images, (list, tuple)) and images else None
+        elif name == "Join.apply" and element:
+            x = x.args.get("primary")
+        elif name == "Element.set":
+            key = x.args.get("key")
+            if isinstance(key, ee.ee_string.String) and key.func is None:
+                key = getattr(key, "_string", None)
+            if not isinstance(key, str) or key == "system:id":
+                return None
+            x = x.args.get("object")
+        elif name == "Element.setMulti":
+            properties = x.args.get("properties")
+            if not isinstance(properties, dict) or "system:id" in properties:
+                return None
+            x = x.args.get("object")
+        elif name == "Collection.map":
+            if not _preserves_ID(x.args.get("baseAlgorithm")):
+                return None
+            x = x.args.get("collection")
+        elif name in _ID_PRESERVING_ARGUMENTS:
+            x = x.args.get(_ID_PRESERVING_ARGUMENTS[name])
+        else:
+            return x
+
+    return x
+
+
+def _preserves_ID(function):
+    """Checks whether a function mapped over a collection returns its argument through
+    ID-preserving functions only, so the elements keep their ID and type.
+
+    Parameters
+    ----------
+    function : ee.CustomFunction
+        Mapped function.
+
+    Returns
+    -------
+    boolean
+        Whether the function preserves the ID of its argument.
+    """
+    if not isinstance(function, ee.customfunction.CustomFunction):
+        return False
+    arguments = function.getSignature()["args"]
+    if len(arguments) != 1:
+        return False
+    source = _get_ID_source(function._body, True)
+    return (
+        isinstance(source, ee.computedobject.ComputedObject)
+        and source.func is None
+        and source.varName == arguments[0]["name"]
+    )
+
+
+def _get_platform_from_ID(x, ID, collectionID=False):
+    """Gets the platform of an image or image collection from its ID.
+
+    Parameters
+    ----------
+    x : ee.Image | ee.ImageCollection
+        Image or image collection to get the platform from.
+    ID : str
+        ID of the image or image collection.
+    collectionID : boolean, default = False
+        Whether the ID is the ID of the image collection an image belongs to.
+
+    Returns
+    -------
+    dict
+        Platform and product of the image or image collection.
+    """
+    eeDict = _load_JSON()
+
+    platform = None
+
+    if ID is not None:
+        if isinstance(x, ee.image.Image):
+            parentID = ID if collectionID else "/".join(ID.split("/")[:-1])
+            if eeDict.get(parentID, {}).get("gee:type") == "image_collection":
+                platform = parentID
+            elif not collectionID and eeDict.get(ID, {}).get("gee:type") == "image":
+                platform = ID
+        elif ID in eeDict:
+            platform = ID
+
+    if platform is None:
+        raise Exception("Sorry, satellite platform not supported!")
+
+    return {"platform": platform, "sr": "_SR" in platform}
+
+
+def _get_platform_STAC(x):
+    """Gets the platform (dataset ID) of an image or image collection and whether it is
+    a Surface Reflectance product.
+
+    The platform is read from the client-side expression graph when the object was
+    loaded from a known ID, which requires no server call. Otherwise, the ID is retrieved
+    with getInfo() and the platform is cached by the serialized expression of the object.
+
+    Parameters
+    ----------
+    x : ee.Image | ee.ImageCollection
+        Image or image collection to get the platform from.
+
+    Returns
+    -------
+    dict
+        Platform and product of the image or image collection.
+    """
+    graphID = _get_ID_from_graph(x)
+
+    if graphID is not None:
+        return _get_platform_from_ID(x, *graphID)
+
+    key = _expression_key(x)
+    platformDict = _PLATFORM_CACHE.get(key)
+
+    if platformDict is None:
+        ID = x.get("system:id").getInfo()
+        platformDict = _get_platform_from_ID(x, ID)
+        _PLATFORM_CACHE.set(key, platformDict)
+
+    return dict(platformDict)
+
+
+class _ScaleOffsetCatalog:
+    """Read-only view of the packed scale and offset catalog.
+
+    The catalog is memory-mapped and a single dataset ID is resolved by a binary search
+    over the sorted dataset IDs, without materializing the parameters of any other
+    dataset. The layout is written by .github/scripts/update_gee_stac_scale_offset.py.
+
+    Parameters
+    ----------
+    path : str
+        Path to the packed catalog.
+    """
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self._buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, nDatasets, nBands = struct.unpack_from("<8sII", self._buffer, 0)
+        if magic != b"EEMSO001":
+            raise Exception(f"{path} is not a valid scale and offset catalog!")
+        start = struct.calcsize("<8sII")
+        self._scale = np.frombuffer(self._buffer, "<f8", nBands, start)
+        start += 8 * nBands
+        self._offset = np.frombuffer(self._buffer, "<f8", nBands, start)
+        start += 8 * nBands
+        self._datasetOffsets = np.frombuffer(self._buffer, "<u4", nDatasets + 1, start)
+        start += 4 * (nDatasets + 1)
+        self._bandStarts = np.frombuffer(self._buffer, "<u4", nDatasets + 1, start)
+        start += 4 * (nDatasets + 1)
+        self._bandOffsets = np.frombuffer(self._buffer, "<u4", nBands + 1, start)
+        start += 4 * (nBands + 1)
+        self._datasetBlob = start
+        self._bandBlob = start + int(self._datasetOffsets[-1])
+        self._nDatasets = nDatasets
+
+    def _dataset(self, i):
+        start = self._datasetBlob + int(self._datasetOffsets[i])
+        end = self._datasetBlob + int(self._datasetOffsets[i + 1])
+        return self._buffer[start:end]
+
+    def _band(self, j):
+        start = self._bandBlob + int(self._bandOffsets[j])
+        end = self._bandBlob + int(self._bandOffsets[j + 1])
+        return self._buffer[start:end].decode("utf-8")
+
+    def _find(self, ID):
+        key = ID.encode("utf-8")
+        low, high = 0, self._nDatasets
+        while low < high:
+            middle = (low + high) // 2
+            if self._dataset(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self._nDatasets and self._dataset(low) == key:
+            return low
+        return None
+
+    def __contains__(self, ID):
+        return self._find(ID) is not None
+
+    def get(self, ID):
+        """Gets the scale and offset parameters of a dataset.
+
+        Parameters
+        ----------
+        ID : str
+            Dataset ID.
+
+        Returns
+        -------
+        tuple | None
+            Dictionaries with the scale and offset parameters for each band, or None if
+            the dataset is not in the catalog.
+        """
+        i = self._find(ID)
+        if i is None:
+            return None
+        first, last = int(self._bandStarts[i]), int(self._bandStarts[i + 1])
+        bands = [self._band(j) for j in range(first, last)]
+        scale = dict(zip(bands, self._scale[first:last].tolist()))
+        offset = dict(zip(bands, self._offset[first:last].tolist()))
+        return scale, offset
+
+
+@functools.lru_cache(maxsize=None)
+def _load_scale_offset_catalog():
+    """Loads the packed scale and offset catalog from the eemont data directory.
+
+    Returns
+    -------
+    _ScaleOffsetCatalog
+        Scale and offset catalog.
+    """
+    path = os.path.join(
+        os.path.dirname(__file__), "data", "ee-catalog-scale-offset.bin"
+    )
+    return _ScaleOffsetCatalog(path)
+
+
+@functools.lru_cache(maxsize=256)
+def _get_dataset_params(ID):
+    """Gets the scale and offset parameters of a dataset from the packed catalog.
+
+    Parameters
+    ----------
+    ID : str
+        Dataset ID.
+
+    Returns
+    -------
+    tuple | None
+        Dictionaries with the scale and offset parameters for each band, or None if the
+        dataset is not in the catalog. The dictionaries are shared between calls and must
+        not be modified.
+    """
+    return _load_scale_offset_catalog().get(ID)
+
+
+def _get_scale_params(x, platformDict=None):
+    """Gets the scale parameters for each band of an image or image collection.
+
+    Parameters
+    ----------
+    x : ee.Image | ee.ImageCollection
+        Image or image collection to get the scale parameters from.
+    platformDict : dict, default = None
+        Platform retrieved from _get_platform_STAC(). If None, it is retrieved from x.
+
+    Returns
+    -------
+    dict
+        Dictionary with the scale parameters for each band.
+    """
+    if platformDict is None:
+        platformDict = _get_platform_STAC(x)
+
+    params = _get_dataset_params(platformDict["platform"])
+
+    if params is None:
+        warnings.warn("This platform is not supported for getting scale parameters.")
+        return None
+    else:
+        return dict(params[0])
+
+
+def _get_offset_params(x, platformDict=None):
+    """Gets the offset parameters for each band of an image or image collection.
+
+    Parameters
+    ----------
+    x : ee.Image | ee.ImageCollection
+        Image or image collection to get the offset parameters from.
+    platformDict : dict, default = None
+        Platform retrieved from _get_platform_STAC(). If None, it is retrieved from x.
+
+    Returns
+    -------
+    dict
+        Dictionary with the offset parameters for each band.
+    """
+    if platformDict is None:
+        platformDict = _get_platform_STAC(x)
+
+    params = _get_dataset_params(platformDict["platform"])
+
+    if params is None:
+        warnings.warn("This platform is not supported for getting offset parameters.")
+        return None
+    else:
+        return dict(params[1])
+
+
+def _scale_and_offset(x, platformDict=None):
+    """Scales and offsets bands on an image or image collection.
+
+    Parameters
+    ----------
+    x : ee.Image | ee.ImageCollection
+        Image or image collection to scale.
+    platformDict : dict, default = None
+        Platform retrieved from _get_platform_STAC(). If None, it is retrieved from x.
+
+    Returns
+    -------
+    ee.Image | ee.ImageCollection
+        Scaled image or image collection.
+    """
+    if platformDict is None:
+        platformDict = _get_platform_STAC(x)
+
+    scaleParams = _get_scale_params(x, platformDict)
+    offsetParams = _get_offset_params(x, platformDict)
+
+    if scaleParams is None or offsetParams is None:
+        warnings.warn("This platform is not supported for scaling and offsetting.")
+        return x
+
+    scaleParams = ee.Dictionary(scaleParams).toImage()
+    offsetParams = ee.Dictionary(offsetParams).toImage()
+
+    def scaleOffset(img):
+        bands = img.bandNames()
+        bands = bands.filter(ee.Filter.inList("item", scaleParams.bandNames()))
+        scaled = (
+            img.select(bands)
+            .multiply(scaleParams.select(bands))
+            .add(offsetParams.select(bands))
+        )
+        return ee.Image(scaled.copyProperties(img, img.propertyNames()))
+
+    if isinstance(x, ee.imagecollection.ImageCollection):
+        return x.map(scaleOffset)
+    else:
+        return scaleOffset(x)
+
+
+def _preprocess(x, **kwargs):
+    """Masks clouds and shadows, and scales and offsets an image or image collection.
+
+    The platform of the input is resolved before masking the clouds, since the cloud
+    masking pipelines (e.g. joins with cloud probability collections) hide it from the
+    expression graph of the masked image or image collection.
+
+    Parameters
+    ----------
+    x : ee.Image | ee.ImageCollection
+        Image or image collection to pre-process.
+    **kwargs :
+        Keywords arguments for maskClouds().
+
+    Returns
+    -------
+    ee.Image | ee.ImageCollection
+        Pre-processed image or image collection.
+    """
+    maskCloudsDefault = {
+        "method": "cloud_prob",
+        "prob": 60,
+        "maskCirrus": True,
+        "maskShadows": True,
+        "scaledImage": False,
+        "dark": 0.15,
+        "cloudDist": 1000,
+        "buffer": 250,
+        "cdi": None,
+    }
+
+    platformDict = _get_platform_STAC(x)
+    x = ee_extra.QA.clouds.maskClouds(x, **{**maskCloudsDefault, **kwargs})
+
+    return _scale_and_offset(x, platformDict)
+
+
+def _get_STAC(x):
+    """Gets the STAC of the dataset of an image or image collection.
+
+    Parameters
+    ----------
+    x : ee.Image | ee.ImageCollection
+        Image or image collection to get the STAC from.
+
+    Returns
+    -------
+    dict
+        STAC of the dataset.
+    """
+    platformDict = _get_platform_STAC(x)
+    return requests.get(_load_JSON()[platformDict["platform"]]["href"]).json()
+
+
+def _get_DOI(x):
+    """Gets the DOI of the dataset of an image or image collection.
+
+    Parameters
+    ----------
+    x : ee.Image | ee.ImageCollection
+        Image or image collection to get the DOI from.
+
+    Returns
+    -------
+    str
+        DOI of the dataset.
+    """
+    platformDict = _get_platform_STAC(x)
+    return _load_JSON()[platformDict["platform"]]["sci:doi"]
+
+
+def _get_citation(x):
+    """Gets the citation of the dataset of an image or image collection.
+
+    Parameters
+    ----------
+    x : ee.Image | ee.ImageCollection
+        Image or image collection to get the citation from.
+
+    Returns
+    -------
+    str
+        Citation of the dataset.
+    """
+    platformDict = _get_platform_STAC(x)
+    return _load_JSON()[platformDict["platform"]]["sci:citation"]
@@ -0,0 +1,180 @@
+import operator
+import threading
+
+import ee
+
+from ._catalog import _expression_key
+
+
+class _Deferred:
+    """Result of an evaluation deferred by a batch.
+
+    Parameters
+    ----------
+    batch : _Batch
+        Batch that resolves the result.
+    """
+
+    __slots__ = ["_batch", "_value", "_error", "_resolved"]
+
+    def __init__(self, batch):
+        self._batch = batch
+        self._value = None
+        self._error = None
+        self._resolved = False
+
+    @property
+    def value(self):
+        """Gets the value, resolving the pending evaluations of the batch if needed."""
+        if not self._resolved:
+            self._batch.resolve()
+        if self._error is not None:
+            raise self._error
+        return self._value
+
+    def _set(self, value=None, error=None):
+        self._value = value
+        self._error = error
+        self._resolved = True
+
+    def __bool__(self):
+        return bool(self.value)
+
+    def __int__(self):
+        return int(self.value)
+
+    def __float__(self):
+        return float(self.value)
+
+    def __index__(self):
+        return operator.index(self.value)
+
+    def __eq__(self, other):
+        if isinstance(other, _Deferred):
+            other = other.value
+        return self.value == other
+
+    def __hash__(self):
+        return hash(self.value)
+
+    def __repr__(self):
+        if not self._resolved:
+            return "Deferred(<pending>)"
+        return f"Deferred({self._value!r})"
+
+
+class _Batch:
+    """Pending evaluations combined into a single getInfo() request. See batch()."""
+
+    def __init__(self):
+        self._pending = []
+        self._lock = threading.RLock()
+
+    def __enter__(self):
+        _BATCHES.stack = getattr(_BATCHES, "stack", []) + [self]
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        _BATCHES.stack = [b for b in _BATCHES.stack if b is not self]
+        if exc_type is None:
+            self.resolve()
+        return False
+
+    def getInfo(self, x):
+        """Defers the evaluation of an ee object."""
+        return self._defer(x, False)
+
+    def len(self, x):
+        """Defers the evaluation of the length of an ee.List, or the size of an
+        ee.ImageCollection, ee.FeatureCollection or ee.Dictionary."""
+        if isinstance(x, ee.ee_list.List):
+            return self._defer(x.length(), True)
+        return self._defer(x.size(), True)
+
+    def contains(self, x, key):
+        """Defers the evaluation of whether an ee.List or ee.Dictionary contains an
+        item or key."""
+        return self._defer(x.contains(key), True)
+
+    def _defer(self, x, cached):
+        deferred = _Deferred(self)
+        key = None
+        if cached and _RESULT_CACHE is not None:
+            key = _result_key(x)
+            value = _RESULT_CACHE.get(key, _MISSING)
+            if value is not _MISSING:
+                deferred._set(value)
+                return deferred
+        with self._lock:
+            self._pending.append((x, deferred, key))
+        return deferred
+
+    def resolve(self):
+        """Evaluates all the pending results in a single request."""
+        with self._lock:
+            pending, self._pending = self._pending, []
+            if not pending:
+                return
+            try:
+                values = ee.List([x for x, _, _ in pending]).getInfo()
+            except Exception as error:
+                for _, deferred, _ in pending:
+                    deferred._set(error=error)
+                raise
+            for (_, deferred, key), value in zip(pending, values):
+                deferred._set(value)
+                if key is not None and _RESULT_CACHE is not None:
+                    _RESULT_CACHE.set(key, value)
+
+
+_BATCHES = threading.local()
+
+_RESULT_CACHE = None
+
+_MISSING = object()
+
+
+def _result_key(x):
+    """Gets the key of an ee object in the result cache.
+
+    Parameters
+    ----------
+    x : ee.ComputedObject
+        Object to get the key from.
+
+    Returns
+    -------
+    str
+        Name of the class of the object and hash of its serialized expression.
+    """
+    return ":".join(_expression_key(x))
+
+
+def _get_info(x):
+    """Evaluates an ee object with getInfo().
+
+    Inside a batch, the evaluation joins the pending ones of the batch and all of them
+    are resolved in a single request. If the result cache is enabled, the result is
+    looked up there first.
+
+    Parameters
+    ----------
+    x : ee.ComputedObject
+        Object to evaluate.
+
+    Returns
+    -------
+    Any
+        Value of the object.
+    """
+    stack = getattr(_BATCHES, "stack", [])
+    if stack:
+        return stack[-1]._defer(x, True).value
+    if _RESULT_CACHE is None:
+        return x.getInfo()
+    key = _result_key(x)
+    value = _RESULT_CACHE.get(key, _MISSING)
+    if value is _MISSING:
+        value = x.getInfo()
+        _RESULT_CACHE.set(key, value)
+    return value
@@ -0,0 +1,669 @@
+import ast
+import collections
+import functools
+import math
+import operator
+import re
+import warnings
+
+import ee
+import ee_extra.Spectral.utils
+import numpy as np
+
+from ._caching import _LRUCache
+from ._catalog import _get_indices, _get_platform_STAC
+
+_INDEX_DOMAINS = [
+    "vegetation",
+    "burn",
+    "water",
+    "snow",
+    "urban",
+    "soil",
+    "kernel",
+    "radar",
+    "clouds",
+]
+
+_KERNELS = {
+    "linear": "a * b",
+    "RBF": "exp((-1.0 * (a - b) ** 2.0)/(2.0 * sigma ** 2.0))",
+    "poly": "((a * b) + c) ** p",
+}
+
+_KERNEL_PARAMETER = re.compile(r"^k([NRGBL])([NRGBL])$")
+
+_BINARY_OPERATORS = {
+    ast.Add: ("add", operator.add),
+    ast.Sub: ("subtract", operator.sub),
+    ast.Mult: ("multiply", operator.mul),
+    ast.Div: ("divide", lambda a, b: a / b if b != 0 else 0.0),
+    ast.Pow: ("pow", operator.pow),
+}
+
+_COMMUTATIVE_OPERATORS = ["add", "multiply"]
+
+_FUNCTIONS = {
+    "abs": abs,
+    "exp": math.exp,
+    "log": math.log,
+    "log10": math.log10,
+    "sqrt": math.sqrt,
+}
+
+_UFUNCS = {
+    "add": np.add,
+    "subtract": np.subtract,
+    "multiply": np.multiply,
+    "divide": np.divide,
+    "pow": np.power,
+    "negate": np.negative,
+    "abs": np.absolute,
+    "exp": np.exp,
+    "log": np.log,
+    "log10": np.log10,
+    "sqrt": np.sqrt,
+}
+
+
+_ParsedFormula = collections.namedtuple("_ParsedFormula", ["tree", "names"])
+
+
+@functools.lru_cache(maxsize=1024)
+def _parse_formula(formula):
+    """Parses a formula into its AST and the names of its variables.
+
+    Parameters
+    ----------
+    formula : str
+        Formula to parse.
+
+    Returns
+    -------
+    _ParsedFormula
+        Body of the AST of the formula and names of its variables (function names
+        excluded). Both are shared between calls and must not be modified.
+    """
+    tree = ast.parse(formula, mode="eval").body
+    functions = {
+        node.func.id
+        for node in ast.walk(tree)
+        if isinstance(node, ast.Call) and isinstance(node.func, ast.Name)
+    }
+    names = frozenset(
+        node.id
+        for node in ast.walk(tree)
+        if isinstance(node, ast.Name) and node.id not in functions
+    )
+    return _ParsedFormula(tree, names)
+
+
+class _FormulaTable:
+    """Formulas of a spectral indices catalog, parsed once, and the graphs compiled
+    from them.
+
+    Parameters
+    ----------
+    spectralIndices : dict
+        Spectral indices retrieved from _get_indices().
+    """
+
+    def __init__(self, spectralIndices):
+        self.catalog = spectralIndices
+        self.programs = _LRUCache(maxsize=64)
+        self._formulas = {}
+
+    def formula(self, idx):
+        """Gets the parsed formula of an index, parsing it on first use."""
+        if idx not in self._formulas:
+            self._formulas[idx] = _parse_formula(self.catalog[idx]["formula"])
+        return self._formulas[idx]
+
+
+_formula_table = None
+
+
+def _get_formula_table(online):
+    """Gets the table of parsed formulas of the spectral indices catalog.
+
+    The table is kept until a different catalog is retrieved, i.e. until online = True
+    fetches a new one (or the local copy is requested again after that).
+
+    Parameters
+    ----------
+    online : boolean
+        Whether to retrieve the most recent list of indices directly from the GitHub
+        repository and not from the local copy.
+
+    Returns
+    -------
+    _FormulaTable
+        Table of parsed formulas.
+    """
+    global _formula_table
+    spectralIndices = _get_indices(online)
+    table = _formula_table
+    if table is None or table.catalog is not spectralIndices:
+        table = _FormulaTable(spectralIndices)
+        _formula_table = table
+    return table
+
+
+class _FormulaCompiler:
+    """Compiles spectral index formulas into a single deduplicated expression graph.
+
+    Formulas are parsed into Python ASTs and every subexpression is interned by its
+    structure, so a subexpression shared by several formulas (e.g. N - R, or a kernel
+    term) becomes a single node that every formula reuses. Operations between numeric
+    parameters are folded in Python. The graph can be built as ee.Image objects with
+    image() or evaluated on NumPy arrays with evaluate().
+
+    Parameters
+    ----------
+    variables : dict
+        Bands (ee.Image or array-like) and numeric parameters available to the formulas.
+    kernel : str, default = 'RBF'
+        Kernel used for the kernel parameters (e.g. kNN).
+    sigma : str | float, default = '0.5 * (a + b)'
+        Length-scale parameter of the RBF kernel.
+    """
+
+    def __init__(self, variables, kernel="RBF", sigma="0.5 * (a + b)"):
+        if kernel not in _KERNELS:
+            raise Exception(
+                f"Invalid kernel! Use one of {list(_KERNELS.keys())}. Value passed: kernel = {kernel}"
+            )
+        self.variables = variables
+        self.kernel = kernel
+        self.sigma = sigma
+        self.nodes = []
+        self._ids = {}
+        self._images = {}
+
+    def available(self, formula):
+        """Checks whether all the variables of a formula (str or _ParsedFormula) are
+        available."""
+        if isinstance(formula, str):
+            formula = _parse_formula(formula)
+        return all(self._has(name) for name in formula.names)
+
+    def compile(self, formula):
+        """Compiles a formula (str or _ParsedFormula) and returns its node in the
+        graph."""
+        if isinstance(formula, str):
+            formula = _parse_formula(formula)
+        return self._visit(formula.tree, {})
+
+    def signature(self):
+        """Gets a hashable key of everything but the images that the compiled graph
+        depends on: the kernel, sigma, the numeric parameters and the names of the
+        remaining variables."""
+        variables = tuple(
+            sorted(
+                (name, float(value) if isinstance(value, (int, float)) else None)
+                for name, value in self.variables.items()
+            )
+        )
+        return (self.kernel, self.sigma, variables)
+
+    def image(self, node):
+        """Builds the ee.Image of a node of the graph."""
+        if node not in self._images:
+            kind, *operands = self.nodes[node]
+            if kind == "number":
+                image = ee.Image.constant(operands[0])
+            elif kind == "variable":
+                image = self.variables[operands[0]]
+            elif kind == "negate":
+                image = self.image(operands[0]).multiply(-1.0)
+            elif kind in _FUNCTIONS:
+                image = getattr(self.image(operands[0]), kind)()
+            else:
+                image = getattr(self.image(operands[0]), kind)(self.image(operands[1]))
+            self._images[node] = image
+        return self._images[node]
+
+    def evaluate(self, outputs):
+        """Evaluates nodes of the graph on the NumPy arrays of the variables.
+
+        Nodes are computed once in topological order with NumPy ufuncs writing into
+        reused buffers: the buffer of an intermediate node is released as soon as its
+        last consumer is computed, and is then used as the output of the next node of
+        the same shape and dtype. Scalar results are not reused as buffers.
+
+        Parameters
+        ----------
+        outputs : dict
+            Names and nodes to evaluate.
+
+        Returns
+        -------
+        dict
+            Names and evaluated arrays.
+        """
+        order = []
+        uses = collections.Counter(outputs.values())
+        stack = [(node, False) for node in set(outputs.values())]
+        visited = set()
+        while stack:
+            node, expanded = stack.pop()
+            if expanded:
+                order.append(node)
+                continue
+            if node in visited:
+                continue
+            visited.add(node)
+            stack.append((node, True))
+            kind, *operands = self.nodes[node]
+            if kind not in ["number", "variable"]:
+                for operand in operands:
+                    uses[operand] += 1
+                    stack.append((operand, False))
+
+        values = {}
+        owned = set()
+        pool = collections.defaultdict(list)
+        with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+            for node in order:
+                kind, *operands = self.nodes[node]
+                if kind == "number":
+                    values[node] = operands[0]
+                    continue
+                if kind == "variable":
+                    values[node] = self._array(self.variables[operands[0]])
+                    continue
+                args = [values[operand] for operand in operands]
+                zeros = np.equal(args[1], 0) if kind == "divide" else None
+                for operand in operands:
+                    uses[operand] -= 1
+                    if uses[operand] == 0 and operand in owned:
+                        released = values.pop(operand)
+                        if isinstance(released, np.ndarray) and released.ndim:
+                            pool[(released.shape, released.dtype)].append(released)
+                shape = np.broadcast_shapes(*[np.shape(arg) for arg in args])
+                dtype = np.result_type(*args)
+                buffers = pool[(shape, dtype)]
+                out = buffers.pop() if buffers else None
+                result = _UFUNCS[kind](*args, out=out)
+                if zeros is not None:
+                    if isinstance(result, np.ndarray) and result.ndim:
+                        np.copyto(result, 0.0, where=zeros)
+                    else:
+                        result = np.where(zeros, 0.0, result)
+                values[node] = result
+                owned.add(node)
+
+        return {
+            name: values[node] if np.ndim(values[node]) else np.float64(values[node])
+            for name, node in outputs.items()
+        }
+
+    def _array(self, value):
+        array = np.asarray(value)
+        if not np.issubdtype(array.dtype, np.floating):
+            array = array.astype(np.float64)
+        return array
+
+    def _has(self, name):
+        if name in self.variables:
+            return True
+        kernelBands = _KERNEL_PARAMETER.match(name)
+        if kernelBands is None:
+            return False
+        return all(self._has(band) for band in kernelBands.groups())
+
+    def _intern(self, key):
+        if key not in self._ids:
+            self._ids[key] = len(self.nodes)
+            self.nodes.append(key)
+        return self._ids[key]
+
+    def _number(self, node):
+        kind, *operands = self.nodes[node]
+        return operands[0] if kind == "number" else None
+
+    def _constant(self, value):
+        return self._intern(("number", float(value)))
+
+    def _name(self, name):
+        if name in self.variables:
+            value = self.variables[name]
+            if isinstance(value, (int, float)):
+                return self._constant(value)
+            return self._intern(("variable", name))
+        kernelBands = _KERNEL_PARAMETER.match(name)
+        if kernelBands is not None:
+            return self._kernel(*kernelBands.groups())
+        raise Exception(f"Variable {name} is not available for this platform!")
+
+    def _kernel(self, a, b):
+        scope = {"a": self._name(a), "b": self._name(b)}
+        if isinstance(self.sigma, str):
+            scope["sigma"] = self._visit(_parse_formula(self.sigma).tree, scope)
+        else:
+            scope["sigma"] = self._constant(self.sigma)
+        return self._visit(_parse_formula(_KERNELS[self.kernel]).tree, scope)
+
+    def _visit(self, node, scope):
+        if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)):
+            return self._constant(node.value)
+        if isinstance(node, ast.Name):
+            if node.id in scope:
+                return scope[node.id]
+            return self._name(node.id)
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.UAdd, ast.USub)):
+            operand = self._visit(node.operand, scope)
+            if isinstance(node.op, ast.UAdd):
+                return operand
+            if self._number(operand) is not None:
+                return self._constant(-self._number(operand))
+            return self._intern(("negate", operand))
+        if isinstance(node, ast.BinOp) and type(node.op) in _BINARY_OPERATORS:
+            method, fold = _BINARY_OPERATORS[type(node.op)]
+            left = self._visit(node.left, scope)
+            right = self._visit(node.right, scope)
+            return self._binary(method, fold, left, right)
+        if (
+            isinstance(node, ast.Call)
+            and isinstance(node.func, ast.Name)
+            and node.func.id in _FUNCTIONS
+            and len(node.args) == 1
+        ):
+            operand = self._visit(node.args[0], scope)
+            if self._number(operand) is not None:
+                return self._constant(_FUNCTIONS[node.func.id](self._number(operand)))
+            return self._intern((node.func.id, operand))
+        raise Exception(f"Unsupported expression: {ast.unparse(node)}")
+
+    def _binary(self, method, fold, left, right):
+        leftNumber = self._number(left)
+        rightNumber = self._number(right)
+        if leftNumber is not None and rightNumber is not None:
+            return self._constant(fold(leftNumber, rightNumber))
+        if method in _COMMUTATIVE_OPERATORS:
+            if leftNumber is not None or (rightNumber is None and right < left):
+                left, right = right, left
+        return self._intern((method, left, right))
+
+
+def _get_index_parameters(
+    G=2.5,
+    C1=6.0,
+    C2=7.5,
+    L=1.0,
+    cexp=1.16,
+    nexp=2.0,
+    alpha=0.1,
+    slope=1.0,
+    intercept=0.0,
+    gamma=1.0,
+    omega=2.0,
+    beta=0.05,
+    k=0.0,
+    fdelta=0.581,
+    epsilon=1.0,
+    kernel="RBF",
+    sigma="0.5 * (a + b)",
+    p=2.0,
+    c=1.0,
+    lambdaN=858.5,
+    lambdaN2=864.7,
+    lambdaR=645.0,
+    lambdaG=555.0,
+    lambdaS1=1613.7,
+    lambdaS2=2202.4,
+):
+    """Validates the parameters of the spectral indices and maps them to the names
+    used in the formulas.
+
+    Each wavelength is mapped to its own name (e.g. lambdaS1 to lambdaS1). The
+    implementation of ee_extra maps lambdaN2, lambdaS1 and lambdaS2 to the values of
+    lambdaN, lambdaR and lambdaG instead.
+
+    Returns
+    -------
+    dict
+        Parameters of the spectral indices.
+    """
+    if isinstance(sigma, (int, float)) and sigma < 0:
+        raise Exception(f"[sigma] must be positive! Value passed: sigma = {sigma}")
+
+    if p <= 0 or c < 0:
+        raise Exception(
+            f"[p] and [c] must be positive! Values passed: p = {p}, c = {c}"
+        )
+
+    return {
+        "g": float(G),
+        "C1": float(C1),
+        "C2": float(C2),
+        "L": float(L),
+        "cexp": float(cexp),
+        "nexp": float(nexp),
+        "alpha": float(alpha),
+        "sla": float(slope),
+        "slb": float(intercept),
+        "gamma": float(gamma),
+        "omega": float(omega),
+        "beta": float(beta),
+        "k": float(k),
+        "fdelta": float(fdelta),
+        "epsilon": float(epsilon),
+        "p": float(p),
+        "c": float(c),
+        "lambdaN": float(lambdaN),
+        "lambdaN2": float(lambdaN2),
+        "lambdaR": float(lambdaR),
+        "lambdaG": float(lambdaG),
+        "lambdaS1": float(lambdaS1),
+        "lambdaS2": float(lambdaS2),
+    }
+
+
+def _get_index_list(index, spectralIndices):
+    """Expands the requested indices into a list of built-in indices.
+
+    Parameters
+    ----------
+    index : string | list[string]
+        Index, list of indices, application domain or 'all'.
+    spectralIndices : dict
+        Spectral indices retrieved from _get_indices().
+
+    Returns
+    -------
+    list
+        Built-in indices to compute.
+    """
+    if not isinstance(index, list):
+        if index == "all":
+            index = list(spectralIndices.keys())
+        elif index in _INDEX_DOMAINS:
+            index = [
+                idx
+                for idx, attributes in spectralIndices.items()
+                if attributes["application_domain"] == index
+            ]
+        else:
+            index = [index]
+
+    for idx in index:
+        if idx not in spectralIndices:
+            warnings.warn(
+                f"Index {idx} is not a built-in index and it won't be computed!"
+            )
+
+    return [idx for idx in index if idx in spectralIndices]
+
+
+def _compile_indices(compiler, index, table, local=False):
+    """Compiles the formulas of the indices whose variables are available.
+
+    Compiled graphs are cached in the formula table by the requested indices and the
+    signature of the compiler, so repeated calls only rebuild the images.
+
+    Parameters
+    ----------
+    compiler : _FormulaCompiler
+        Compiler holding the available variables.
+    index : list
+        Indices to compile.
+    table : _FormulaTable
+        Formula table retrieved from _get_formula_table().
+    local : boolean, default = False
+        Whether the variables are local data instead of the bands of a platform. The
+        warnings of the skipped indices then name the missing inputs.
+
+    Returns
+    -------
+    dict
+        Indices and their nodes in the graph of the compiler.
+    """
+    key = (tuple(index), compiler.signature())
+    program = table.programs.get(key)
+    if program is None:
+        compiled = {}
+        missing = []
+        for idx in index:
+            if compiler.available(table.formula(idx)):
+                compiled[idx] = compiler.compile(table.formula(idx))
+            else:
+                missing.append(idx)
+        program = (list(compiler.nodes), dict(compiler._ids), compiled, missing)
+        table.programs.set(key, program)
+    else:
+        compiler.nodes = list(program[0])
+        compiler._ids = dict(program[1])
+
+    for idx in program[3]:
+        if local:
+            missing = sorted(
+                name for name in table.formula(idx).names if not compiler._has(name)
+            )
+            warnings.warn(
+                f"The data doesn't have the required inputs for {idx} computation: "
+                f"{', '.join(missing)}!"
+            )
+        else:
+            warnings.warn(
+                f"This platform doesn't have the required bands for {idx} computation!"
+            )
+
+    return dict(program[2])
+
+
+def _spectral_indices(
+    x,
+    index="NDVI",
+    G=2.5,
+    C1=6.0,
+    C2=7.5,
+    L=1.0,
+    cexp=1.16,
+    nexp=2.0,
+    alpha=0.1,
+    slope=1.0,
+    intercept=0.0,
+    gamma=1.0,
+    omega=2.0,
+    beta=0.05,
+    k=0.0,
+    fdelta=0.581,
+    epsilon=1.0,
+    kernel="RBF",
+    sigma="0.5 * (a + b)",
+    p=2.0,
+    c=1.0,
+    lambdaN=858.5,
+    lambdaN2=864.7,
+    lambdaR=645.0,
+    lambdaG=555.0,
+    lambdaS1=1613.7,
+    lambdaS2=2202.4,
+    online=False,
+    drop=False,
+):
+    """Computes one or more spectral indices for an image or image collection.
+
+    All the requested formulas are compiled together by _FormulaCompiler, so the
+    subexpressions they share are built once, and the indices are stacked by a single
+    toBands() call and added to each image in a single addBands() call (a single map()
+    for image collections), so the depth of the graph doesn't grow with the number of
+    indices.
+
+    Parameters
+    ----------
+    x : ee.Image | ee.ImageCollection
+        Image or image collection to compute indices on. Must be scaled to [0,1].
+    index : string | list[string], default = 'NDVI'
+        Index, list of indices, application domain or 'all'.
+    G, C1, C2, L, ..., lambdaS2 :
+        Parameters of the indices. See ee.Image.spectralIndices() for more info.
+    online : boolean, default = False
+        Whether to retrieve the most recent list of indices directly from the GitHub
+        repository and not from the local copy.
+    drop : boolean, default = False
+        Whether to drop all bands except the new spectral indices.
+
+    Returns
+    -------
+    ee.Image | ee.ImageCollection
+        Image or image collection with the computed spectral indices as new bands.
+    """
+    platformDict = _get_platform_STAC(x)
+    parameters = _get_index_parameters(
+        G,
+        C1,
+        C2,
+        L,
+        cexp,
+        nexp,
+        alpha,
+        slope,
+        intercept,
+        gamma,
+        omega,
+        beta,
+        k,
+        fdelta,
+        epsilon,
+        kernel,
+        sigma,
+        p,
+        c,
+        lambdaN,
+        lambdaN2,
+        lambdaR,
+        lambdaG,
+        lambdaS1,
+        lambdaS2,
+    )
+    table = _get_formula_table(online)
+    index = _get_index_list(index, table.catalog)
+    computedIndices = []
+
+    def computeIndices(img):
+        lookup = ee_extra.Spectral.utils._get_expression_map(img, platformDict)
+        lookup = ee_extra.Spectral.utils._remove_none_dict({**lookup, **parameters})
+        compiler = _FormulaCompiler(lookup, kernel, sigma)
+        compiled = _compile_indices(compiler, index, table)
+        computedIndices[:] = list(compiled.keys())
+        if not compiled:
+            return img
+        images = [compiler.image(node) for node in compiled.values()]
+        if len(images) == 1:
+            return img.addBands(images[0].rename(computedIndices))
+        # ee.Image.cat() chains an addBands() call per image, so the indices are
+        # stacked by a single toBands() call to keep the depth of the graph constant
+        stacked = ee.ImageCollection.fromImages(images).toBands()
+        return img.addBands(stacked.rename(computedIndices))
+
+    if isinstance(x, ee.imagecollection.ImageCollection):
+        x = x.map(computeIndices)
+    else:
+        x = computeIndices(x)
+
+    if drop:
+        x = x.select(computedIndices)
+
+    return x
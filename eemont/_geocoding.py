@@ -0,0 +1,328 @@
+import concurrent.futures
+import hashlib
+import json
+import threading
+import time
+import warnings
+
+from geopy.geocoders import get_geocoder_for_service
+from geopy.location import Location
+
+from ._caching import _LRUCache
+
+_GEOCODING_CACHE = None
+
+_GEOCODER_POOL = _LRUCache(maxsize=32)
+
+_GEOCODER_POOL_LOCK = threading.Lock()
+
+_NO_MATCHES = "No matches were found for your query!"
+
+_GEOCODER_RATE_LIMITS = {"nominatim": 1.0}
+
+_RATE_LIMITERS = {}
+
+_RATE_LIMITERS_LOCK = threading.Lock()
+
+_GEOCODER_IGNORED_ARGUMENTS = [
+    "adapter_factory",
+    "api_key",
+    "proxies",
+    "ssl_context",
+    "timeout",
+    "user_agent",
+]
+
+
+class _TokenBucket:
+    """Thread-safe token bucket rate limiter.
+
+    Parameters
+    ----------
+    rate : float
+        Tokens added per second.
+    capacity : float, default = 1
+        Maximum number of tokens (burst size).
+    """
+
+    def __init__(self, rate, capacity=1):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Takes a token, waiting until it is available."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.capacity, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            self._tokens -= 1
+            wait = -self._tokens / self.rate
+        if wait > 0:
+            time.sleep(wait)
+
+
+def _get_geocoder_class(geocoder):
+    """Gets the geopy geocoder class of a service.
+
+    Parameters
+    ----------
+    geocoder : str | type
+        Name of the service or geopy geocoder class.
+
+    Returns
+    -------
+    type
+        Geocoder class.
+    """
+    if isinstance(geocoder, type):
+        return geocoder
+    return get_geocoder_for_service(geocoder)
+
+
+def _get_geocoder(geocoder="nominatim", **kwargs):
+    """Gets a geocoder from the pool, creating it if needed. See getGeocoder().
+
+    Parameters
+    ----------
+    geocoder : str | type
+        Name of the geocoder service or geocoder class.
+    **kwargs :
+        Keywords arguments for the geocoder.
+
+    Returns
+    -------
+    geopy.geocoders.Geocoder
+        Pooled geocoder.
+    """
+    key = (geocoder, json.dumps(kwargs, sort_keys=True, default=repr))
+    with _GEOCODER_POOL_LOCK:
+        geolocator = _GEOCODER_POOL.get(key)
+        if geolocator is None:
+            geolocator = _get_geocoder_class(geocoder)(**kwargs)
+            _GEOCODER_POOL.set(key, geolocator)
+    return geolocator
+
+
+def _get_service_name(geocoder):
+    """Gets the name of a geocoding service.
+
+    Parameters
+    ----------
+    geocoder : str | type
+        Name of the service or geopy geocoder class.
+
+    Returns
+    -------
+    str
+        Name of the service in lowercase.
+    """
+    if isinstance(geocoder, type):
+        return geocoder.__name__.lower()
+    return geocoder.lower()
+
+
+def _get_rate_limiter(geocoder):
+    """Gets the token bucket of a geocoding service.
+
+    Parameters
+    ----------
+    geocoder : str | type
+        Name of the service or geopy geocoder class.
+
+    Returns
+    -------
+    _TokenBucket | None
+        Token bucket of the service, or None if its requests are not limited.
+    """
+    service = _get_service_name(geocoder)
+    with _RATE_LIMITERS_LOCK:
+        if service not in _RATE_LIMITERS:
+            rate = _GEOCODER_RATE_LIMITS.get(service)
+            _RATE_LIMITERS[service] = None if rate is None else _TokenBucket(rate)
+        return _RATE_LIMITERS[service]
+
+
+def _geocoding_key(query, geocoder, exactly_one, kwargs):
+    """Gets the key of a query in the geocoding cache.
+
+    Parameters
+    ----------
+    query : str | dict
+        Address, query or structured query to geocode.
+    geocoder : str
+        Geocoder to use.
+    exactly_one : boolean
+        Whether to retrieve just one location.
+    kwargs : dict
+        Arguments of the geocoder. Arguments that don't affect the results are ignored.
+
+    Returns
+    -------
+    str
+        SHA-256 hash of the query.
+    """
+    kwargs = {
+        key: value
+        for key, value in kwargs.items()
+        if key not in _GEOCODER_IGNORED_ARGUMENTS
+    }
+    key = json.dumps(
+        [geocoder, query, exactly_one, kwargs], sort_keys=True, default=str
+    )
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+def _encode_locations(locations):
+    """Encodes geopy locations as JSON serializable lists.
+
+    Parameters
+    ----------
+    locations : list[Location]
+        Locations to encode.
+
+    Returns
+    -------
+    list
+        Address, latitude, longitude, altitude and raw properties of each location.
+    """
+    return [
+        [
+            location.address,
+            location.latitude,
+            location.longitude,
+            location.altitude,
+            location.raw,
+        ]
+        for location in locations
+    ]
+
+
+def _decode_locations(locations):
+    """Decodes locations encoded with _encode_locations().
+
+    Parameters
+    ----------
+    locations : list
+        Encoded locations.
+
+    Returns
+    -------
+    list[Location]
+        Decoded locations.
+    """
+    return [
+        Location(address, (latitude, longitude, altitude), raw)
+        for address, latitude, longitude, altitude, raw in locations
+    ]
+
+
+def _retrieve_location(query, geocoder, exactly_one, **kwargs):
+    """Retrieves a location from a query.
+
+    If the geocoding cache is enabled, cached locations are returned without geocoding
+    the query again. Queries without matches are cached too.
+
+    Parameters
+    ----------
+    query : str
+        Address, query or structured query to geocode.
+    geocoder : str | type
+        Geocoder to use. Please visit https://geopy.readthedocs.io/ for more info.
+    exactly_one : boolean
+        Whether to retrieve just one location.
+    **kwargs :
+        Keywords arguments for geolocator.geocode(). The user_agent argument is mandatory (this argument can be set as user_agent = 'my-gee-username' or
+        user_agent = 'my-gee-app-name'). Please visit https://geopy.readthedocs.io/ for more info.
+
+    Returns
+    -------
+    Location
+        Retrieved location.
+    """
+    key = None
+    if _GEOCODING_CACHE is not None:
+        key = _geocoding_key(query, geocoder, exactly_one, kwargs)
+        locations = _GEOCODING_CACHE.get(key)
+        if locations is not None:
+            if not locations:
+                raise Exception(_NO_MATCHES)
+            locations = _decode_locations(locations)
+            return locations[0] if exactly_one else locations
+
+    geolocator = _get_geocoder(geocoder, **kwargs)
+    limiter = _get_rate_limiter(geocoder)
+    if limiter is not None:
+        limiter.acquire()
+    location = geolocator.geocode(query, exactly_one=exactly_one)
+    if location is None:
+        if key is not None:
+            _GEOCODING_CACHE.set(key, [])
+        raise Exception(_NO_MATCHES)
+    else:
+        if key is not None:
+            locations = [location] if exactly_one else location
+            _GEOCODING_CACHE.set(key, _encode_locations(locations))
+        return location
+
+
+def _retrieve_locations(queries, geocoder, maxWorkers=8, **kwargs):
+    """Retrieves one location per query concurrently.
+
+    Identical queries are geocoded once. The requests are sent by a thread pool and
+    limited by the token bucket of the service.
+
+    Parameters
+    ----------
+    queries : list
+        Addresses, queries or structured queries to geocode.
+    geocoder : str | type
+        Geocoder to use.
+    maxWorkers : int, default = 8
+        Maximum number of concurrent requests.
+    **kwargs :
+        Keywords arguments of the geocoder.
+
+    Returns
+    -------
+    list[Location | None]
+        Location of each query, or None if no matches were found.
+    """
+    unique = {json.dumps(query, sort_keys=True): query for query in queries}
+
+    def retrieve(query):
+        try:
+            return _retrieve_location(query, geocoder, True, **kwargs)
+        except Exception as e:
+            if str(e) == _NO_MATCHES:
+                return None
+            raise
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=maxWorkers) as executor:
+        locations = dict(zip(unique, executor.map(retrieve, unique.values())))
+
+    missing = [query for key, query in unique.items() if locations[key] is None]
+    if missing:
+        warnings.warn(f"No matches were found for the queries: {missing}", Warning)
+
+    return [locations[json.dumps(query, sort_keys=True)] for query in queries]
+
+
+def _lnglat_from_location(location):
+    """Returns the longitude and latitude from a location.
+
+    Parameters
+    ----------
+    location : Location
+        Retrieved location. Must be only one location.
+
+    Returns
+    -------
+    tuple
+        The longitude and latitude geocoded from the query.
+    """
+    return [location.longitude, location.latitude]
@@ -0,0 +1,387 @@
+import math
+import numbers
+import operator
+import re
+
+import ee
+import numpy as np
+
+_CONSTANT_FOLDING = False
+
+_FOLDED_OPERATIONS = {
+    "add": operator.add,
+    "subtract": operator.sub,
+    "multiply": operator.mul,
+    "divide": operator.truediv,
+    "pow": operator.pow,
+}
+
+_RIGHT_IDENTITIES = {"add": 0, "subtract": 0, "multiply": 1, "divide": 1, "pow": 1}
+
+_LEFT_IDENTITIES = {"add": 0, "multiply": 1}
+
+_ASSOCIATIVE_OPERATIONS = ["add", "multiply"]
+
+_OPERANDS = {"Number": ("left", "right"), "Image": ("image1", "image2")}
+
+_LAZY_OPERATORS = False
+
+_EXPRESSION_OPERATORS = {
+    "add": "+",
+    "subtract": "-",
+    "multiply": "*",
+    "divide": "/",
+    "mod": "%",
+    "pow": "**",
+    "lt": "<",
+    "lte": "<=",
+    "gt": ">",
+    "gte": ">=",
+    "eq": "==",
+    "neq": "!=",
+    "And": "&&",
+    "Or": "||",
+}
+
+_UNARY_OPERATORS = {
+    "negate": ("-", lambda x: x.multiply(-1)),
+    "Not": ("!", lambda x: x.Not()),
+}
+
+
+def _function_name(x):
+    """Gets the name of the API function that computes an ee object.
+
+    Parameters
+    ----------
+    x : object
+        Object to get the function name from.
+
+    Returns
+    -------
+    str | None
+        Name of the function (e.g. 'Image.add'), or None if x is not computed by an API
+        function.
+    """
+    if isinstance(x, ee.computedobject.ComputedObject) and isinstance(
+        x.func, ee.apifunction.ApiFunction
+    ):
+        return x.func.getSignature()["name"]
+    return None
+
+
+def _constant_value(x):
+    """Gets the value of a client-side numeric constant.
+
+    Parameters
+    ----------
+    x : object
+        A number, an ee.Number or an ee.Image.
+
+    Returns
+    -------
+    numeric | None
+        The value of x if it is a number, an ee.Number created from a number or an
+        ee.Image created from a number. Otherwise, None.
+    """
+    if isinstance(x, numbers.Real) and not isinstance(x, bool):
+        return x.item() if isinstance(x, np.generic) else x
+    if isinstance(x, ee.ee_number.Number) and x.func is None:
+        return _constant_value(getattr(x, "_number", None))
+    if _function_name(x) == "Image.constant":
+        return _constant_value(x.args.get("value"))
+    return None
+
+
+def _fold_constants(a, b, operation):
+    """Computes an arithmetic operation between two constants.
+
+    Parameters
+    ----------
+    a : numeric
+        Left operand.
+    b : numeric
+        Right operand.
+    operation : str
+        Operation to compute. One of 'add', 'subtract', 'multiply', 'divide' or 'pow'.
+
+    Returns
+    -------
+    numeric | None
+        Result of the operation, or None if it could differ from the result of the
+        server (integer divisions with remainder, divisions by zero, complex, infinite
+        or too large results).
+    """
+    integers = isinstance(a, int) and isinstance(b, int)
+    try:
+        if operation == "divide" and integers:
+            if a % b:
+                return None
+            value = a // b
+        elif operation == "pow":
+            value = float(a) ** b
+            if not isinstance(value, complex) and abs(value) < 2**53:
+                value = a**b
+        else:
+            value = _FOLDED_OPERATIONS[operation](a, b)
+    except (ArithmeticError, ValueError):
+        return None
+
+    if isinstance(value, complex) or not math.isfinite(value) or abs(value) >= 2**53:
+        return None
+    return value
+
+
+def _fold_operator(left, right, operation, cls):
+    """Simplifies an arithmetic operation between ee objects and constants.
+
+    Parameters
+    ----------
+    left : ee.Number | ee.Image | numeric
+        Left operand.
+    right : ee.Number | ee.Image | numeric
+        Right operand.
+    operation : str
+        Operation to simplify. One of 'add', 'subtract', 'multiply', 'divide' or 'pow'.
+    cls : type
+        Class of the result (ee.Number or ee.Image).
+
+    Returns
+    -------
+    ee.Number | ee.Image | None
+        The simplified result, or None if the operation can't be simplified. Identities
+        are only dropped, and chains only merged, for integer constants, so the data
+        type and rounding of the result are the ones of the server. Identities are only
+        dropped for ee.Number, since the image operations drop the properties of the
+        image.
+    """
+    a, b = _constant_value(left), _constant_value(right)
+
+    if a is not None and b is not None:
+        value = _fold_constants(a, b, operation)
+        return None if value is None else cls(value)
+
+    if cls is ee.ee_number.Number:
+        if isinstance(b, int) and b == _RIGHT_IDENTITIES[operation]:
+            if isinstance(left, cls):
+                return left
+
+        if isinstance(a, int) and a == _LEFT_IDENTITIES.get(operation):
+            if isinstance(right, cls):
+                return right
+
+    if isinstance(b, int) and operation in _ASSOCIATIVE_OPERATIONS:
+        if _function_name(left) == f"{cls.name()}.{operation}":
+            first, second = (left.args.get(name) for name in _OPERANDS[cls.name()])
+            c = _constant_value(second)
+            if isinstance(c, int):
+                value = _fold_constants(c, b, operation)
+                if value is not None:
+                    return _apply_operator(first, value, operation, cls)
+
+    return None
+
+
+def _apply_operator(left, right, operation, cls):
+    """Applies the operation of an overloaded binary operator of ee.Number or ee.Image.
+
+    The operation is simplified first if constant folding is enabled. Operations between
+    images are added to an expression tree instead if lazy operators are enabled.
+
+    Parameters
+    ----------
+    left : ee.Number | ee.Image | numeric
+        Left operand. If numeric, it is converted to cls.
+    right : ee.Number | ee.Image | numeric | list[numeric]
+        Right operand.
+    operation : str
+        Name of the method of cls that computes the operation (e.g. 'add' or 'lt').
+    cls : type
+        Class of the result (ee.Number or ee.Image).
+
+    Returns
+    -------
+    ee.Number | ee.Image
+        Result of the operation.
+    """
+    if _CONSTANT_FOLDING and operation in _FOLDED_OPERATIONS:
+        folded = _fold_operator(left, right, operation, cls)
+        if folded is not None:
+            return folded
+
+    if _LAZY_OPERATORS and cls is ee.image.Image:
+        lazy = _lazy_operator(left, right, operation)
+        if lazy is not None:
+            return lazy
+
+    if not isinstance(left, cls):
+        left = cls(left)
+    return getattr(left, operation)(right)
+
+
+def _apply_unary_operator(x, operation):
+    """Applies the operation of an overloaded unary operator of ee.Image, lazily if lazy
+    operators are enabled.
+
+    Parameters
+    ----------
+    x : ee.Image
+        Operand.
+    operation : str
+        Operation to apply. One of 'negate' or 'Not'.
+
+    Returns
+    -------
+    ee.Image
+        Result of the operation.
+    """
+    symbol, apply = _UNARY_OPERATORS[operation]
+    if _LAZY_OPERATORS:
+        node = _lazy_operand(x)
+        if node is not None and node[0] != "constant":
+            return _LazyImage(("unary", symbol, node))
+    return apply(x)
+
+
+def _lazy_operand(x):
+    """Converts an operand of an overloaded operator to a node of an expression tree.
+
+    Parameters
+    ----------
+    x : object
+        Operand.
+
+    Returns
+    -------
+    tuple | None
+        The node of the operand, or None if it can't be used in an expression. Only
+        single-band images (bands selected with the [] operator and the results of
+        operations between them) and finite constants are used, since the band-wise
+        broadcasting and the output band names of an expression between multi-band
+        images differ from the ones of the ee.Image methods.
+    """
+    if isinstance(x, _LazyImage):
+        return x._node
+    value = _constant_value(x)
+    if value is not None and math.isfinite(value):
+        return ("constant", value)
+    return None
+
+
+def _lazy_operator(left, right, operation):
+    """Builds the expression tree of a binary operation between images.
+
+    Parameters
+    ----------
+    left : ee.Image | numeric
+        Left operand.
+    right : ee.Image | numeric
+        Right operand.
+    operation : str
+        Name of the method of ee.Image that computes the operation (e.g. 'add').
+
+    Returns
+    -------
+    _LazyImage | None
+        The lazy result, or None if the operation can't be expressed.
+    """
+    nodes = [_lazy_operand(left), _lazy_operand(right)]
+    if any(node is None for node in nodes):
+        return None
+    if all(node[0] == "constant" for node in nodes):
+        return None
+    return _LazyImage(("binary", _EXPRESSION_OPERATORS[operation], *nodes))
+
+
+def _lazy_band(x, band):
+    """Builds the expression tree of a band selected by the [] operator.
+
+    Parameters
+    ----------
+    x : ee.Image
+        Image to select the band from.
+    band : str
+        Name of the band.
+
+    Returns
+    -------
+    _LazyImage | None
+        The lazy band, or None if lazy operators are disabled or the key is not a plain
+        band name.
+    """
+    if not _LAZY_OPERATORS or isinstance(x, _LazyImage) or not isinstance(band, str):
+        return None
+    if not re.fullmatch(r"[A-Za-z_]\w*", band):
+        return None
+    return _LazyImage(("band", x, band))
+
+
+def _fuse_expression(node):
+    """Materializes an expression tree as a single ee.Image.expression() call.
+
+    The first image whose bands are selected is the primary image of the expression
+    (its bands are referenced as b('band')). Any other image is a variable of the
+    expression, used once no matter how many of its bands are referenced. A band node
+    is materialized as a select() call.
+
+    Parameters
+    ----------
+    node : tuple
+        Root of the expression tree.
+
+    Returns
+    -------
+    ee.Image
+        The image computed by the expression.
+    """
+    if node[0] == "band":
+        return node[1].select(node[2])
+
+    variables = {}
+    names = {}
+    primary = []
+
+    def variable(image):
+        if id(image) not in names:
+            names[id(image)] = f"v{len(names)}"
+            variables[names[id(image)]] = image
+        return names[id(image)]
+
+    def write(node):
+        kind = node[0]
+        if kind == "constant":
+            value = node[1]
+            if isinstance(value, float):
+                value = np.format_float_positional(value, trim="0")
+            return f"({value})" if str(value).startswith("-") else str(value)
+        if kind == "band":
+            if not primary:
+                primary.append(node[1])
+            if node[1] is primary[0]:
+                return f"b('{node[2]}')"
+            return f"{variable(node[1])}.{node[2]}"
+        if kind == "unary":
+            return f"{node[1]}({write(node[2])})"
+        return f"({write(node[2])} {node[1]} {write(node[3])})"
+
+    expression = write(node)
+
+    return primary[0].expression(expression, variables)
+
+
+class _LazyImage(ee.image.Image):
+    """ee.Image built by the overloaded operators while lazy operators are enabled.
+
+    The image is initialized as the single ee.Image.expression() call of its expression
+    tree, which is kept to build the expressions of further operators, so the
+    intermediate expressions are never added to the graph.
+
+    Parameters
+    ----------
+    node : tuple
+        Root of the expression tree.
+    """
+
+    def __init__(self, node):
+        super().__init__(_fuse_expression(node))
+        self._node = node
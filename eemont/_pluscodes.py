@@ -0,0 +1,579 @@
+import re
+
+import numpy as np
+
+from ._geocoding import _NO_MATCHES, _lnglat_from_location, _retrieve_locations
+
+_PLUSCODE_ALPHABET = "23456789CFGHJMPQRVWX"
+
+_PLUSCODE_CHARACTERS = np.frombuffer(_PLUSCODE_ALPHABET.encode(), dtype=np.uint8)
+
+_PLUSCODE_VALUES = np.full(256, -1, dtype=np.int64)
+for _value, _character in enumerate(_PLUSCODE_ALPHABET):
+    _PLUSCODE_VALUES[ord(_character)] = _value
+    _PLUSCODE_VALUES[ord(_character.lower())] = _value
+
+_PLUSCODE_SEPARATOR = ord("+")
+_PLUSCODE_PADDING = ord("0")
+_PLUSCODE_SEPARATOR_POSITION = 8
+_PLUSCODE_PAIR_CODE_LENGTH = 10
+_PLUSCODE_MAX_DIGIT_COUNT = 15
+_PLUSCODE_PAIR_PRECISION = 8000
+_PLUSCODE_FINAL_LAT_PRECISION = _PLUSCODE_PAIR_PRECISION * 5**5
+_PLUSCODE_FINAL_LNG_PRECISION = _PLUSCODE_PAIR_PRECISION * 4**5
+
+
+def _normalize_longitudes(lng):
+    """Normalize an array of longitudes to the [-180, 180) range.
+
+    Parameters
+    ----------
+    lng : numpy.ndarray
+        Longitudes.
+
+    Returns
+    -------
+    numpy.ndarray
+        Normalized longitudes.
+    """
+    lng = np.mod(lng + 180, 360) - 180
+    return np.where(lng >= 180, lng - 360, lng)
+
+
+def _encode_pluscodes(lng, lat, code_length):
+    """Convert arrays of longitudes and latitudes to Plus Codes.
+
+    This is a vectorized version of the Open Location Code reference encoder: coordinates are converted to integers at the
+    final precision and every digit of every code is computed at once with integer arithmetic.
+
+    Parameters
+    ----------
+    lng : numpy.ndarray
+        Longitudes.
+    lat : numpy.ndarray
+        Latitudes.
+    code_length : int
+        The number of significant digits in the output codes, between 2 and 15. Shorter codes are less precise.
+
+    Returns
+    -------
+    numpy.ndarray
+        The Plus Codes represented by the coordinates.
+    """
+    if code_length < 2 or (
+        code_length < _PLUSCODE_PAIR_CODE_LENGTH and code_length % 2 == 1
+    ):
+        raise ValueError(f"Invalid Open Location Code length - {code_length}")
+    code_length = min(code_length, _PLUSCODE_MAX_DIGIT_COUNT)
+
+    lat = np.clip(np.asarray(lat, dtype=float), -90, 90)
+    lng = _normalize_longitudes(np.asarray(lng, dtype=float))
+
+    if code_length <= _PLUSCODE_PAIR_CODE_LENGTH:
+        precision = 20.0 ** (code_length // -2 + 2)
+    else:
+        precision = 20.0**-3 / 5 ** (code_length - _PLUSCODE_PAIR_CODE_LENGTH)
+    lat = np.where(lat == 90, lat - precision, lat)
+
+    lat_value = np.floor(
+        np.round((lat + 90) * _PLUSCODE_FINAL_LAT_PRECISION, 6)
+    ).astype(np.int64)
+    lng_value = np.floor(
+        np.round((lng + 180) * _PLUSCODE_FINAL_LNG_PRECISION, 6)
+    ).astype(np.int64)
+
+    digits = np.empty((lat.size, _PLUSCODE_MAX_DIGIT_COUNT), dtype=np.int64)
+    for i in range(_PLUSCODE_MAX_DIGIT_COUNT - 1, _PLUSCODE_PAIR_CODE_LENGTH - 1, -1):
+        digits[:, i] = (lat_value % 5) * 4 + lng_value % 4
+        lat_value //= 5
+        lng_value //= 4
+    for i in range(_PLUSCODE_PAIR_CODE_LENGTH - 2, -1, -2):
+        digits[:, i] = lat_value % 20
+        digits[:, i + 1] = lng_value % 20
+        lat_value //= 20
+        lng_value //= 20
+
+    characters = _PLUSCODE_CHARACTERS[digits]
+    separator = np.full((lat.size, 1), _PLUSCODE_SEPARATOR, dtype=np.uint8)
+    if code_length >= _PLUSCODE_SEPARATOR_POSITION:
+        parts = [
+            characters[:, :_PLUSCODE_SEPARATOR_POSITION],
+            separator,
+            characters[:, _PLUSCODE_SEPARATOR_POSITION:code_length],
+        ]
+    else:
+        padding = np.full(
+            (lat.size, _PLUSCODE_SEPARATOR_POSITION - code_length),
+            _PLUSCODE_PADDING,
+            dtype=np.uint8,
+        )
+        parts = [characters[:, :code_length], padding, separator]
+    characters = np.concatenate(parts, axis=1)
+
+    return characters.view(f"S{characters.shape[1]}").ravel().astype(str)
+
+
+def _pluscode_characters(pluscodes):
+    """Convert a list of Plus Codes to a matrix of ASCII character codes.
+
+    Parameters
+    ----------
+    pluscodes : list[str]
+        Plus Codes.
+
+    Returns
+    -------
+    tuple
+        The character codes (one row per Plus Code, zero-padded to at least the separator position) and the length of
+        each Plus Code.
+    """
+    try:
+        pluscodes = np.asarray(pluscodes, dtype="S")
+    except UnicodeEncodeError:
+        raise ValueError("Plus code could not be decoded.")
+
+    characters = pluscodes.view(np.uint8).reshape(pluscodes.size, -1)
+    width = _PLUSCODE_SEPARATOR_POSITION + 1
+    if characters.shape[1] < width:
+        characters = np.pad(characters, ((0, 0), (0, width - characters.shape[1])))
+
+    return characters, np.char.str_len(pluscodes)
+
+
+def _is_full_pluscode(characters, lengths):
+    """Test which Plus Codes are valid full codes.
+
+    Parameters
+    ----------
+    characters : numpy.ndarray
+        Character codes returned by _pluscode_characters().
+    lengths : numpy.ndarray
+        Lengths returned by _pluscode_characters().
+
+    Returns
+    -------
+    numpy.ndarray
+        True for the valid full Plus Codes.
+    """
+    position = np.arange(characters.shape[1])
+    values = _PLUSCODE_VALUES[characters]
+    is_digit = (values >= 0) | (position >= lengths[:, None])
+
+    padding = characters[:, :_PLUSCODE_SEPARATOR_POSITION] == _PLUSCODE_PADDING
+    padding_start = np.where(
+        padding.any(axis=1), padding.argmax(axis=1), _PLUSCODE_SEPARATOR_POSITION
+    )
+    before_padding = position[:_PLUSCODE_SEPARATOR_POSITION] < padding_start[:, None]
+
+    return (
+        (characters[:, _PLUSCODE_SEPARATOR_POSITION] == _PLUSCODE_SEPARATOR)
+        & np.where(
+            before_padding, is_digit[:, :_PLUSCODE_SEPARATOR_POSITION], padding
+        ).all(axis=1)
+        & is_digit[:, _PLUSCODE_SEPARATOR_POSITION + 1 :].all(axis=1)
+        & (padding_start >= 2)
+        & (padding_start % 2 == 0)
+        & (
+            (padding_start == _PLUSCODE_SEPARATOR_POSITION)
+            | (lengths == _PLUSCODE_SEPARATOR_POSITION + 1)
+        )
+        & (lengths != _PLUSCODE_SEPARATOR_POSITION + 2)
+        & (values[:, 0] < 9)
+        & (values[:, 1] < 18)
+    )
+
+
+def _decode_pluscodes(pluscodes):
+    """Convert full Plus Codes to the longitudes and latitudes of their centroids.
+
+    This is a vectorized version of the Open Location Code reference decoder.
+
+    Parameters
+    ----------
+    pluscodes : list[str]
+        Full Plus Codes.
+
+    Returns
+    -------
+    tuple
+        The longitudes and latitudes of the Plus Code centroids.
+    """
+    characters, lengths = _pluscode_characters(pluscodes)
+    full = _is_full_pluscode(characters, lengths)
+    if not full.all():
+        invalid = pluscodes[int(np.argmin(full))]
+        raise ValueError(f"{invalid} is not a valid full Plus Code.")
+
+    values = np.delete(
+        _PLUSCODE_VALUES[characters], _PLUSCODE_SEPARATOR_POSITION, axis=1
+    )
+    digits = np.zeros((len(lengths), _PLUSCODE_MAX_DIGIT_COUNT), dtype=np.int64)
+    values = values[:, :_PLUSCODE_MAX_DIGIT_COUNT]
+    digits[:, : values.shape[1]] = values
+
+    padding = characters[:, :_PLUSCODE_SEPARATOR_POSITION] == _PLUSCODE_PADDING
+    digit_count = np.where(
+        padding.any(axis=1),
+        padding.argmax(axis=1),
+        np.minimum(lengths - 1, _PLUSCODE_MAX_DIGIT_COUNT),
+    )
+    digits[np.arange(_PLUSCODE_MAX_DIGIT_COUNT) >= digit_count[:, None]] = 0
+
+    pair_values = 20 ** np.arange(4, -1, -1)
+    pair_lat = digits[:, 0:_PLUSCODE_PAIR_CODE_LENGTH:2] @ pair_values
+    pair_lng = digits[:, 1:_PLUSCODE_PAIR_CODE_LENGTH:2] @ pair_values
+    grid = digits[:, _PLUSCODE_PAIR_CODE_LENGTH:]
+    grid_lat = (grid // 4) @ 5 ** np.arange(4, -1, -1)
+    grid_lng = (grid % 4) @ 4 ** np.arange(4, -1, -1)
+
+    pair_place = 20.0 ** (5 - np.minimum(digit_count, _PLUSCODE_PAIR_CODE_LENGTH) // 2)
+    extra_digits = digit_count > _PLUSCODE_PAIR_CODE_LENGTH
+    lat_precision = np.where(
+        extra_digits,
+        5.0 ** (_PLUSCODE_MAX_DIGIT_COUNT - digit_count)
+        / _PLUSCODE_FINAL_LAT_PRECISION,
+        pair_place / _PLUSCODE_PAIR_PRECISION,
+    )
+    lng_precision = np.where(
+        extra_digits,
+        4.0 ** (_PLUSCODE_MAX_DIGIT_COUNT - digit_count)
+        / _PLUSCODE_FINAL_LNG_PRECISION,
+        pair_place / _PLUSCODE_PAIR_PRECISION,
+    )
+
+    lat = (
+        pair_lat / _PLUSCODE_PAIR_PRECISION
+        - 90
+        + grid_lat / _PLUSCODE_FINAL_LAT_PRECISION
+    )
+    lng = (
+        pair_lng / _PLUSCODE_PAIR_PRECISION
+        - 180
+        + grid_lng / _PLUSCODE_FINAL_LNG_PRECISION
+    )
+    south, north = np.round(lat, 14), np.round(lat + lat_precision, 14)
+    west, east = np.round(lng, 14), np.round(lng + lng_precision, 14)
+
+    return (
+        np.minimum(west + (east - west) / 2, 180),
+        np.minimum(south + (north - south) / 2, 90),
+    )
+
+
+def _recover_pluscodes(shortcodes, lng, lat):
+    """Convert short Plus Codes to the longitudes and latitudes of the centroids of the nearest matching full codes.
+
+    This is a vectorized version of the Open Location Code reference recoverNearest() followed by decode().
+
+    Parameters
+    ----------
+    shortcodes : list[str]
+        Short Plus Codes.
+    lng : numpy.ndarray
+        Longitudes of the reference locations.
+    lat : numpy.ndarray
+        Latitudes of the reference locations.
+
+    Returns
+    -------
+    tuple
+        The longitudes and latitudes of the Plus Code centroids.
+    """
+    characters, lengths = _pluscode_characters(shortcodes)
+    position = np.arange(characters.shape[1])
+    in_code = position < lengths[:, None]
+    separator = characters == _PLUSCODE_SEPARATOR
+    separator_index = separator.argmax(axis=1)
+    valid = (
+        (separator.sum(axis=1) == 1)
+        & (separator_index < _PLUSCODE_SEPARATOR_POSITION)
+        & (separator_index % 2 == 0)
+        & ((_PLUSCODE_VALUES[characters] >= 0) | separator | ~in_code).all(axis=1)
+        & (lengths - separator_index != 2)
+    )
+    if not valid.all():
+        invalid = shortcodes[int(np.argmin(valid))]
+        raise ValueError(f"{invalid} is not a valid short Plus Code.")
+
+    lat = np.clip(np.asarray(lat, dtype=float), -90, 90)
+    lng = _normalize_longitudes(np.asarray(lng, dtype=float))
+
+    prefix_length = _PLUSCODE_SEPARATOR_POSITION - separator_index
+    prefixes = _encode_pluscodes(lng, lat, _PLUSCODE_PAIR_CODE_LENGTH)
+    prefixes = prefixes.astype("S").view(np.uint8).reshape(len(lengths), -1)
+
+    target = np.arange(characters.shape[1] + _PLUSCODE_SEPARATOR_POSITION)
+    source = np.clip(target - prefix_length[:, None], 0, characters.shape[1] - 1)
+    full_codes = np.where(
+        target < prefix_length[:, None],
+        prefixes[:, np.minimum(target, _PLUSCODE_SEPARATOR_POSITION - 1)],
+        np.take_along_axis(characters, source, axis=1),
+    )
+    full_codes[target >= (prefix_length + lengths)[:, None]] = 0
+    full_codes = np.ascontiguousarray(full_codes.astype(np.uint8))
+    full_codes = full_codes.view(f"S{full_codes.shape[1]}").ravel().astype(str)
+
+    center_lng, center_lat = _decode_pluscodes(full_codes.tolist())
+
+    resolution = 20.0 ** (2 - prefix_length / 2)
+    half_resolution = resolution / 2
+    center_lat = np.where(
+        (lat + half_resolution < center_lat) & (center_lat - resolution >= -90),
+        center_lat - resolution,
+        np.where(
+            (lat - half_resolution > center_lat) & (center_lat + resolution <= 90),
+            center_lat + resolution,
+            center_lat,
+        ),
+    )
+    center_lng = np.where(
+        lng + half_resolution < center_lng,
+        center_lng - resolution,
+        np.where(
+            lng - half_resolution > center_lng, center_lng + resolution, center_lng
+        ),
+    )
+
+    return _normalize_longitudes(center_lng), center_lat
+
+
+def _parse_code_and_reference_from_pluscode(pluscode):
+    """Split a short Plus Code into a Plus Code and reference using regex. For example, "QXGV+XH Denver, CO, USA" will
+    return ("QXGV+XH", "Denver, CO, USA").
+
+    Parameters
+    ----------
+    pluscode : str
+        A short Plus Code with a queryable reference location appended to it, delimited by whitespace.
+
+    Returns
+    -------
+    tuple
+        The short Plus Code and the reference.
+    """
+    pattern = r"\w{1,8}\+\w{,7}"
+    code = None
+
+    for chunk in pluscode.split(" "):
+        match = re.search(pattern, chunk)
+        code = match.group(0) if match else code
+
+    if not code:
+        raise ValueError("Plus code could not be decoded.")
+
+    reference = pluscode.replace(code, "")
+
+    return (code, reference)
+
+
+def _is_coordinate_like(x):
+    """Test if an object appears to be a longitude, latitude coordinate.
+
+    This doesn't test if the coordinate is valid, only that it has the correct data structure: an iterable containing two
+    numbers.
+
+    Parameters
+    ----------
+    x : Object
+        Any object that will be tested for coordinate-like structure.
+
+    Returns
+    -------
+    bool
+        True if the input object resembles a longitude, latitude coordinate.
+    """
+    if not isinstance(x, (list, tuple)) or len(x) != 2:
+        return False
+    for element in x:
+        if not isinstance(element, (int, float)):
+            return False
+
+    return True
+
+
+def _geometry_coordinates(geometry):
+    """Returns the coordinates of a GeoJSON geometry.
+
+    Parameters
+    ----------
+    geometry : dict
+        GeoJSON geometry retrieved from Earth Engine.
+
+    Returns
+    -------
+    list
+        The coordinates of the geometry. For a GeometryCollection, the list of the coordinates of its geometries.
+    """
+    if geometry["type"] == "GeometryCollection":
+        return [_geometry_coordinates(x) for x in geometry["geometries"]]
+    return geometry["coordinates"]
+
+
+def _map_nested(arr, is_leaf, function, message, kinds="", leaf_ndim=0):
+    """Apply a vectorized function to the leaves of an arbitrarily nested array.
+
+    The leaves are collected in a single pass, converted at once by the function and put back in place, so neither the
+    input array nor its elements are copied or converted one by one. Regular arrays of the given NumPy kinds are
+    converted to a NumPy array directly, without walking them.
+
+    Parameters
+    ----------
+    arr : object
+        An arbitrarily nested array, or a single leaf.
+    is_leaf : function
+        Function that tests if an element is a leaf.
+    function : function
+        Function that takes a sequence of leaves and returns a NumPy array with the converted leaves in the same order.
+    message : str
+        Message of the ValueError raised for elements that are neither leaves nor iterables. It is formatted with the
+        element.
+    kinds : str, default = ""
+        NumPy kinds of the leaves elements that allow the conversion of regular arrays to a NumPy array.
+    leaf_ndim : int, default = 0
+        Number of dimensions of a leaf in the NumPy array.
+
+    Returns
+    -------
+    object
+        An array matching the structure of the input array, with the leaves replaced by the converted values.
+    """
+    try:
+        regular = np.asarray(arr)
+    except ValueError:
+        regular = None
+
+    if (
+        regular is not None
+        and regular.dtype.kind in kinds
+        and regular.ndim >= leaf_ndim
+        and (leaf_ndim == 0 or regular.shape[-1] == 2)
+    ):
+        shape = regular.shape[: regular.ndim - leaf_ndim]
+        leaves = regular.reshape((-1,) + regular.shape[len(shape) :])
+        converted = function(leaves)
+        return converted.reshape(shape + converted.shape[1:]).tolist()
+
+    leaves = []
+
+    def flatten(x):
+        if is_leaf(x):
+            leaves.append(x)
+            return None
+        if not isinstance(x, (list, tuple)):
+            raise ValueError(message.format(x))
+        return [flatten(element) for element in x]
+
+    structure = flatten(arr)
+    converted = iter(function(leaves).tolist())
+
+    def rebuild(x):
+        if x is None:
+            return next(converted)
+        return [rebuild(element) for element in x]
+
+    return rebuild(structure)
+
+
+def _convert_lnglats_to_pluscodes(arr, code_length):
+    """Take an arbitrarily nested array and replace any element that looks like a coordinate with an equivalent Plus Code.
+    Raise a ValueError if any non-coordinate elements are found.
+
+    Parameters
+    ----------
+    arr : iterable
+        An arbitrarily nested array containing tuples of longitude, latitude coordinates.
+    code_length : int
+        The number of significant digits in the output code, between 2 and 15. Shorter codes are less precise.
+
+    Returns
+    -------
+    iterable
+        An array matching the structure of the input array, with coordinate tuples replaced with Plus Code strings.
+    """
+
+    def encode(coordinates):
+        coordinates = np.asarray(coordinates, dtype=float).reshape(-1, 2)
+        return _encode_pluscodes(coordinates[:, 0], coordinates[:, 1], code_length)
+
+    return _map_nested(
+        arr,
+        _is_coordinate_like,
+        encode,
+        "{} is not a coordinate or iterable of coordinates.",
+        kinds="iuf",
+        leaf_ndim=1,
+    )
+
+
+def _convert_pluscodes_to_lnglats(arr, geocoder, **kwargs):
+    """Take an arbitrarily nested array and replace any element that looks like a Plus Code with an equivalent longitude,
+    latitude tuple. Raise a ValueError if any non-Plus Code elements are found.
+
+    Full Plus Codes are decoded directly. Short Plus Codes must have a reference location appended to them that is geocoded
+    to recover the nearest full code. Each distinct reference is geocoded once (concurrently and through the geocoding
+    cache, if enabled) and all the short codes are then recovered at once.
+
+    Parameters
+    ----------
+    arr : iterable
+        An arbitrarily nested array containing Plus Code strings.
+    geocoder : str
+        Geocoder to use. Please visit https://geopy.readthedocs.io/ for more info.
+    **kwargs :
+        Keywords arguments for geolocator.geocode(). The user_agent argument is mandatory (this argument can be set as user_agent = 'my-gee-username' or
+        user_agent = 'my-gee-app-name'). Please visit https://geopy.readthedocs.io/ for more info.
+
+    Returns
+    -------
+    iterable
+        An array matching the structure of the input array, with Plus Code strings replaced with coordinate tuples.
+    """
+
+    def decode(pluscodes):
+        pluscodes = np.asarray(pluscodes, dtype=str).tolist()
+        if not pluscodes:
+            return np.empty((0, 2))
+
+        full = _is_full_pluscode(*_pluscode_characters(pluscodes))
+        references = {}
+        for i in np.flatnonzero(~full):
+            pluscodes[i], references[i] = _parse_code_and_reference_from_pluscode(
+                pluscodes[i]
+            )
+        if references:
+            full = _is_full_pluscode(*_pluscode_characters(pluscodes))
+
+        lng = np.empty(len(pluscodes))
+        lat = np.empty(len(pluscodes))
+        if full.any():
+            lng[full], lat[full] = _decode_pluscodes(
+                [code for code, isFull in zip(pluscodes, full) if isFull]
+            )
+
+        short = np.flatnonzero(~full)
+        if short.size:
+            short_references = [references[i].strip() for i in short]
+            if not all(short_references):
+                raise ValueError(
+                    'Short Plus Codes must include a reference location (e.g. "QXGV+XH Denver, CO, USA").'
+                )
+            distinct, inverse = np.unique(short_references, return_inverse=True)
+            locations = _retrieve_locations(distinct.tolist(), geocoder, **kwargs)
+            if any(location is None for location in locations):
+                raise Exception(_NO_MATCHES)
+            ref_lnglats = np.asarray(
+                [_lnglat_from_location(location) for location in locations]
+            )[inverse.ravel()]
+            lng[short], lat[short] = _recover_pluscodes(
+                [pluscodes[i] for i in short], ref_lnglats[:, 0], ref_lnglats[:, 1]
+            )
+
+        return np.column_stack([lng, lat])
+
+    return _map_nested(
+        arr,
+        lambda x: isinstance(x, str),
+        decode,
+        "{} is not a Plus Code or iterable of Plus Codes.",
+        kinds="U",
+    )
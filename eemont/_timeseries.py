@@ -0,0 +1,578 @@
+import concurrent.futures
+import os
+import time
+
+import ee
+import ee_extra.TimeSeries.core
+import pandas as pd
+import requests
+
+from .extending import _propagate
+
+_CHUNK_METHODS = ["count", "space"]
+
+_PAGE_FORMATS = ["pandas", "arrow"]
+
+_FILE_FORMATS = {".csv": "csv", ".parquet": "parquet", ".pq": "parquet"}
+
+
+def _load_pyarrow():
+    """Attempt to load the pyarrow package and return it.
+
+    pyarrow is only required to retrieve Arrow record batches or to write Parquet files,
+    so it is not an installation dependency of eemont and it is only loaded if needed.
+
+    Returns
+    -------
+    module
+        The pyarrow module.
+    """
+    try:
+        import pyarrow
+        import pyarrow.parquet
+
+        return pyarrow
+    except ImportError:
+        raise ImportError(
+            'pyarrow could not be loaded. Try installing with "pip install pyarrow".'
+        )
+
+
+def _properties_only(x, columns=None):
+    """Drops the geometries of a feature collection, keeping all the properties.
+
+    Parameters
+    ----------
+    x : ee.FeatureCollection
+        Feature collection to drop the geometries from.
+    columns : list[str], default = None
+        Properties to keep. If None, all the properties are kept.
+
+    Returns
+    -------
+    ee.FeatureCollection
+        Feature collection without geometries.
+    """
+    return x.select([".*"] if columns is None else columns, None, False)
+
+
+def _parse_dates(column, dateFormat="ISO"):
+    """Converts a date column into datetime64.
+
+    Parameters
+    ----------
+    column : pd.Series
+        Dates retrieved from Earth Engine.
+    dateFormat : str, default = 'ISO'
+        Format of the dates. One of 'ms' (milliseconds), 'ISO' or a custom format
+        pattern (the format is inferred from the first date).
+
+    Returns
+    -------
+    pd.Series
+        Dates as datetime64.
+    """
+    if dateFormat == "ms":
+        return pd.to_datetime(column, unit="ms")
+    if dateFormat == "ISO":
+        try:
+            return pd.to_datetime(column, format="ISO8601")
+        except ValueError:
+            # pandas < 2.0 doesn't know the ISO8601 format
+            return pd.to_datetime(column)
+    return pd.to_datetime(column)
+
+
+def _features_to_pandas(
+    features, columns=None, naValue=None, dateColumn=None, dateFormat="ISO"
+):
+    """Converts a list of GeoJSON features to a pd.DataFrame of their properties.
+
+    The properties are transposed into columns in a single pass and each column is then
+    decoded as a whole: numeric columns keep their int64 or float64 dtype, naValue
+    becomes NaN and the date column is parsed into datetime64.
+
+    Parameters
+    ----------
+    features : list
+        Features retrieved with getInfo().
+    columns : list[str], default = None
+        Properties to keep. If None, all the properties are kept.
+    naValue : numeric, default = None
+        Value to convert to NaN in numeric columns.
+    dateColumn : str, default = None
+        Column to convert to datetime64.
+    dateFormat : str, default = 'ISO'
+        Format of the dates in dateColumn.
+
+    Returns
+    -------
+    pd.DataFrame
+        Properties of the features.
+    """
+    frame = pd.DataFrame(
+        [feature.get("properties") or {} for feature in features], columns=columns
+    )
+
+    if naValue is not None:
+        for column in frame.select_dtypes("number").columns:
+            na = frame[column].to_numpy() == naValue
+            if na.any():
+                frame[column] = frame[column].mask(na)
+
+    if dateColumn is not None and dateColumn in frame.columns:
+        frame[dateColumn] = _parse_dates(frame[dateColumn], dateFormat)
+
+    return frame
+
+
+def _pandas_to_arrow(frame, pa, table=True):
+    """Converts a pd.DataFrame into a pyarrow table or record batch.
+
+    NaN values are stored as nulls.
+
+    Parameters
+    ----------
+    frame : pd.DataFrame
+        Data frame to convert.
+    pa : module
+        The pyarrow module.
+    table : boolean, default = True
+        Whether to return a pyarrow.Table or a pyarrow.RecordBatch.
+
+    Returns
+    -------
+    pyarrow.Table | pyarrow.RecordBatch
+        Converted data frame.
+    """
+    if table:
+        return pa.Table.from_pandas(frame, preserve_index=False)
+    return pa.RecordBatch.from_pandas(frame, preserve_index=False)
+
+
+def _get_features(
+    x, columns=None, pageSize=5000, maxWorkers=8, maxRetries=3, geometries=False
+):
+    """Retrieves the features of a feature collection, without geometries by default.
+
+    If pageSize is not None, the size of the collection is retrieved first and the
+    pages are retrieved with toList(pageSize, offset) in concurrent requests.
+
+    Parameters
+    ----------
+    x : ee.FeatureCollection
+        Feature collection to retrieve.
+    columns : list[str], default = None
+        Properties to retrieve. If None, all the properties are retrieved.
+    pageSize : int, default = 5000
+        Maximum number of features per request. If None, the collection is retrieved
+        in a single request.
+    maxWorkers : int, default = 8
+        Maximum number of concurrent requests.
+    maxRetries : int, default = 3
+        Maximum number of retries of each request.
+    geometries : boolean, default = False
+        Whether to retrieve the geometries of the features.
+
+    Returns
+    -------
+    list
+        Features of the collection.
+    """
+    if geometries:
+        x = x.select([".*"] if columns is None else columns)
+    else:
+        x = _properties_only(x, columns)
+
+    if pageSize is None:
+        return _retry(lambda: x.getInfo()["features"], maxRetries)
+
+    if pageSize < 1:
+        raise Exception(f"[pageSize] must be positive! Value passed: {pageSize}")
+
+    size = x.size().getInfo()
+    pages = [x.toList(pageSize, offset) for offset in range(0, size, pageSize)]
+
+    def getPage(page):
+        return _retry(page.getInfo, maxRetries)
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=maxWorkers) as executor:
+        pages = list(executor.map(_propagate(getPage), pages))
+
+    return [feature for page in pages for feature in page]
+
+
+def _iter_pages(x, pageSize=5000, format="pandas"):
+    """Retrieves the properties of a feature collection page by page.
+
+    The arguments are validated when this function is called, and the pages are
+    retrieved lazily by the returned generator.
+
+    Parameters
+    ----------
+    x : ee.FeatureCollection
+        Feature collection to retrieve.
+    pageSize : int, default = 5000
+        Maximum number of features per page.
+    format : str, default = 'pandas'
+        Format of the pages. One of 'pandas' (pd.DataFrame) or 'arrow'
+        (pyarrow.RecordBatch).
+
+    Returns
+    -------
+    generator
+        Properties of the features of each page, as pd.DataFrame or
+        pyarrow.RecordBatch objects.
+    """
+    if format not in _PAGE_FORMATS:
+        raise Exception(
+            f"Invalid format! Use one of {_PAGE_FORMATS}. Value passed: format = {format}"
+        )
+
+    if pageSize < 1:
+        raise Exception(f"[pageSize] must be positive! Value passed: {pageSize}")
+
+    pa = _load_pyarrow() if format == "arrow" else None
+
+    return _generate_pages(_properties_only(x), pageSize, pa)
+
+
+def _generate_pages(x, pageSize, pa=None):
+    """Generates the pages of a feature collection sorted by system:index.
+
+    Each page is retrieved in a separate request as the first pageSize features whose
+    system:index is greater than the last one of the previous page, so the server
+    doesn't rebuild the previous pages as with toList(pageSize, offset). Only one page
+    is held in memory at a time and iteration stops at the first page with fewer than
+    pageSize features.
+
+    Parameters
+    ----------
+    x : ee.FeatureCollection
+        Feature collection to retrieve.
+    pageSize : int
+        Maximum number of features per page.
+    pa : module, default = None
+        The pyarrow module. If given, the pages are pyarrow.RecordBatch objects.
+
+    Yields
+    ------
+    pd.DataFrame | pyarrow.RecordBatch
+        Properties of the features of each page.
+    """
+    last = None
+
+    while True:
+        page = x if last is None else x.filter(ee.Filter.gt("system:index", last))
+        features = page.limit(pageSize, "system:index").toList(pageSize).getInfo()
+        if features:
+            frame = _features_to_pandas(features)
+            if pa is not None:
+                yield _pandas_to_arrow(frame, pa, False)
+            else:
+                yield frame
+        if len(features) < pageSize:
+            return
+        last = features[-1]["id"]
+
+
+def _write_pages(pages, path, fileFormat=None):
+    """Writes pages of rows to a CSV or Parquet file incrementally.
+
+    The columns of the first page define the columns of the file. Each page is
+    appended to the file as soon as it is received.
+
+    Parameters
+    ----------
+    pages : iterable
+        Pages retrieved from _iter_pages() as pd.DataFrame objects.
+    path : str
+        Path of the file.
+    fileFormat : str, default = None
+        One of 'csv' or 'parquet'. If None, it is inferred from the file extension.
+
+    Returns
+    -------
+    int
+        Number of rows written.
+    """
+    if fileFormat is None:
+        fileFormat = _FILE_FORMATS.get(os.path.splitext(path)[1].lower())
+    if fileFormat not in ["csv", "parquet"]:
+        raise Exception(
+            f"Invalid file format! Use one of ['csv', 'parquet']. Value passed: {fileFormat}"
+        )
+
+    pa = _load_pyarrow() if fileFormat == "parquet" else None
+    columns = None
+    writer = None
+    rows = 0
+
+    try:
+        for page in pages:
+            if columns is None:
+                columns = list(page.columns)
+            else:
+                page = page.reindex(columns=columns)
+            if fileFormat == "csv":
+                page.to_csv(
+                    path, mode="a" if rows else "w", header=not rows, index=False
+                )
+            else:
+                schema = None if writer is None else writer.schema
+                table = pa.Table.from_pandas(page, schema=schema, preserve_index=False)
+                if writer is None:
+                    writer = pa.parquet.ParquetWriter(path, table.schema)
+                writer.write_table(table)
+            rows += len(page)
+    finally:
+        if writer is not None:
+            writer.close()
+
+    return rows
+
+
+def _get_time_series_chunks(
+    x, collection, bands=None, chunkSize=500, dateWindow=None, chunkBy="count"
+):
+    """Splits a time series by regions into chunks of features and date windows.
+
+    The IDs of the features (and, if required, the grid cells of their centroids), the
+    date range of the image collection and, if required, its bands are retrieved in a
+    single request. The features are split into chunks client-side and each chunk
+    filters the collection by its IDs, so the requests of the chunks don't sort the
+    collection or convert it into a list.
+
+    Parameters
+    ----------
+    x : ee.ImageCollection
+        Image collection to get the time series from.
+    collection : ee.FeatureCollection
+        Feature collection to perform the reductions on.
+    bands : str | list[str], default = None
+        Selection of bands. If None, the bands of the first image are retrieved.
+    chunkSize : int, default = 500
+        Maximum number of features per chunk.
+    dateWindow : numeric, default = None
+        Length in days of the date windows. If None, the image collection is not split.
+    chunkBy : str, default = 'count'
+        How to group features into chunks. 'count' keeps the order of the collection,
+        'space' sorts the features by 1 degree grid cells of their centroids first, so
+        each chunk covers a compact area.
+
+    Returns
+    -------
+    tuple
+        List of (ee.ImageCollection, ee.FeatureCollection) chunks and list of bands.
+    """
+    if not isinstance(collection, ee.featurecollection.FeatureCollection):
+        raise Exception("Parameter collection must be an ee.FeatureCollection!")
+
+    if chunkBy not in _CHUNK_METHODS:
+        raise Exception(
+            f"Invalid chunkBy! Use one of {_CHUNK_METHODS}. Value passed: chunkBy = {chunkBy}"
+        )
+
+    if chunkSize < 1:
+        raise Exception(f"[chunkSize] must be positive! Value passed: {chunkSize}")
+
+    if dateWindow is not None and dateWindow <= 0:
+        raise Exception(f"[dateWindow] must be positive! Value passed: {dateWindow}")
+
+    if chunkBy == "space":
+
+        def getCell(feature):
+            coordinates = feature.geometry().centroid(1).coordinates()
+            column = ee.Number(coordinates.get(0)).add(180).floor()
+            row = ee.Number(coordinates.get(1)).add(90).floor()
+            return feature.set("eemontCell", column.multiply(1000).add(row))
+
+        cells = collection.map(getCell).aggregate_array("eemontCell")
+    else:
+        cells = ee.List([])
+
+    info = [
+        collection.aggregate_array("system:index"),
+        cells,
+        x.aggregate_min("system:time_start"),
+        x.aggregate_max("system:time_start"),
+    ]
+    if bands is None:
+        info.append(x.first().bandNames())
+    info = ee.List(info).getInfo()
+    IDs, cells, start, end = info[:4]
+    if bands is None:
+        bands = info[4]
+    elif not isinstance(bands, list):
+        bands = [bands]
+
+    if chunkBy == "space":
+        IDs = [ID for _, ID in sorted(zip(cells, IDs), key=lambda pair: pair[0])]
+    IDs = list(dict.fromkeys(IDs))
+
+    featureChunks = [
+        collection.filter(ee.Filter.inList("system:index", IDs[i : i + chunkSize]))
+        for i in range(0, len(IDs), chunkSize)
+    ]
+
+    if dateWindow is None or start is None:
+        imageChunks = [x]
+    else:
+        window = dateWindow * 86400000
+        imageChunks = [
+            x.filter(
+                ee.Filter.And(
+                    ee.Filter.gte("system:time_start", windowStart),
+                    ee.Filter.lt("system:time_start", windowStart + window),
+                )
+            )
+            for windowStart in range(int(start), int(end) + 1, int(window))
+        ]
+
+    chunks = [
+        (images, features) for features in featureChunks for images in imageChunks
+    ]
+
+    return chunks, bands
+
+
+_TRANSIENT_MESSAGES = [
+    "too many concurrent aggregations",
+    "computation timed out",
+    "deadline exceeded",
+    "too many requests",
+    "quota exceeded",
+    "rate limit",
+    "service unavailable",
+    "internal error",
+    "backend error",
+]
+
+
+def _is_transient(error):
+    """Checks whether an error of a request to Earth Engine is transient, so the request
+    may succeed if it is retried.
+
+    Parameters
+    ----------
+    error : Exception
+        Error raised by the request.
+
+    Returns
+    -------
+    boolean
+        Whether the error is a timeout, a connection error, an HTTP 429 or 5xx error, or
+        an Earth Engine error caused by the load of the server (e.g. too many concurrent
+        aggregations).
+    """
+    status = getattr(getattr(error, "resp", None), "status", None)
+    if status is None:
+        status = getattr(getattr(error, "response", None), "status_code", None)
+    if status is not None:
+        return int(status) == 429 or int(status) >= 500
+    if isinstance(
+        error,
+        (
+            TimeoutError,
+            ConnectionError,
+            requests.exceptions.ConnectionError,
+            requests.exceptions.Timeout,
+        ),
+    ):
+        return True
+    message = str(error).lower()
+    return any(transient in message for transient in _TRANSIENT_MESSAGES)
+
+
+def _retry(function, maxRetries=3, backoff=1.0):
+    """Calls a function, retrying it with exponential backoff if it fails with a
+    transient error. Other errors (e.g. invalid band names) are raised at once.
+
+    Parameters
+    ----------
+    function : callable
+        Function to call without arguments.
+    maxRetries : int, default = 3
+        Maximum number of retries.
+    backoff : float, default = 1.0
+        Seconds to wait before the first retry. The wait doubles after each retry.
+
+    Returns
+    -------
+    Any
+        Value returned by the function.
+    """
+    for attempt in range(maxRetries + 1):
+        try:
+            return function()
+        except Exception as error:
+            if attempt == maxRetries or not _is_transient(error):
+                raise
+            time.sleep(backoff * 2**attempt)
+
+
+def _get_time_series_by_regions_chunked(
+    x,
+    reducer,
+    collection,
+    bands=None,
+    scale=None,
+    crs=None,
+    crsTransform=None,
+    tileScale=1,
+    dateColumn="date",
+    dateFormat="ISO",
+    naValue=-9999,
+    chunkSize=500,
+    dateWindow=None,
+    chunkBy="count",
+    maxWorkers=8,
+    maxRetries=3,
+    backoff=1.0,
+):
+    """Gets the time series by regions in concurrent chunks and concatenates them.
+
+    Each chunk (a group of features and a date window) is a separate request sent by a
+    bounded thread pool and retried on failure. See
+    ee.ImageCollection.getTimeSeriesByRegionsChunked() for the parameters.
+
+    Returns
+    -------
+    pd.DataFrame
+        Time series by regions.
+    """
+    chunks, bands = _get_time_series_chunks(
+        x, collection, bands, chunkSize, dateWindow, chunkBy
+    )
+
+    tsChunks = [
+        _properties_only(
+            ee_extra.TimeSeries.core.getTimeSeriesByRegions(
+                images,
+                reducer,
+                features,
+                bands,
+                scale,
+                crs,
+                crsTransform,
+                tileScale,
+                dateColumn,
+                dateFormat,
+                naValue,
+            )
+        )
+        for images, features in chunks
+    ]
+
+    def getChunk(ts):
+        features = _retry(lambda: ts.getInfo()["features"], maxRetries, backoff)
+        return _features_to_pandas(features)
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=maxWorkers) as executor:
+        frames = list(executor.map(_propagate(getChunk), tsChunks))
+
+    frames = [frame for frame in frames if not frame.empty]
+    if not frames:
+        return pd.DataFrame()
+
+    return pd.concat(frames, ignore_index=True)
@@ -0,0 +1,321 @@
+import collections
+import functools
+import json
+import logging
+import threading
+import time
+
+import ee
+
+from .extending import _add_listener, _calling_extensions, _remove_listener
+
+_LOGGER = logging.getLogger("eemont")
+
+
+def _walk_graph(values, node, stats=None):
+    """Walks a node of a serialized graph, following the references to shared values
+    once.
+
+    Parameters
+    ----------
+    values : dict
+        Shared values of the graph, by reference.
+    node : dict | list
+        Node to walk.
+    stats : dict, default = None
+        Statistics updated by the walk. A new one is created if None.
+
+    Returns
+    -------
+    dict
+        Calls to each function ('functions'), references to each shared value
+        ('references'), depths of the shared values already walked ('depths') and
+        maximum number of nested function calls under the node ('depth').
+    """
+    if stats is None:
+        stats = {
+            "functions": collections.Counter(),
+            "references": collections.Counter(),
+            "depths": {},
+        }
+    stats["depth"] = _walk_node(values, node, stats)
+    return stats
+
+
+def _walk_node(values, node, stats):
+    """Walks a node of a serialized graph. See _walk_graph().
+
+    Returns
+    -------
+    int
+        Maximum number of nested function calls under the node.
+    """
+    if isinstance(node, list):
+        return max([_walk_node(values, child, stats) for child in node], default=0)
+    if "valueReference" in node:
+        reference = node["valueReference"]
+        stats["references"][reference] += 1
+        if reference not in stats["depths"]:
+            stats["depths"][reference] = _walk_node(values, values[reference], stats)
+        return stats["depths"][reference]
+    if "functionInvocationValue" in node:
+        invocation = node["functionInvocationValue"]
+        children = list(invocation["arguments"].values())
+        if "functionReference" in invocation:
+            children.append({"valueReference": invocation["functionReference"]})
+        stats["functions"][invocation.get("functionName", "<custom>")] += 1
+        return 1 + _walk_node(values, children, stats)
+    if "functionDefinitionValue" in node:
+        body = node["functionDefinitionValue"]["body"]
+        return _walk_node(values, {"valueReference": body}, stats)
+    if "arrayValue" in node:
+        return _walk_node(values, node["arrayValue"]["values"], stats)
+    if "dictionaryValue" in node:
+        children = list(node["dictionaryValue"]["values"].values())
+        return _walk_node(values, children, stats)
+    return 0
+
+
+def _graph_stats(x, top=10):
+    """Computes the statistics of the graph of an ee object. See graphStats().
+
+    Parameters
+    ----------
+    x : ee.ComputedObject
+        Object to get the statistics from.
+    top : int, default = 10
+        Number of most called functions to report.
+
+    Returns
+    -------
+    dict
+        Statistics of the graph.
+    """
+    serialized = ee.serializer.toJSON(x)
+    graph = json.loads(serialized)
+    stats = _walk_graph(graph["values"], {"valueReference": graph["result"]})
+    return {
+        "bytes": len(serialized.encode()),
+        "nodes": sum(stats["functions"].values()),
+        "depth": stats["depth"],
+        "duplicated": sum(count > 1 for count in stats["references"].values()),
+        "functions": dict(stats["functions"].most_common(top)),
+    }
+
+
+class _GraphProfiler:
+    """Profiler of the graphs built by the extension methods. See profileGraphs()."""
+
+    def __init__(self, callback=None, top=5):
+        self.records = []
+        self._callback = callback
+        self._top = top
+        self._thread = None
+
+    def __enter__(self):
+        self._thread = threading.get_ident()
+        _add_listener(self._record)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        _remove_listener(self._record)
+        return False
+
+    def _record(self, method, result, seconds):
+        if threading.get_ident() != self._thread:
+            return
+        if method.split(".")[-1].startswith("__"):
+            return
+        if not isinstance(result, ee.computedobject.ComputedObject):
+            return
+        stack = _calling_extensions()
+        record = {
+            "method": method,
+            "caller": stack[-1] if stack else None,
+            "seconds": seconds,
+            **_graph_stats(result, self._top),
+        }
+        self.records.append(record)
+        _LOGGER.info(
+            "%s: %d bytes, %d nodes, depth %d, %d duplicated subgraphs (%.3f s)",
+            method,
+            record["bytes"],
+            record["nodes"],
+            record["depth"],
+            record["duplicated"],
+            seconds,
+        )
+        if self._callback is not None:
+            self._callback(record)
+
+
+_TRACED_REQUESTS = [
+    "computeFeatures",
+    "computeImages",
+    "computePixels",
+    "computeValue",
+    "exportImage",
+    "exportTable",
+    "getAsset",
+    "getDownloadId",
+    "getInfo",
+    "getList",
+    "getMapId",
+    "getTableDownloadId",
+    "getThumbId",
+    "listAssets",
+    "listFeatures",
+    "listImages",
+]
+
+_TRACERS = []
+
+_TRACING = threading.local()
+
+_TRACING_LOCK = threading.Lock()
+
+
+def _load_opentelemetry():
+    """Attempt to load the OpenTelemetry API and return its trace module.
+
+    OpenTelemetry is only required to export the traced requests as spans, so it is
+    not an installation dependency of eemont and it is only loaded if needed.
+
+    Returns
+    -------
+    module
+        The opentelemetry.trace module.
+    """
+    try:
+        from opentelemetry import trace
+
+        return trace
+    except ImportError:
+        raise ImportError(
+            "opentelemetry could not be loaded. Try installing with "
+            '"pip install opentelemetry-api".'
+        )
+
+
+def _install_request_tracing():
+    """Wraps the functions of ee.data that send requests to Earth Engine with
+    _trace_request(). The functions are wrapped once.
+    """
+    with _TRACING_LOCK:
+        for name in _TRACED_REQUESTS:
+            function = getattr(ee.data, name, None)
+            if function is not None and not hasattr(function, "_eemont_request"):
+                setattr(ee.data, name, _trace_request(name, function))
+
+
+def _trace_request(name, function):
+    """Wraps a function of ee.data to send its requests to the active tracers.
+
+    Requests sent while another one is traced in the same thread (e.g. getInfo()
+    calling getAsset()) are part of it and are not traced.
+
+    Parameters
+    ----------
+    name : str
+        Name of the function.
+    function : callable
+        Function to wrap.
+
+    Returns
+    -------
+    callable
+        Wrapped function.
+    """
+
+    @functools.wraps(function)
+    def traced(*args, **kwargs):
+        if not _TRACERS or getattr(_TRACING, "active", False):
+            return function(*args, **kwargs)
+        stack = list(_calling_extensions())
+        error = None
+        _TRACING.active = True
+        start = time.time()
+        counter = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        except Exception as exception:
+            error = exception
+            raise
+        finally:
+            _TRACING.active = False
+            record = {
+                "request": name,
+                "method": stack[-1] if stack else None,
+                "stack": stack,
+                "start": start,
+                "seconds": time.perf_counter() - counter,
+                "error": None if error is None else repr(error),
+            }
+            for tracer in list(_TRACERS):
+                tracer._record(record, error)
+
+    traced._eemont_request = name
+    return traced
+
+
+class _RequestTracer:
+    """Tracer of the requests sent to Earth Engine. See traceRequests()."""
+
+    def __init__(self, callback=None, openTelemetry=False):
+        self.records = []
+        self._calls = collections.Counter()
+        self._callback = callback
+        self._tracer = None
+        if openTelemetry:
+            self._tracer = _load_opentelemetry().get_tracer("eemont")
+
+    def __enter__(self):
+        _add_listener(self._count)
+        _TRACERS.append(self)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if self in _TRACERS:
+            _TRACERS.remove(self)
+        _remove_listener(self._count)
+        return False
+
+    def summary(self):
+        """Gets the number of calls, requests and seconds waiting for the requests per
+        extension method (None for the requests sent outside of them)."""
+        summary = {
+            method: {"calls": calls, "requests": 0, "seconds": 0.0}
+            for method, calls in self._calls.items()
+        }
+        for record in list(self.records):
+            method = summary.setdefault(
+                record["method"], {"calls": 0, "requests": 0, "seconds": 0.0}
+            )
+            method["requests"] += 1
+            method["seconds"] += record["seconds"]
+        return summary
+
+    def _count(self, method, result, seconds):
+        self._calls[method] += 1
+
+    def _record(self, record, error=None):
+        self.records.append(record)
+        if self._tracer is not None:
+            self._export(record, error)
+        if self._callback is not None:
+            self._callback(record)
+
+    def _export(self, record, error=None):
+        trace = _load_opentelemetry()
+        attributes = {"ee.request": record["request"], "eemont.stack": record["stack"]}
+        if record["method"] is not None:
+            attributes["eemont.method"] = record["method"]
+        span = self._tracer.start_span(
+            f"ee.data.{record['request']}",
+            start_time=int(record["start"] * 1e9),
+            attributes=attributes,
+        )
+        if error is not None:
+            span.record_exception(error)
+            span.set_status(trace.Status(trace.StatusCode.ERROR, str(error)))
+        span.end(end_time=int((record["start"] + record["seconds"]) * 1e9))
@@ -1,18 +1,34 @@
-import copy
-import json
-import os
-import re
 import warnings
 
 import ee
-import ee_extra
-import ee_extra.Spectral.core
-import ee_extra.STAC.core
-import ee_extra.STAC.utils
-import requests
 from box import Box
-from geopy.geocoders import get_geocoder_for_service
 
+from . import _evaluation, _formulas, _geocoding, _operators
+from ._caching import _LRUCache, _SQLiteCache
+from ._catalog import _PLATFORM_CACHE, _get_dataset_params, _get_indices, _load_JSON
+from ._evaluation import _Batch
+from ._formulas import (
+    _compile_indices,
+    _FormulaCompiler,
+    _get_formula_table,
+    _get_index_list,
+    _get_index_parameters,
+    _parse_formula,
+)
+from ._geocoding import (
+    _GEOCODER_RATE_LIMITS,
+    _RATE_LIMITERS,
+    _RATE_LIMITERS_LOCK,
+    _get_geocoder,
+    _get_service_name,
+)
+from ._tracing import (
+    _graph_stats,
+    _GraphProfiler,
+    _install_request_tracing,
+    _load_opentelemetry,
+    _RequestTracer,
+)
 from .extending import extend
 
 warnings.simplefilter("always", UserWarning)
@@ -46,7 +62,7 @@ def indices(online=False):
     >>> indices.BAIS2.reference
     'https://doi.org/10.3390/ecrs-2-05177'
     """
-    return Box(ee_extra.Spectral.core.indices(online), frozen_box=True)
+    return Box(_get_indices(online), frozen_box=True)
 
 
 def listIndices(online=False):
@@ -72,7 +88,118 @@ def listIndices(online=False):
     >>> eemont.listIndices()
     ['BNDVI','CIG','CVI','EVI','EVI2','GBNDVI','GNDVI',...]
     """
-    return ee_extra.Spectral.core.listIndices(online)
+    return list(_get_indices(online).keys())
+
+
+def computeIndices(
+    data,
+    index="NDVI",
+    G=2.5,
+    C1=6.0,
+    C2=7.5,
+    L=1.0,
+    cexp=1.16,
+    nexp=2.0,
+    alpha=0.1,
+    slope=1.0,
+    intercept=0.0,
+    gamma=1.0,
+    omega=2.0,
+    beta=0.05,
+    k=0.0,
+    fdelta=0.581,
+    epsilon=1.0,
+    kernel="RBF",
+    sigma="0.5 * (a + b)",
+    p=2.0,
+    c=1.0,
+    lambdaN=858.5,
+    lambdaN2=864.7,
+    lambdaR=645.0,
+    lambdaG=555.0,
+    lambdaS1=1613.7,
+    lambdaS2=2202.4,
+    online=False,
+):
+    """Computes one or more spectral indices locally on NumPy arrays.
+
+    This evaluates the same formulas and parameters as ee.Image.spectralIndices(), but
+    on data that is already in memory (e.g. from sampleRectangle() or an exported
+    GeoTIFF) instead of on Google Earth Engine. All the requested formulas are evaluated
+    together: shared subexpressions are computed once and intermediate results are
+    written into reused buffers. As in Google Earth Engine, divisions by zero return 0.
+
+    Tip
+    ----------
+    Check more info about the supported platforms and spectral indices in the
+    :ref:`User Guide<Spectral Indices Computation>`.
+
+    Parameters
+    ----------
+    data : dict
+        Arrays (or numbers) keyed by the standard band symbols used in the formulas
+        (e.g. 'N', 'R', 'G', 'S1'). Must be scaled to [0,1]. Additional parameters
+        required by some indices (e.g. 'PAR') can be passed here as well.
+    index : string | list[string], default = 'NDVI'
+        Index or list of indices to compute. Application domains (e.g. 'vegetation')
+        and 'all' are also accepted. See ee.Image.spectralIndices() for more info.
+    G, C1, C2, L, ..., lambdaS2 :
+        Parameters of the indices, with the same meaning and defaults as in
+        ee.Image.spectralIndices().
+    online : boolean, default = False
+        Whether to retrieve the most recent list of indices directly from the GitHub
+        repository and not from the local copy.
+
+    Returns
+    -------
+    dict
+        Computed indices as arrays, keyed by index name. Indices whose bands are not in
+        data are skipped with a warning.
+
+    See Also
+    --------
+    indices : Gets the dictionary of available indices as a Box object.
+
+    Examples
+    --------
+    >>> import numpy as np
+    >>> import eemont
+    >>> data = {'N': np.array([0.6, 0.5]), 'R': np.array([0.1, 0.2])}
+    >>> eemont.computeIndices(data, ['NDVI', 'SAVI'], L = 0.5)
+    {'NDVI': array([0.71428571, 0.42857143]), 'SAVI': array([0.625, 0.375])}
+    """
+    parameters = _get_index_parameters(
+        G,
+        C1,
+        C2,
+        L,
+        cexp,
+        nexp,
+        alpha,
+        slope,
+        intercept,
+        gamma,
+        omega,
+        beta,
+        k,
+        fdelta,
+        epsilon,
+        kernel,
+        sigma,
+        p,
+        c,
+        lambdaN,
+        lambdaN2,
+        lambdaR,
+        lambdaG,
+        lambdaS1,
+        lambdaS2,
+    )
+    table = _get_formula_table(online)
+    index = _get_index_list(index, table.catalog)
+    compiler = _FormulaCompiler({**parameters, **data}, kernel, sigma)
+
+    return compiler.evaluate(_compile_indices(compiler, index, table, local=True))
 
 
 @extend(ee)
@@ -89,252 +216,671 @@ def listDatasets():
     >>> import eemont
     >>> eemont.listDatasets()
     """
-    return ee_extra.STAC.core.listDatasets()
-
-
-# Geocoding
-# --------------------------
+    return list(_load_JSON().keys())
 
 
-def _retrieve_location(query, geocoder, exactly_one, **kwargs):
-    """Retrieves a location from a query.
+def catalogCacheInfo():
+    """Gets the hit and miss counters of the catalog caches.
 
-    Parameters
-    ----------
-    query : str
-        Address, query or structured query to geocode.
-    geocoder : str
-        Geocoder to use. Please visit https://geopy.readthedocs.io/ for more info.
-    exactly_one : boolean
-        Whether to retrieve just one location.
-    **kwargs :
-        Keywords arguments for geolocator.geocode(). The user_agent argument is mandatory (this argument can be set as user_agent = 'my-gee-username' or
-        user_agent = 'my-gee-app-name'). Please visit https://geopy.readthedocs.io/ for more info.
+    When the platform (dataset ID) of an image or image collection can't be read from
+    its expression graph, it is retrieved from the server and cached by its serialized
+    expression, so repeated calls on the same object skip the server round trip. The
+    scale and offset parameters are cached by dataset ID. The formulas of the spectral
+    indices are parsed once ('formulas') and the graphs compiled from them are cached
+    by the requested indices and parameters ('programs').
 
     Returns
     -------
-    Location
-        Retrieved location.
+    dict
+        Counters of the 'platforms', 'params', 'formulas' and 'programs' caches, each
+        one with the keys 'hits', 'misses', 'maxsize' and 'currsize'.
+
+    See Also
+    --------
+    clearCatalogCache : Clears the catalog caches.
+
+    Examples
+    --------
+    >>> import ee, eemont
+    >>> ee.Initialize()
+    >>> S2 = ee.ImageCollection('COPERNICUS/S2_SR')
+    >>> S2.getScaleParams()
+    >>> S2.getOffsetParams()
+    >>> eemont.catalogCacheInfo()["params"]
+    {'hits': 1, 'misses': 1, 'maxsize': 256, 'currsize': 1}
     """
-    cls = get_geocoder_for_service(geocoder)
-    geolocator = cls(**kwargs)
-    location = geolocator.geocode(query, exactly_one=exactly_one)
-    if location is None:
-        raise Exception("No matches were found for your query!")
-    else:
-        return location
+    table = _formulas._formula_table
+    programs = _LRUCache(maxsize=64) if table is None else table.programs
+    return {
+        "platforms": _PLATFORM_CACHE.info(),
+        "params": _get_dataset_params.cache_info()._asdict(),
+        "formulas": _parse_formula.cache_info()._asdict(),
+        "programs": programs.info(),
+    }
+
+
+def clearCatalogCache():
+    """Clears the catalog caches and resets their counters.
+
+    See Also
+    --------
+    catalogCacheInfo : Gets the hit and miss counters of the catalog caches.
+
+    Examples
+    --------
+    >>> import eemont
+    >>> eemont.clearCatalogCache()
+    """
+    _PLATFORM_CACHE.clear()
+    _get_dataset_params.cache_clear()
+    _parse_formula.cache_clear()
+    _formulas._formula_table = None
 
 
-def _lnglat_from_location(location):
-    """Returns the longitude and latitude from a location.
+def enableResultCache(ttl=3600, maxsize=1024, path=None):
+    """Enables the cache of the results of eemont's dunder methods.
+
+    The results of len() and the in operator on ee.ImageCollection,
+    ee.FeatureCollection, ee.List and ee.Dictionary objects are cached by the hash of
+    the serialized expression of the evaluated object, so evaluating the same
+    expression again skips the server round trip. Results are kept in memory, or in a
+    local SQLite database if a path is given, so repeated runs of the same pipeline can
+    reuse them. Calling this function again replaces the cache.
+
+    Warning
+    ----------
+    Cached results don't reflect changes in the data (e.g. new images added to a
+    collection) until they expire.
 
     Parameters
     ----------
-    location : Location
-        Retrieved location. Must be only one location.
+    ttl : float, default = 3600
+        Seconds a result is kept. If None, results don't expire.
+    maxsize : int, default = 1024
+        Maximum number of results to keep. The least recently used ones are evicted.
+    path : str, default = None
+        Path to a SQLite database file to persist the results to. It is created if it
+        doesn't exist. If None, results are kept in memory.
 
-    Returns
-    -------
-    tuple
-        The longitude and latitude geocoded from the query.
+    See Also
+    --------
+    disableResultCache : Disables the cache of the results of eemont's dunder methods.
+    resultCacheInfo : Gets the hit and miss counters of the result cache.
+
+    Examples
+    --------
+    >>> import ee, eemont
+    >>> ee.Authenticate()
+    >>> ee.Initialize()
+    >>> eemont.enableResultCache(ttl = 600, path = 'eemont-results.sqlite')
+    >>> S2 = ee.ImageCollection('COPERNICUS/S2_SR').filterDate('2020-01-01','2020-01-02')
+    >>> len(S2)
+    >>> len(S2)
+    >>> eemont.resultCacheInfo()
+    {'hits': 1, 'misses': 1, 'maxsize': 1024, 'currsize': 1}
     """
-    return [location.longitude, location.latitude]
+    if path is None:
+        _evaluation._RESULT_CACHE = _LRUCache(maxsize, ttl)
+    else:
+        _evaluation._RESULT_CACHE = _SQLiteCache(path, "results", maxsize, ttl)
+
+
+def disableResultCache():
+    """Disables the cache of the results of eemont's dunder methods.
 
+    Results persisted to a SQLite database are kept there.
 
-# Plus Codes
-# --------------------------
+    See Also
+    --------
+    enableResultCache : Enables the cache of the results of eemont's dunder methods.
 
+    Examples
+    --------
+    >>> import eemont
+    >>> eemont.disableResultCache()
+    """
+    _evaluation._RESULT_CACHE = None
 
-def _load_openlocationcode():
-    """Attempt to load the openlocationcode.openlocationcode module and return it.
 
-    Because the package is not available through conda-forge, it cannot be made an installation dependency of eemont, so it is only loaded if needed.
+def resultCacheInfo():
+    """Gets the hit and miss counters of the result cache.
 
     Returns
     -------
-    module
-        The openlocationcode.openlocationcode module.
+    dict | None
+        Counters of the cache with the keys 'hits', 'misses', 'maxsize' and
+        'currsize', or None if the cache is disabled.
+
+    See Also
+    --------
+    enableResultCache : Enables the cache of the results of eemont's dunder methods.
+    clearResultCache : Clears the result cache.
+
+    Examples
+    --------
+    >>> import eemont
+    >>> eemont.enableResultCache()
+    >>> eemont.resultCacheInfo()
+    {'hits': 0, 'misses': 0, 'maxsize': 1024, 'currsize': 0}
     """
-    try:
-        from openlocationcode import openlocationcode
+    if _evaluation._RESULT_CACHE is None:
+        return None
+    return _evaluation._RESULT_CACHE.info()
 
-        return openlocationcode
-    except ImportError:
-        raise ImportError(
-            'openlocationcode could not be loaded. Try installing with "pip install openlocationcode".'
-        )
 
+def clearResultCache():
+    """Clears the result cache (including its SQLite database, if any) and resets its
+    counters.
 
-def _convert_lnglat_to_pluscode(lng, lat, code_length):
-    """Take a single longitude and latitude coordinate and convert it to a Plus Code.
+    See Also
+    --------
+    resultCacheInfo : Gets the hit and miss counters of the result cache.
+
+    Examples
+    --------
+    >>> import eemont
+    >>> eemont.clearResultCache()
+    """
+    if _evaluation._RESULT_CACHE is not None:
+        _evaluation._RESULT_CACHE.clear()
+
+
+def enableGeocodingCache(ttl=2592000, maxsize=4096, path=None):
+    """Enables the cache of the locations retrieved by the geocoding constructors.
+
+    The locations retrieved by ee.Geometry.PointFromQuery(), BBoxFromQuery(),
+    MultiPointFromQuery(), ee.Feature.PointFromQuery() and
+    ee.FeatureCollection.MultiPointFromQuery() are cached by geocoder, query,
+    exactly_one and the geocoder arguments that affect the results (user_agent, timeout,
+    proxies, ssl_context, adapter_factory and api_key are ignored), so geocoding the same
+    query again skips the request to the geocoding service. Queries without matches are
+    cached as well, so they are not sent again either. Locations are kept in memory, or
+    in a local SQLite database if a path is given, so repeated runs can reuse them.
+    Calling this function again replaces the cache.
 
     Parameters
     ----------
-    lng : float
-        Longitude.
-    lat : float
-        Latitude.
-    code_length : int
-        The number of significant digits in the output code, between 2 and 15. Shorter codes are less precise.
+    ttl : float, default = 2592000
+        Seconds a location is kept (30 days by default). If None, locations don't
+        expire.
+    maxsize : int, default = 4096
+        Maximum number of queries to keep. The least recently used ones are evicted.
+    path : str, default = None
+        Path to a SQLite database file to persist the locations to. It is created if it
+        doesn't exist. If None, locations are kept in memory.
+
+    See Also
+    --------
+    disableGeocodingCache : Disables the cache of the locations retrieved by the
+        geocoding constructors.
+    geocodingCacheInfo : Gets the hit and miss counters of the geocoding cache.
+
+    Examples
+    --------
+    >>> import ee, eemont
+    >>> ee.Authenticate()
+    >>> ee.Initialize()
+    >>> eemont.enableGeocodingCache(path = 'eemont-geocoding.sqlite')
+    >>> ee.Geometry.PointFromQuery('Cali, Colombia',user_agent = 'my-gee-app')
+    >>> ee.Geometry.PointFromQuery('Cali, Colombia',user_agent = 'my-gee-app')
+    >>> eemont.geocodingCacheInfo()
+    {'hits': 1, 'misses': 1, 'maxsize': 4096, 'currsize': 1}
+    """
+    if path is None:
+        _geocoding._GEOCODING_CACHE = _LRUCache(maxsize, ttl)
+    else:
+        _geocoding._GEOCODING_CACHE = _SQLiteCache(path, "locations", maxsize, ttl)
+
+
+def disableGeocodingCache():
+    """Disables the cache of the locations retrieved by the geocoding constructors.
+
+    Locations persisted to a SQLite database are kept there.
+
+    See Also
+    --------
+    enableGeocodingCache : Enables the cache of the locations retrieved by the
+        geocoding constructors.
+
+    Examples
+    --------
+    >>> import eemont
+    >>> eemont.disableGeocodingCache()
+    """
+    _geocoding._GEOCODING_CACHE = None
+
+
+def geocodingCacheInfo():
+    """Gets the hit and miss counters of the geocoding cache.
 
     Returns
     -------
-    str
-        The Plus Code represented by the coordinate
+    dict | None
+        Counters of the cache with the keys 'hits', 'misses', 'maxsize' and
+        'currsize', or None if the cache is disabled.
+
+    See Also
+    --------
+    enableGeocodingCache : Enables the cache of the locations retrieved by the
+        geocoding constructors.
+    clearGeocodingCache : Clears the geocoding cache.
+
+    Examples
+    --------
+    >>> import eemont
+    >>> eemont.enableGeocodingCache()
+    >>> eemont.geocodingCacheInfo()
+    {'hits': 0, 'misses': 0, 'maxsize': 4096, 'currsize': 0}
+    """
+    if _geocoding._GEOCODING_CACHE is None:
+        return None
+    return _geocoding._GEOCODING_CACHE.info()
+
+
+def clearGeocodingCache():
+    """Clears the geocoding cache (including its SQLite database, if any) and resets
+    its counters.
+
+    See Also
+    --------
+    geocodingCacheInfo : Gets the hit and miss counters of the geocoding cache.
+
+    Examples
+    --------
+    >>> import eemont
+    >>> eemont.clearGeocodingCache()
     """
-    olc = _load_openlocationcode()
+    if _geocoding._GEOCODING_CACHE is not None:
+        _geocoding._GEOCODING_CACHE.clear()
 
-    return olc.encode(lat, lng, code_length)
 
+def getGeocoder(geocoder="nominatim", **kwargs):
+    """Gets the pooled geopy geocoder of a service.
 
-def _convert_pluscode_to_lnglat(pluscode, geocoder, **kwargs):
-    """Take a single full or shortened Plus Code and convert it to a longitude and latitude.
+    Geocoder instances are kept alive in a pool keyed by service and arguments, so all
+    the queries geocoded with the same service and arguments (including those of the
+    *FromQuery constructors) reuse the same instance and its HTTP session and
+    connection pool. Calling this function at startup warms the pool.
 
     Parameters
     ----------
-    pluscode : str
-        Either a full Plus Code or short Plus Code with a queryable reference location appended to it.
-    geocoder : str
-        Geocoder to use. Please visit https://geopy.readthedocs.io/ for more info.
+    geocoder : str | type, default = 'nominatim'
+        Geocoder to use (name of the service or geopy geocoder class). Please visit
+        https://geopy.readthedocs.io/ for more info.
     **kwargs :
-        Keywords arguments for geolocator.geocode(). The user_agent argument is mandatory (this argument can be set as user_agent = 'my-gee-username' or
-        user_agent = 'my-gee-app-name'). Please visit https://geopy.readthedocs.io/ for more info.
+        Keywords arguments of the geocoder. The user_agent argument is mandatory (this
+        argument can be set as user_agent = 'my-gee-username' or user_agent =
+        'my-gee-app-name'). Please visit https://geopy.readthedocs.io/ for more info.
 
     Returns
     -------
-    tuple
-        The longitude and latitude of the Plus Code centroid.
+    geopy.geocoders.Geocoder
+        Pooled geocoder.
+
+    See Also
+    --------
+    clearGeocoderPool : Clears the pool of geocoders.
+
+    Examples
+    --------
+    >>> import eemont
+    >>> geolocator = eemont.getGeocoder('nominatim', user_agent = 'my-gee-app')
+    >>> geolocator is eemont.getGeocoder('nominatim', user_agent = 'my-gee-app')
+    True
     """
-    olc = _load_openlocationcode()
+    return _get_geocoder(geocoder, **kwargs)
 
-    if not olc.isFull(pluscode):
-        if olc.isShort(pluscode):
-            raise ValueError(
-                'Short Plus Codes must include a reference location (e.g. "QXGV+XH Denver, CO, USA").'
-            )
 
-        shortcode, reference = _parse_code_and_reference_from_pluscode(pluscode)
-        location = _retrieve_location(reference, geocoder, exactly_one=True, **kwargs)
-        ref_lng, ref_lat = _lnglat_from_location(location)
+def clearGeocoderPool():
+    """Clears the pool of geocoders, so the next queries create new instances.
 
-        pluscode = olc.recoverNearest(shortcode, ref_lat, ref_lng)
+    See Also
+    --------
+    getGeocoder : Gets the pooled geopy geocoder of a service.
+
+    Examples
+    --------
+    >>> import eemont
+    >>> eemont.clearGeocoderPool()
+    """
+    _geocoding._GEOCODER_POOL.clear()
 
-    area = olc.decode(pluscode)
-    return [area.longitudeCenter, area.latitudeCenter]
 
+def setGeocoderRateLimit(geocoder, requestsPerSecond):
+    """Sets the maximum rate of requests sent to a geocoding service.
 
-def _parse_code_and_reference_from_pluscode(pluscode):
-    """Split a short Plus Code into a Plus Code and reference using regex. For example, "QXGV+XH Denver, CO, USA" will
-    return ("QXGV+XH", "Denver, CO, USA").
+    All the queries geocoded by eemont (except those retrieved from the geocoding
+    cache) wait for a token of a token bucket of their service, shared by all threads.
+    By default, Nominatim is limited to 1 request per second, as required by its usage
+    policy, and other services are not limited.
 
     Parameters
     ----------
-    pluscode : str
-        A short Plus Code with a queryable reference location appended to it, delimited by whitespace.
+    geocoder : str | type
+        Geocoder (name of the service or geopy geocoder class).
+    requestsPerSecond : float
+        Maximum number of requests per second. If None, requests are not limited.
 
-    Returns
-    -------
-    tuple
-        The short Plus Code and the reference.
+    See Also
+    --------
+    getGeocoder : Gets the pooled geopy geocoder of a service.
+
+    Examples
+    --------
+    >>> import eemont
+    >>> eemont.setGeocoderRateLimit('arcgis', 20)
+    """
+    with _RATE_LIMITERS_LOCK:
+        service = _get_service_name(geocoder)
+        _GEOCODER_RATE_LIMITS[service] = requestsPerSecond
+        _RATE_LIMITERS.pop(service, None)
+
+
+def enableConstantFolding():
+    """Enables the constant folding of the arithmetic operators of ee.Number and
+    ee.Image.
+
+    While enabled, the +, -, *, / and ** operators simplify the expression client-side
+    before adding a call to the graph:
+
+    - Operations between constants (numbers, ee.Number(number) and ee.Image(number))
+      are computed locally (e.g. ee.Number(2) * 3 + 1 becomes ee.Number(7)).
+    - Identities of ee.Number with integer constants are dropped (x + 0, 0 + x, x - 0,
+      x * 1, 1 * x, x / 1 and x ** 1 become x). Identities of ee.Image are kept, since
+      the server drops the properties of the image when computing them.
+    - Chained additions and multiplications by integer constants are merged (e.g.
+      (x + 1) + 2 becomes x + 3).
+
+    Floating point constants are never dropped or merged (e.g. x * 1.0 and
+    (x + 0.1) + 0.2 are kept as they are), since that could change the data type or
+    the rounding of the result computed by the server.
+
+    This reduces the number of nodes of the graph (and the work of the server) in long
+    arithmetic chains built programmatically.
+
+    Warning
+    ----------
+    Only the operators are simplified, not the methods (e.g. x.add(0)).
+
+    See Also
+    --------
+    disableConstantFolding : Disables the constant folding of the arithmetic operators
+        of ee.Number and ee.Image.
+
+    Examples
+    --------
+    >>> import ee, eemont
+    >>> ee.Authenticate()
+    >>> ee.Initialize()
+    >>> eemont.enableConstantFolding()
+    >>> (ee.Number(2) * 3 + 1).getInfo()
+    7
+    >>> img = ee.Image('COPERNICUS/S2_SR/20190828T151811_20190828T151809_T18GYT')
+    >>> (img * 1 + 0) is img
+    True
+    """
+    _operators._CONSTANT_FOLDING = True
+
+
+def disableConstantFolding():
+    """Disables the constant folding of the arithmetic operators of ee.Number and
+    ee.Image.
+
+    See Also
+    --------
+    enableConstantFolding : Enables the constant folding of the arithmetic operators of
+        ee.Number and ee.Image.
+
+    Examples
+    --------
+    >>> import eemont
+    >>> eemont.disableConstantFolding()
+    """
+    _operators._CONSTANT_FOLDING = False
+
+
+def enableLazyOperators():
+    """Enables the lazy evaluation of the overloaded operators of ee.Image.
+
+    While enabled, the selection of a single band by name with the [] operator, and the
+    arithmetic (+, -, *, /, %, **), comparison (<, <=, >, >=, ==, !=), logical (&, |,
+    ~) and negation operators between these bands and numbers, build a local
+    expression tree instead of adding a call to the graph for each operation. Each
+    result is computed by a single ee.Image.expression() call of the whole tree, and
+    each image is passed once to the expression, no matter how many of its bands are
+    used. Operations involving multi-band images (or images that are not bands
+    selected with the [] operator) are computed with the ee.Image methods.
+
+    Tip
+    ----------
+    Check more info about overloaded operators in the
+    :ref:`User Guide<Overloaded Operators>`.
+
+    Warning
+    ----------
+    The name of the output band of an expression may differ from the one computed by
+    the equivalent chain of ee.Image methods.
+
+    See Also
+    --------
+    disableLazyOperators : Disables the lazy evaluation of the overloaded operators of
+        ee.Image.
+
+    Examples
+    --------
+    >>> import ee, eemont
+    >>> ee.Authenticate()
+    >>> ee.Initialize()
+    >>> eemont.enableLazyOperators()
+    >>> img = ee.Image('COPERNICUS/S2_SR/20190828T151811_20190828T151809_T18GYT')
+    >>> NDVI = (img['B8'] - img['B4']) / (img['B8'] + img['B4'])
     """
-    pattern = r"\w{1,8}\+\w{,7}"
-    code = None
+    _operators._LAZY_OPERATORS = True
 
-    for chunk in pluscode.split(" "):
-        match = re.search(pattern, chunk)
-        code = match.group(0) if match else code
 
-    if not code:
-        raise ValueError("Plus code could not be decoded.")
+def disableLazyOperators():
+    """Disables the lazy evaluation of the overloaded operators of ee.Image.
 
-    reference = pluscode.replace(code, "")
+    Images already built lazily are still materialized when used.
 
-    return (code, reference)
+    See Also
+    --------
+    enableLazyOperators : Enables the lazy evaluation of the overloaded operators of
+        ee.Image.
+
+    Examples
+    --------
+    >>> import eemont
+    >>> eemont.disableLazyOperators()
+    """
+    _operators._LAZY_OPERATORS = False
 
 
-def _is_coordinate_like(x):
-    """Test if an object appears to be a longitude, latitude coordinate.
+def graphStats(x, top=10):
+    """Gets the size and structure statistics of the graph of an ee object.
 
-    This doesn't test if the coordinate is valid, only that it has the correct data structure: an iterable containing two
-    numbers.
+    The graph is serialized as it is sent to Earth Engine, where identical subgraphs
+    are sent once and referenced wherever they are used.
+
+    Tip
+    ----------
+    Use :func:`profileGraphs` to get the statistics of the graphs built by each call to
+    the eemont extension methods.
 
     Parameters
     ----------
-    x : Object
-        Any object that will be tested for coordinate-like structure.
+    x : ee.ComputedObject
+        Object to get the statistics from.
+    top : int, default = 10
+        Number of most called functions to report.
 
     Returns
     -------
-    bool
-        True if the input object resembles a longitude, latitude coordinate.
+    dict
+        Size in bytes of the serialized graph ('bytes'), number of function calls
+        ('nodes'), maximum number of nested function calls ('depth'), number of
+        subgraphs used more than once ('duplicated') and number of calls to each of the
+        most called functions ('functions').
+
+    See Also
+    --------
+    profileGraphs : Creates a context that profiles the graphs built by the eemont
+        extension methods.
+
+    Examples
+    --------
+    >>> import ee, eemont
+    >>> ee.Authenticate()
+    >>> ee.Initialize()
+    >>> img = ee.Image('COPERNICUS/S2_SR/20190828T151811_20190828T151809_T18GYT')
+    >>> eemont.graphStats(img.spectralIndices('NDVI'), top=3)
+    {'bytes': 1162, 'nodes': 8, 'depth': 6, 'duplicated': 3, 'functions': {'Image.select': 2, 'Image.addBands': 1, 'Image.load': 1}}
     """
-    if not isinstance(x, (list, tuple)) or len(x) != 2:
-        return False
-    for element in x:
-        if not isinstance(element, (int, float)):
-            return False
+    return _graph_stats(x, top)
+
 
-    return True
+def profileGraphs(callback=None, top=5):
+    """Creates a context that profiles the graphs built by the eemont extension
+    methods.
 
+    Inside the context, the statistics of the graph (see :func:`graphStats`) of every
+    ee object returned by an eemont extension method (e.g. spectralIndices(),
+    maskClouds(), preprocess() or getTimeSeriesByRegions()) called in the current
+    thread are recorded and logged to the 'eemont' logger at the INFO level. The
+    operators and container emulation methods are not profiled.
 
-def _convert_lnglats_to_pluscodes(arr, code_length):
-    """Take an arbitrarily nested array and recursively replace any element that looks like a coordinate with an equivalent
-    Plus Code. Raise a ValueError if any non-coordinate elements are found.
+    Warning
+    ----------
+    Each recorded graph is serialized, which slows down the building of the graphs.
 
     Parameters
     ----------
-    arr : iterable
-        An arbitrarily nested array containing tuples of longitude, latitude coordinates.
-    code_length : int
-        The number of significant digits in the output code, between 2 and 15. Shorter codes are less precise.
+    callback : callable, default = None
+        Function called with each record.
+    top : int, default = 5
+        Number of most called functions to report in each record.
 
     Returns
     -------
-    iterable
-        An array matching the structure of the input array, with coordinate tuples replaced with Plus Code strings.
+    _GraphProfiler
+        Profiler to use as a context manager. Its records attribute is the list of
+        records, each of them with the name of the method ('method'), the name of the
+        extension method that called it, if any ('caller'), the time spent in the
+        method in seconds ('seconds') and the statistics of the graph.
+
+    See Also
+    --------
+    graphStats : Gets the size and structure statistics of the graph of an ee object.
+
+    Examples
+    --------
+    >>> import ee, eemont, logging
+    >>> ee.Authenticate()
+    >>> ee.Initialize()
+    >>> logging.basicConfig(level=logging.INFO)
+    >>> S2 = ee.ImageCollection('COPERNICUS/S2_SR')
+    >>> with eemont.profileGraphs() as profiler:
+    ...     S2 = S2.preprocess().spectralIndices(['NDVI', 'EVI'])
+    INFO:eemont:ImageCollection.preprocess: ...
+    INFO:eemont:ImageCollection.spectralIndices: ...
+    >>> [record['method'] for record in profiler.records]
+    ['ImageCollection.preprocess', 'ImageCollection.spectralIndices']
     """
-    converted = copy.deepcopy(arr)
+    return _GraphProfiler(callback, top)
 
-    if not isinstance(arr, (list, tuple)):
-        raise ValueError(
-            "{} is not a coordinate or iterable of coordinates.".format(arr)
-        )
 
-    if _is_coordinate_like(arr):
-        converted = _convert_lnglat_to_pluscode(arr[0], arr[1], code_length)
-    else:
-        for i, element in enumerate(arr):
-            converted[i] = _convert_lnglats_to_pluscodes(element, code_length)
-    return converted
+def traceRequests(callback=None, openTelemetry=False):
+    """Creates a context that traces the requests sent to Earth Engine.
 
+    Inside the context, every request sent to Earth Engine (e.g. by getInfo(), or by
+    the eemont methods that evaluate objects, such as len(), the in operator, the
+    detection of the platform in maskClouds() or scaleAndOffset(), or plusCodes()) is
+    counted and timed, and attributed to the eemont extension method that sent it.
+    Requests sent by the threads started by the extension methods are attributed to
+    them too.
 
-def _convert_pluscodes_to_lnglats(arr, geocoder, **kwargs):
-    """Take an arbitrarily nested array and recursively replace any element that looks like a Plus Code with an equivalent
-    longitude, latitude tuple. Raise a ValueError if any non-Plus Code elements are found.
+    Tip
+    ----------
+    Compare the number of calls to each extension method with the number of requests
+    it sent (see the summary() method of the tracer) to find methods called once per
+    element of a loop that could be batched with :func:`batch`.
 
     Parameters
     ----------
-    arr : iterable
-        An arbitrarily nested array containing Plus Code strings.
-    geocoder : str
-        Geocoder to use. Please visit https://geopy.readthedocs.io/ for more info.
-    **kwargs :
-        Keywords arguments for geolocator.geocode(). The user_agent argument is mandatory (this argument can be set as user_agent = 'my-gee-username' or
-        user_agent = 'my-gee-app-name'). Please visit https://geopy.readthedocs.io/ for more info.
+    callback : callable, default = None
+        Function called with each record.
+    openTelemetry : boolean, default = False
+        Whether to export each request as a span of the current OpenTelemetry tracer
+        provider. Requires the opentelemetry-api package.
 
     Returns
     -------
-    iterable
-        An array matching the structure of the input array, with Plus Code strings replaced with coordinate tuples.
+    _RequestTracer
+        Tracer to use as a context manager. Its records attribute is the list of
+        records, each of them with the name of the ee.data function that sent the
+        request ('request'), the innermost extension method that sent it or None
+        ('method'), all the extension methods being called ('stack'), the start time in
+        seconds since the epoch ('start'), the duration in seconds ('seconds') and the
+        error raised, if any ('error'). Its summary() method returns the number of calls
+        ('calls'), requests ('requests') and seconds waiting for them ('seconds') per
+        extension method.
+
+    See Also
+    --------
+    profileGraphs : Creates a context that profiles the graphs built by the eemont
+        extension methods.
+
+    Examples
+    --------
+    >>> import ee, eemont
+    >>> ee.Authenticate()
+    >>> ee.Initialize()
+    >>> L8 = ee.ImageCollection('LANDSAT/LC08/C02/T1_L2')
+    >>> points = [ee.Geometry.Point([lng, 0]) for lng in range(-5, 5)]
+    >>> with eemont.traceRequests() as tracer:
+    ...     sizes = [len(L8.filterBounds(point)) for point in points]
+    >>> tracer.summary()['ImageCollection.__len__']['requests']
+    10
     """
-    converted = copy.deepcopy(arr)
+    if openTelemetry:
+        _load_opentelemetry()
+    _install_request_tracing()
+    return _RequestTracer(callback, openTelemetry)
 
-    if not isinstance(arr, (list, tuple, str)):
-        raise ValueError("{} is not a Plus Code or iterable of Plus Codes.".format(arr))
 
-    if isinstance(arr, str):
-        converted = _convert_pluscode_to_lnglat(arr, geocoder, **kwargs)
-    else:
-        for i, element in enumerate(arr):
-            converted[i] = _convert_pluscodes_to_lnglats(element, geocoder, **kwargs)
-    return converted
+def batch():
+    """Creates a context that batches the evaluations of eemont's dunder methods.
+
+    Inside the context, the evaluations requested with the methods of the batch
+    (len(), contains() and getInfo()) are deferred and combined into a single
+    ee.List([...]).getInfo() request. The request is sent when the context exits, or
+    earlier, when the value of any pending result is first accessed. Calls to len()
+    and the in operator on ee objects inside the context also join the pending
+    evaluations. Python requires their results right away, so they resolve all the
+    pending evaluations at once.
+
+    Tip
+    ----------
+    Each deferred result has a value attribute and can be used directly where an int
+    or bool is expected (e.g. in comparisons, if statements or range()).
+
+    Returns
+    -------
+    _Batch
+        Batch to use as a context manager. Its methods len(x), contains(x, key) and
+        getInfo(x) return deferred results, and resolve() sends the pending
+        evaluations.
+
+    Examples
+    --------
+    >>> import ee, eemont
+    >>> ee.Authenticate()
+    >>> ee.Initialize()
+    >>> L8 = ee.ImageCollection('LANDSAT/LC08/C02/T1_L2')
+    >>> points = [ee.Geometry.Point([lng, 0]) for lng in range(-5, 5)]
+    >>> with eemont.batch() as b:
+    ...     sizes = [b.len(L8.filterBounds(point)) for point in points]
+    >>> [size.value for size in sizes]
+    [1187, 1187, 1176, 1160, 1180, 1181, 1190, 1177, 1202, 1182]
+    """
+    return _Batch()
@@ -1,20 +1,334 @@
+import concurrent.futures
+import datetime
+import json
+import sys
 import warnings
 
 import ee
+import numpy as np
 import pandas as pd
 
+from .extending import _propagate, _track
+
 
 def _extend_pdDataFrame():
     """Decorator. Extends the pd.DataFrame class."""
-    return lambda f: (setattr(pd.core.frame.DataFrame, f.__name__, f) or f)
+    return lambda f: (
+        setattr(pd.core.frame.DataFrame, f.__name__, _track(pd.core.frame.DataFrame, f))
+        or f
+    )
+
+
+# GeoJSON types by shapely geometry type ID. LinearRing (ID 2) has no GeoJSON type, so
+# it is converted to a LineString, as shapely.to_geojson() does.
+_GEOMETRY_TYPES = [
+    "Point",
+    "LineString",
+    "LineString",
+    "Polygon",
+    "MultiPoint",
+    "MultiLineString",
+    "MultiPolygon",
+]
+
+
+def _load_shapely():
+    """Attempt to load the shapely package and return it.
+
+    shapely is only required to convert GeoDataFrames, so it is not an installation
+    dependency of eemont and it is only loaded if needed.
+
+    Returns
+    -------
+    module
+        The shapely module.
+    """
+    try:
+        import shapely
+
+        return shapely
+    except ImportError:
+        raise ImportError(
+            'shapely could not be loaded. Try installing with "pip install shapely".'
+        )
+
+
+def _is_geodataframe(dataFrame):
+    """Checks whether a Data Frame is a geopandas.GeoDataFrame.
+
+    geopandas is not imported: if it has not been imported, there are no GeoDataFrames.
+
+    Parameters
+    ----------
+    dataFrame : pd.DataFrame
+        Data Frame to check.
+
+    Returns
+    -------
+    boolean
+        Whether the Data Frame is a GeoDataFrame.
+    """
+    geopandas = sys.modules.get("geopandas")
+    return geopandas is not None and isinstance(dataFrame, geopandas.GeoDataFrame)
+
+
+def _encode_geometries(geoDataFrame, precision=None, simplify=None):
+    """Encodes the geometries of a GeoDataFrame as GeoJSON strings in bulk.
+
+    The geometries are reprojected to EPSG:4326 if required, simplified and their
+    coordinates rounded with vectorized shapely functions.
+
+    Parameters
+    ----------
+    geoDataFrame : geopandas.GeoDataFrame
+        GeoDataFrame to encode.
+    precision : int, default = None
+        Number of decimal places of the coordinates. If None, they are not rounded.
+    simplify : float, default = None
+        Tolerance in degrees of the simplification (preserving topology). If None, the
+        geometries are not simplified.
+
+    Returns
+    -------
+    tuple
+        Array of GeoJSON strings (None for missing geometries) and list of the GeoJSON
+        types present (None for missing geometries).
+    """
+    shapely = _load_shapely()
+
+    if geoDataFrame.crs is not None and geoDataFrame.crs.to_epsg() != 4326:
+        geoDataFrame = geoDataFrame.to_crs(4326)
+
+    geometries = np.asarray(geoDataFrame.geometry.values, dtype=object)
+
+    if simplify is not None:
+        geometries = shapely.simplify(geometries, simplify, preserve_topology=True)
+
+    if precision is not None:
+        geometries = shapely.transform(
+            geometries, lambda coordinates: np.round(coordinates, precision)
+        )
+
+    typeIDs = np.unique(shapely.get_type_id(geometries))
+    if (typeIDs >= len(_GEOMETRY_TYPES)).any():
+        raise Exception("GeometryCollection geometries are not supported!")
+
+    types = list(dict.fromkeys(_GEOMETRY_TYPES[i] if i >= 0 else None for i in typeIDs))
+
+    return shapely.to_geojson(geometries), types
+
+
+def _to_json_value(value):
+    """Encodes a value that is not JSON serializable.
+
+    Parameters
+    ----------
+    value : Any
+        Value to encode.
+
+    Returns
+    -------
+    str
+        Datetimes as ISO strings in UTC (naive datetimes are assumed to be in UTC) and
+        any other value as its string representation.
+    """
+    if isinstance(value, datetime.datetime):
+        if value.tzinfo is not None:
+            value = value.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+        return value.isoformat(timespec="milliseconds") + "Z"
+    if isinstance(value, datetime.date):
+        return value.isoformat()
+    return str(value)
+
+
+def _to_json_rows(dataFrame):
+    """Encodes the rows of a pd.DataFrame as a JSON array of arrays.
+
+    Datetime columns are converted to UTC and encoded as ISO strings with millisecond
+    precision and a 'Z' suffix (naive datetimes are assumed to be in UTC, as in the
+    Earth Engine serializer). Floats are encoded with their shortest round-trip
+    representation, so no precision is lost.
+
+    Parameters
+    ----------
+    dataFrame : pd.DataFrame
+        Data Frame to encode.
+
+    Returns
+    -------
+    str
+        Rows of the Data Frame. Missing and non-finite values are encoded as nulls,
+        datetimes as ISO strings and any other non-JSON value as its string
+        representation.
+    """
+    columns = []
+    for _, column in dataFrame.items():
+        if pd.api.types.is_datetime64_any_dtype(column):
+            if column.dt.tz is not None:
+                column = column.dt.tz_convert("UTC")
+            column = column.dt.strftime("%Y-%m-%dT%H:%M:%S.%f").str[:-3] + "Z"
+        elif pd.api.types.is_float_dtype(column):
+            column = column.where(np.isfinite(column))
+        columns.append(column.astype(object).where(column.notna(), None).tolist())
+
+    rows = list(zip(*columns)) if columns else [[]] * len(dataFrame)
+
+    return json.dumps(
+        rows, default=_to_json_value, allow_nan=False, separators=(",", ":")
+    )
+
+
+def _split_json_rows(dataFrame, chunkBytes):
+    """Encodes the rows of a pd.DataFrame as JSON strings of bounded size.
+
+    The number of rows per chunk is estimated from the size of the whole Data Frame and
+    any chunk that is still larger than chunkBytes is split in half until it fits.
+
+    Parameters
+    ----------
+    dataFrame : pd.DataFrame
+        Data Frame to encode.
+    chunkBytes : int
+        Maximum size of each chunk in bytes, measured as embedded in the serialized
+        request (i.e. after escaping the JSON string).
+
+    Returns
+    -------
+    list[str]
+        Rows of each chunk encoded with _to_json_rows().
+    """
+
+    def split(chunk):
+        rows = _to_json_rows(chunk)
+        if len(json.dumps(rows)) <= chunkBytes:
+            return [rows]
+        if len(chunk) == 1:
+            raise Exception(
+                f"A single row exceeds chunkBytes! Value passed: chunkBytes = {chunkBytes}"
+            )
+        half = len(chunk) // 2
+        return split(chunk.iloc[:half]) + split(chunk.iloc[half:])
+
+    rows = _to_json_rows(dataFrame)
+    size = len(json.dumps(rows))
+    if size <= chunkBytes:
+        return [rows]
+
+    step = max(1, int(0.95 * len(dataFrame) * chunkBytes / size))
+    chunks = []
+    for start in range(0, len(dataFrame), step):
+        chunks.extend(split(dataFrame.iloc[start : start + step]))
+
+    return chunks
+
+
+def _rows_to_feature_collection(rows, columns, lat=None, lon=None, geometryTypes=None):
+    """Converts rows encoded with _to_json_rows() into an ee.FeatureCollection.
+
+    Parameters
+    ----------
+    rows : str
+        Rows encoded as a JSON array of arrays.
+    columns : list[str]
+        Names of the columns.
+    lat : int, default = None
+        Position of the latitude column. If None, no points are generated.
+    lon : int, default = None
+        Position of the longitude column. If None, no points are generated.
+    geometryTypes : list[str], default = None
+        GeoJSON types of the geometries, if the rows have an additional last element
+        with the geometry encoded as a GeoJSON string (None for missing geometries). If
+        all the geometries are missing, the features have no geometries.
+
+    Returns
+    -------
+    ee.FeatureCollection
+        Rows converted into features.
+    """
+    rows = ee.List(ee.String(rows).decodeJSON())
+
+    def getGeometry(geometry):
+        geometry = ee.Dictionary(ee.String(geometry).decodeJSON())
+        coordinates = geometry.get("coordinates")
+        types = [geometryType for geometryType in geometryTypes if geometryType]
+        result = ee.ApiFunction.call_(f"GeometryConstructors.{types[-1]}", coordinates)
+        for geometryType in reversed(types[:-1]):
+            result = ee.Algorithms.If(
+                ee.String(geometry.get("type")).equals(geometryType),
+                ee.ApiFunction.call_(
+                    f"GeometryConstructors.{geometryType}", coordinates
+                ),
+                result,
+            )
+        return result
+
+    if geometryTypes is not None and not any(geometryTypes):
+
+        def getFeature(row):
+            row = ee.List(row)
+            properties = ee.Dictionary.fromLists(columns, row.slice(0, len(columns)))
+            return ee.Feature(None, properties)
+
+    elif geometryTypes is not None:
+
+        def getFeature(row):
+            row = ee.List(row)
+            geometry = row.get(len(columns))
+            if None in geometryTypes:
+                geometry = ee.Algorithms.If(
+                    ee.Algorithms.IsEqual(geometry, None), None, getGeometry(geometry)
+                )
+            else:
+                geometry = getGeometry(geometry)
+            properties = ee.Dictionary.fromLists(columns, row.slice(0, len(columns)))
+            return ee.Feature(ee.Geometry(geometry), properties)
+
+    elif lat is not None and lon is not None:
+
+        def getFeature(row):
+            row = ee.List(row)
+            point = ee.Geometry.Point([row.get(lon), row.get(lat)])
+            return ee.Feature(point, ee.Dictionary.fromLists(columns, row))
+
+    else:
+
+        def getFeature(row):
+            return ee.Feature(None, ee.Dictionary.fromLists(columns, row))
+
+    return ee.FeatureCollection(rows.map(getFeature))
 
 
 @_extend_pdDataFrame()
-def toEEFeatureCollection(self, latitude=None, longitude=None):
+def toEEFeatureCollection(
+    self,
+    latitude=None,
+    longitude=None,
+    chunkBytes=None,
+    assetId=None,
+    maxWorkers=8,
+    returnSizes=False,
+    precision=None,
+    simplify=None,
+):
     """Converts a pd.DataFrame object into an ee.FeatureCollection object.
 
     If lat/lon coordinates are available, the Data Frame can be converted into
-    a Feature Collection with an associated geometry.
+    a Feature Collection with an associated geometry. If the Data Frame is a
+    geopandas.GeoDataFrame (and no lat/lon columns are specified), its geometries of any
+    type are converted instead: they are encoded in bulk as GeoJSON with shapely,
+    optionally simplified and rounded to shrink the request.
+
+    The rows are encoded column-wise into a single JSON string that is decoded and
+    converted into features by Earth Engine, so no ee.Feature is created per row.
+    Missing values are converted to nulls, datetimes to ISO strings in UTC (naive
+    datetimes are assumed to be in UTC) and floats keep their full precision. Column
+    names must be unique.
+
+    Large Data Frames may exceed the request size limit of Earth Engine. In that case,
+    use chunkBytes and assetId to split the rows into chunks of bounded size that are
+    exported to their own table assets, and merge the assets. Without assetId, the
+    chunks are merged with flatten() into a single Feature Collection whose request
+    contains all of them, so its size is not bounded by chunkBytes.
 
     Tip
     ----------
@@ -30,11 +344,32 @@ def toEEFeatureCollection(self, latitude=None, longitude=None):
     longitude : string
         Name of a longitude column, if available. Coupled with a latitude column,
         an ee.Geometry.Point is created and associated to each Feature.
+    chunkBytes : int, default = None
+        Maximum size in bytes of the rows of each chunk in the serialized request. If
+        None, the rows are not split. Only the export requests of the chunks are bounded
+        (see assetId).
+    assetId : str, default = None
+        If given, each chunk is exported to the table asset '{assetId}_{i}' and the
+        returned Feature Collection merges these assets, so it can only be used once the
+        export tasks are completed. The export tasks are started concurrently.
+    maxWorkers : int, default = 8
+        Maximum number of export tasks started concurrently if assetId is given.
+    returnSizes : boolean, default = False
+        Whether to return the size in bytes of the serialized request of each chunk.
+        Without assetId, the chunks are sent together in the request of the merged
+        Feature Collection: use len(ee.serializer.toJSON(fc)) to get its size.
+    precision : int, default = None
+        Number of decimal places of the coordinates of the geometries of a GeoDataFrame.
+        If None, they are not rounded.
+    simplify : float, default = None
+        Tolerance in degrees to simplify the geometries of a GeoDataFrame (preserving
+        topology). If None, they are not simplified.
 
     Returns
     -------
-    ee.FeatureCollection
-        Data Frame converted into a Feature Collection.
+    ee.FeatureCollection | tuple
+        Data Frame converted into a Feature Collection. If returnSizes = True, a tuple
+        with the Feature Collection and the list of sizes of the chunks.
 
     Examples
     --------
@@ -46,30 +381,96 @@ def toEEFeatureCollection(self, latitude=None, longitude=None):
     >>> df['lon'] = [-76.0269, -75.3188]
     >>> df['name'] = ['Nevado del Huila', 'Nevado del Ruiz']
     >>> fc = df.toEEFeatureCollection(latitude = 'lat',longitude = 'lon')
+
+    Exporting a large Data Frame in chunks of at most 5 MB:
+
+    >>> fc, sizes = largeDf.toEEFeatureCollection(latitude = 'lat',
+    ...                                           longitude = 'lon',
+    ...                                           chunkBytes = 5_000_000,
+    ...                                           assetId = 'users/my-user/my-table',
+    ...                                           returnSizes = True)
+    >>> sizes
+    [4797052, 4797193, 4796978, 1922347]
+
+    Converting a GeoDataFrame of polygons with coordinates rounded to 6 decimal places:
+
+    >>> import geopandas as gpd
+    >>> gdf = gpd.read_file('fields.gpkg')
+    >>> fc = gdf.toEEFeatureCollection(precision = 6)
     """
 
-    def getFeature(r):
-        properties = r.to_dict()
+    names = pd.Index([str(column) for column in self.columns])
+    if names.duplicated().any():
+        duplicated = names[names.duplicated()].unique().tolist()
+        raise Exception(
+            f"Column names must be unique! Duplicated columns: {duplicated}"
+        )
+
+    dataFrame = self
+    lat = lon = geometryTypes = None
+
+    if _is_geodataframe(self) and (latitude == None or longitude == None):
+        geometries, geometryTypes = _encode_geometries(self, precision, simplify)
+        dataFrame = pd.DataFrame(self.drop(columns=self.geometry.name))
+        dataFrame = dataFrame.assign(eemontGeometry=geometries)
+    else:
         if latitude != None and longitude == None:
             warnings.warn(
                 "longitude missing, Feature Collection with no geometries generated!",
                 Warning,
             )
-            return ee.Feature(None, properties)
         elif latitude == None and longitude != None:
             warnings.warn(
                 "latitude missing, Feature Collection with no geometries generated!",
                 Warning,
             )
-            return ee.Feature(None, properties)
-        elif latitude != None and longitude != None:
-            point = ee.Geometry.Point([r[longitude], r[latitude]])
-            return ee.Feature(point, properties)
-        else:
-            return ee.Feature(None, properties)
+        if _is_geodataframe(self):
+            dataFrame = pd.DataFrame(self.drop(columns=self.geometry.name))
+        if latitude != None and longitude != None:
+            lat = dataFrame.columns.get_loc(latitude)
+            lon = dataFrame.columns.get_loc(longitude)
+
+    columns = [str(column) for column in dataFrame.columns]
+    if geometryTypes is not None:
+        columns = columns[:-1]
+
+    if chunkBytes is None:
+        chunks = [_to_json_rows(dataFrame)]
+    else:
+        chunks = _split_json_rows(dataFrame, chunkBytes)
+
+    chunkCollections = [
+        _rows_to_feature_collection(rows, columns, lat, lon, geometryTypes)
+        for rows in chunks
+    ]
+
+    if assetId is not None:
+
+        def exportChunk(i):
+            task = ee.batch.Export.table.toAsset(
+                chunkCollections[i], f"toEEFeatureCollection_{i}", f"{assetId}_{i}"
+            )
+            task.start()
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=maxWorkers) as executor:
+            list(executor.map(_propagate(exportChunk), range(len(chunks))))
+
+        featureCollections = [
+            ee.FeatureCollection(f"{assetId}_{i}") for i in range(len(chunks))
+        ]
+    else:
+        featureCollections = chunkCollections
+
+    if len(featureCollections) == 1:
+        featureCollection = featureCollections[0]
+    else:
+        featureCollection = ee.FeatureCollection(featureCollections).flatten()
 
-    dataFrame = self.copy()
-    dataFrame["feature"] = dataFrame.apply(getFeature, axis=1)
-    featureCollection = ee.FeatureCollection(dataFrame["feature"].tolist())
+    if returnSizes:
+        sizes = [
+            len(ee.serializer.toJSON(chunkCollection))
+            for chunkCollection in chunkCollections
+        ]
+        return featureCollection, sizes
 
     return featureCollection
@@ -2,6 +2,7 @@ import warnings
 
 import ee
 
+from ._evaluation import _get_info
 from .extending import extend
 
 
@@ -32,7 +33,7 @@ def __contains__(self, key):
     >>> "c" in eeDict
     False
     """
-    return self.contains(key).getInfo()
+    return _get_info(self.contains(key))
 
 
 @extend(ee.dictionary.Dictionary)
@@ -2,6 +2,7 @@ import warnings
 
 import ee
 
+from ._evaluation import _get_info
 from .extending import extend
 
 
@@ -32,7 +33,7 @@ def __contains__(self, key):
     >>> 3 in eeList
     False
     """
-    return self.contains(key).getInfo()
+    return _get_info(self.contains(key))
 
 
 @extend(ee.ee_list.List)
@@ -58,7 +59,7 @@ def __len__(self):
     >>> len(eeList)
     4
     """
-    return self.length().getInfo()
+    return _get_info(self.length())
 
 
 @extend(ee.ee_list.List)
@@ -1,3 +1,12 @@
+import functools
+import threading
+import time
+
+_CALLS = threading.local()
+
+_LISTENERS = []
+
+
 def extend(cls, static=False):
     """Extends the cls class.
 
@@ -14,6 +23,117 @@ def extend(cls, static=False):
         Decorator for extending classes.
     """
     if static:
-        return lambda f: (setattr(cls, f.__name__, staticmethod(f)) or f)
+        return lambda f: (setattr(cls, f.__name__, staticmethod(_track(cls, f))) or f)
     else:
-        return lambda f: (setattr(cls, f.__name__, f) or f)
+        return lambda f: (setattr(cls, f.__name__, _track(cls, f)) or f)
+
+
+def _track(cls, f):
+    """Wraps an extension method to notify the listeners of its calls.
+
+    While there are no listeners, the method is called directly. Otherwise, the name
+    of the method is pushed to the stack of extension methods being called in the
+    current thread, and the listeners are called with the name, the result and the
+    time spent in the method once it returns.
+
+    Parameters
+    ----------
+    cls : class
+        Class extended by the method.
+    f : function
+        Extension method.
+
+    Returns
+    -------
+    function
+        Wrapped method.
+    """
+    name = f"{cls.__name__}.{f.__name__}"
+
+    @functools.wraps(f)
+    def tracked(*args, **kwargs):
+        if not _LISTENERS or getattr(_CALLS, "notifying", False):
+            return f(*args, **kwargs)
+        stack = _calling_extensions()
+        stack.append(name)
+        start = time.perf_counter()
+        try:
+            result = f(*args, **kwargs)
+        finally:
+            stack.pop()
+        seconds = time.perf_counter() - start
+        _CALLS.notifying = True
+        try:
+            for listener in list(_LISTENERS):
+                listener(name, result, seconds)
+        finally:
+            _CALLS.notifying = False
+        return result
+
+    return tracked
+
+
+def _calling_extensions():
+    """Gets the names of the extension methods being called in the current thread.
+
+    Returns
+    -------
+    list
+        Names of the methods (e.g. 'Image.maskClouds'), from the outermost call to the
+        innermost one.
+    """
+    if not hasattr(_CALLS, "stack"):
+        _CALLS.stack = []
+    return _CALLS.stack
+
+
+def _add_listener(listener):
+    """Adds a listener of the calls to the extension methods.
+
+    Parameters
+    ----------
+    listener : callable
+        Function called with the name of the method, its result and the time spent in
+        it (in seconds) after each call.
+    """
+    _LISTENERS.append(listener)
+
+
+def _remove_listener(listener):
+    """Removes a listener of the calls to the extension methods.
+
+    Parameters
+    ----------
+    listener : callable
+        Listener to remove.
+    """
+    if listener in _LISTENERS:
+        _LISTENERS.remove(listener)
+
+
+def _propagate(function):
+    """Wraps a function so that, when called in another thread, it is attributed to the
+    extension methods being called in the current thread.
+
+    Parameters
+    ----------
+    function : callable
+        Function to wrap (e.g. a function submitted to a thread pool).
+
+    Returns
+    -------
+    callable
+        Wrapped function.
+    """
+    stack = list(_calling_extensions())
+
+    @functools.wraps(function)
+    def propagated(*args, **kwargs):
+        previous = getattr(_CALLS, "stack", None)
+        _CALLS.stack = list(stack)
+        try:
+            return function(*args, **kwargs)
+        finally:
+            _CALLS.stack = previous if previous is not None else []
+
+    return propagated
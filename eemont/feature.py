@@ -2,7 +2,7 @@ import ee
 import geopy
 from geopy.geocoders import get_geocoder_for_service
 
-from .common import _lnglat_from_location, _retrieve_location
+from ._geocoding import _lnglat_from_location, _retrieve_location, _retrieve_locations
 from .extending import extend
 from .geometry import *
 
@@ -93,6 +93,66 @@ def PointFromQuery(query, geocoder="nominatim", **kwargs):
     return ee.Feature(geometry, location.raw)
 
 
+@extend(ee.feature.Feature, static=True)
+def MultiPointFromQueries(queries, geocoder="nominatim", maxWorkers=8, **kwargs):
+    """Constructs an ee.Feature describing a multi-point from a list of queries
+    submitted concurrently to a geodocer using the geopy package.
+
+    This returns one pair of coordinates per query, in the order of the queries.
+    Identical queries are geocoded once and the requests are limited by the rate limit
+    of the geocoder (Nominatim is limited to 1 request per second). Queries without
+    matches are skipped with a warning. The 'queries' property of the feature lists the
+    geocoded queries.
+
+    Tip
+    ----------
+    Check more info about constructors in the :ref:`User Guide<Constructors>`.
+
+    Parameters
+    ----------
+    queries : list
+        Addresses, queries or structured queries to geocode.
+    geocoder : str | type, default = 'nominatim'
+        Geocoder to use (name of the service or geopy geocoder class). Please visit
+        https://geopy.readthedocs.io/ for more info.
+    maxWorkers : int, default = 8
+        Maximum number of concurrent requests.
+    **kwargs :
+        Keywords arguments for the geocoder. The user_agent argument is mandatory
+        (this argument can be set as user_agent = 'my-gee-username' or user_agent =
+        'my-gee-app-name'). Please visit https://geopy.readthedocs.io/ for more info.
+
+    Returns
+    -------
+    ee.Feature
+        Feature with a geometry describing a multi-point from the specified queries.
+
+    See Also
+    --------
+    PointFromQuery : Constructs an ee.Feature describing a point from a query submitted
+        to a geodocer using the geopy package.
+
+    Examples
+    --------
+    >>> import ee, eemont
+    >>> ee.Authenticate()
+    >>> ee.Initialize()
+    >>> ee.Feature.MultiPointFromQueries(['Cali, Colombia','Bogotá, Colombia'],
+    ...                                  geocoder = 'arcgis')
+    """
+    locations = _retrieve_locations(queries, geocoder, maxWorkers, **kwargs)
+    found = [
+        (query, location)
+        for query, location in zip(queries, locations)
+        if location is not None
+    ]
+    geometry = ee.Geometry.MultiPoint(
+        [_lnglat_from_location(location) for _, location in found]
+    )
+
+    return ee.Feature(geometry, {"queries": [query for query, _ in found]})
+
+
 @extend(ee.feature.Feature, static=True)
 def BBoxFromQuery(query, geocoder="nominatim", **kwargs):
     """Constructs an ee.Feature describing a bounding box from a query submitted to a
@@ -1,8 +1,19 @@
 import ee
 import geopy
+import pandas as pd
 from geopy.geocoders import get_geocoder_for_service
 
-from .common import _retrieve_location
+from ._evaluation import _get_info
+from ._geocoding import _lnglat_from_location, _retrieve_location, _retrieve_locations
+from ._pluscodes import _convert_lnglats_to_pluscodes, _geometry_coordinates
+from ._timeseries import (
+    _features_to_pandas,
+    _get_features,
+    _iter_pages,
+    _load_pyarrow,
+    _pandas_to_arrow,
+    _write_pages,
+)
 from .extending import extend
 from .geometry import *
 
@@ -21,7 +32,7 @@ def __len__(self):
     int
         Size of the feature collection.
     """
-    return self.size().getInfo()
+    return _get_info(self.size())
 
 
 @extend(ee.featurecollection.FeatureCollection)
@@ -141,3 +152,362 @@ def MultiPointFromQuery(query, geocoder="nominatim", **kwargs):
         features.append(feature)
 
     return ee.FeatureCollection(features)
+
+
+@extend(ee.featurecollection.FeatureCollection, static=True)
+def MultiPointFromQueries(queries, geocoder="nominatim", maxWorkers=8, **kwargs):
+    """Constructs an ee.FeatureCollection describing points from a list of queries
+    submitted concurrently to a geodocer using the geopy package.
+
+    This returns one point feature per query, in the order of the queries. The
+    properties of each feature correspond to the raw properties retrieved by the location
+    of the query and the query itself ('query'). Identical queries are geocoded once and
+    the requests are limited by the rate limit of the geocoder (Nominatim is limited to 1
+    request per second). Queries without matches are skipped with a warning.
+
+    Tip
+    ----------
+    Check more info about constructors in the :ref:`User Guide<Constructors>`.
+
+    Parameters
+    ----------
+    queries : list
+        Addresses, queries or structured queries to geocode.
+    geocoder : str | type, default = 'nominatim'
+        Geocoder to use (name of the service or geopy geocoder class). Please visit
+        https://geopy.readthedocs.io/ for more info.
+    maxWorkers : int, default = 8
+        Maximum number of concurrent requests.
+    **kwargs :
+        Keywords arguments for the geocoder. The user_agent argument is mandatory
+        (this argument can be set as user_agent = 'my-gee-username' or user_agent =
+        'my-gee-app-name'). Please visit https://geopy.readthedocs.io/ for more info.
+
+    Returns
+    -------
+    ee.FeatureCollection
+        Feature Collection with point geometries from the specified queries.
+
+    See Also
+    --------
+    MultiPointFromQuery : Constructs an ee.FeatureCollection describing points from a
+        query submitted to a geodocer using the geopy package.
+
+    Examples
+    --------
+    >>> import ee, eemont
+    >>> ee.Authenticate()
+    >>> ee.Initialize()
+    >>> eemont.setGeocoderRateLimit('arcgis', 20)
+    >>> fc = ee.FeatureCollection.MultiPointFromQueries(addresses,
+    ...                                                 geocoder = 'arcgis',
+    ...                                                 maxWorkers = 16)
+    """
+    locations = _retrieve_locations(queries, geocoder, maxWorkers, **kwargs)
+
+    features = []
+
+    for query, location in zip(queries, locations):
+        if location is not None:
+            geometry = ee.Geometry.Point(_lnglat_from_location(location))
+            feature = ee.Feature(geometry, {**location.raw, "query": query})
+            features.append(feature)
+
+    return ee.FeatureCollection(features)
+
+
+@extend(ee.featurecollection.FeatureCollection)
+def iterPages(self, pageSize=5000, format="pandas"):
+    """Retrieves the properties of the features of the feature collection page by page.
+
+    The features are sorted by system:index and each page is retrieved in a separate
+    request, without geometries, and yielded as soon as it is received. Only one page is
+    held in memory at a time.
+
+    Parameters
+    ----------
+    self : ee.FeatureCollection [this]
+        Feature Collection to retrieve.
+    pageSize : int, default = 5000
+        Maximum number of features per page.
+    format : str, default = 'pandas'
+        Format of the pages.\n
+        Available options:
+            - 'pandas' : pd.DataFrame.
+            - 'arrow' : pyarrow.RecordBatch (requires pyarrow).
+
+    Yields
+    ------
+    pd.DataFrame | pyarrow.RecordBatch
+        Properties of the features of each page.
+
+    See Also
+    --------
+    toFile : Writes the properties of the features of the feature collection to a CSV
+        or Parquet file page by page.
+
+    Examples
+    --------
+    >>> import ee, eemont
+    >>> ee.Authenticate()
+    >>> ee.Initialize()
+    >>> fc = ee.FeatureCollection('TIGER/2018/Counties')
+    >>> for page in fc.iterPages(pageSize = 1000):
+    ...     print(len(page))
+    1000
+    1000
+    1000
+    233
+    """
+    return _iter_pages(self, pageSize, format)
+
+
+@extend(ee.featurecollection.FeatureCollection)
+def toFile(self, path, pageSize=5000, fileFormat=None):
+    """Writes the properties of the features of the feature collection to a CSV or
+    Parquet file page by page.
+
+    Pages are retrieved with iterPages() and appended to the file as soon as they are
+    received, so memory stays bounded regardless of the size of the collection. The
+    columns of the first page define the columns of the file.
+
+    Tip
+    ----------
+    This is useful to download large time series retrieved with
+    ee.ImageCollection.getTimeSeriesByRegions().
+
+    Parameters
+    ----------
+    self : ee.FeatureCollection [this]
+        Feature Collection to write.
+    path : str
+        Path of the file.
+    pageSize : int, default = 5000
+        Maximum number of features per page.
+    fileFormat : str, default = None
+        Format of the file. One of 'csv' or 'parquet' (requires pyarrow). If None, it is
+        inferred from the extension of the path ('.csv', '.parquet' or '.pq').
+
+    Returns
+    -------
+    int
+        Number of rows written.
+
+    See Also
+    --------
+    iterPages : Retrieves the properties of the features of the feature collection page
+        by page.
+
+    Examples
+    --------
+    >>> import ee, eemont
+    >>> ee.Authenticate()
+    >>> ee.Initialize()
+    >>> f1 = ee.Feature(ee.Geometry.Point([3.984770,48.767221]).buffer(50),{'ID':'A'})
+    >>> f2 = ee.Feature(ee.Geometry.Point([4.101367,48.748076]).buffer(50),{'ID':'B'})
+    >>> fc = ee.FeatureCollection([f1,f2])
+    >>> S2 = ee.ImageCollection('COPERNICUS/S2_SR').filterBounds(fc).scaleAndOffset()
+    >>> ts = S2.getTimeSeriesByRegions(reducer = ee.Reducer.mean(),
+    ...                                collection = fc,
+    ...                                bands = ['B4','B8'],
+    ...                                scale = 10)
+    >>> ts.toFile('time-series.parquet')
+    """
+    return _write_pages(_iter_pages(self, pageSize), path, fileFormat)
+
+
+@extend(ee.featurecollection.FeatureCollection)
+def toPandas(
+    self,
+    columns=None,
+    naValue=None,
+    dateColumn=None,
+    dateFormat="ISO",
+    pageSize=5000,
+    maxWorkers=8,
+):
+    """Converts the properties of the features of the feature collection to a
+    pd.DataFrame.
+
+    The features are retrieved without geometries and decoded column by column: numeric
+    properties become int64 or float64 columns, naValue becomes NaN and the date column
+    is parsed into datetime64. Large collections are retrieved in concurrent pages.
+
+    Tip
+    ----------
+    This is useful to convert time series retrieved with
+    ee.ImageCollection.getTimeSeriesByRegion() or
+    ee.ImageCollection.getTimeSeriesByRegions(), using their naValue, dateColumn and
+    dateFormat.
+
+    Parameters
+    ----------
+    self : ee.FeatureCollection [this]
+        Feature Collection to convert.
+    columns : list[str], default = None
+        Properties to retrieve. If None, all the properties are retrieved.
+    naValue : numeric, default = None
+        Value to convert to NaN in numeric columns.
+    dateColumn : str, default = None
+        Column to convert to datetime64.
+    dateFormat : str, default = 'ISO'
+        Format of the date column. One of 'ms' (milliseconds), 'ISO' or a custom format
+        pattern.
+    pageSize : int, default = 5000
+        Maximum number of features per request. If None, the collection is retrieved in
+        a single request.
+    maxWorkers : int, default = 8
+        Maximum number of concurrent requests.
+
+    Returns
+    -------
+    pd.DataFrame
+        Properties of the features.
+
+    See Also
+    --------
+    toArrow : Converts the properties of the features of the feature collection to a
+        pyarrow.Table.
+
+    Examples
+    --------
+    >>> import ee, eemont
+    >>> ee.Authenticate()
+    >>> ee.Initialize()
+    >>> f1 = ee.Feature(ee.Geometry.Point([3.984770,48.767221]).buffer(50),{'ID':'A'})
+    >>> f2 = ee.Feature(ee.Geometry.Point([4.101367,48.748076]).buffer(50),{'ID':'B'})
+    >>> fc = ee.FeatureCollection([f1,f2])
+    >>> S2 = ee.ImageCollection('COPERNICUS/S2_SR').filterBounds(fc).scaleAndOffset()
+    >>> ts = S2.getTimeSeriesByRegions(reducer = ee.Reducer.mean(),
+    ...                                collection = fc,
+    ...                                bands = ['B4','B8'],
+    ...                                scale = 10)
+    >>> ts.toPandas(naValue = -9999, dateColumn = 'date')
+    """
+    features = _get_features(self, columns, pageSize, maxWorkers)
+    return _features_to_pandas(features, columns, naValue, dateColumn, dateFormat)
+
+
+@extend(ee.featurecollection.FeatureCollection)
+def toArrow(
+    self,
+    columns=None,
+    naValue=None,
+    dateColumn=None,
+    dateFormat="ISO",
+    pageSize=5000,
+    maxWorkers=8,
+):
+    """Converts the properties of the features of the feature collection to a
+    pyarrow.Table.
+
+    The features are decoded as in toPandas(). NaN values (including naValue) are
+    stored as nulls.
+
+    Warning
+    ----------
+    This method requires pyarrow. Install it with "pip install pyarrow".
+
+    Parameters
+    ----------
+    self : ee.FeatureCollection [this]
+        Feature Collection to convert.
+    columns : list[str], default = None
+        Properties to retrieve. If None, all the properties are retrieved.
+    naValue : numeric, default = None
+        Value to convert to null in numeric columns.
+    dateColumn : str, default = None
+        Column to convert to timestamp.
+    dateFormat : str, default = 'ISO'
+        Format of the date column. One of 'ms' (milliseconds), 'ISO' or a custom format
+        pattern.
+    pageSize : int, default = 5000
+        Maximum number of features per request. If None, the collection is retrieved in
+        a single request.
+    maxWorkers : int, default = 8
+        Maximum number of concurrent requests.
+
+    Returns
+    -------
+    pyarrow.Table
+        Properties of the features.
+
+    See Also
+    --------
+    toPandas : Converts the properties of the features of the feature collection to a
+        pd.DataFrame.
+
+    Examples
+    --------
+    >>> import ee, eemont
+    >>> ee.Authenticate()
+    >>> ee.Initialize()
+    >>> fc = ee.FeatureCollection('TIGER/2018/States')
+    >>> fc.toArrow(columns = ['NAME','ALAND','AWATER'])
+    """
+    pa = _load_pyarrow()
+    features = _get_features(self, columns, pageSize, maxWorkers)
+    frame = _features_to_pandas(features, columns, naValue, dateColumn, dateFormat)
+    return _pandas_to_arrow(frame, pa)
+
+
+@extend(ee.featurecollection.FeatureCollection)
+def plusCodes(self, codeLength=10, pageSize=5000, maxWorkers=8):
+    """Converts the coordinates of the geometries of the features of the feature
+    collection to Plus Codes.
+
+    The geometries of all the features are retrieved together (in concurrent pages of
+    pageSize features) and all their coordinates are converted at once.
+
+    Parameters
+    ----------
+    self : ee.FeatureCollection [this]
+        Feature Collection to convert.
+    codeLength : int, default = 10
+        The number of significant digits in the output codes, between 2 and 15. Shorter
+        codes are less precise.
+    pageSize : int, default = 5000
+        Maximum number of features per request. If None, the collection is retrieved in
+        a single request.
+    maxWorkers : int, default = 8
+        Maximum number of concurrent requests.
+
+    Returns
+    -------
+    pd.Series
+        The coordinates of the geometry of each feature converted to Plus Codes, indexed
+        by the feature IDs (or by their positions, for features without ID). The
+        structure of the Plus Codes of each feature is identical to the structure
+        returned by ee.Geometry.coordinates(). Features without geometry get None.
+
+    See Also
+    --------
+    eemont.geometry.plusCodes : Converts the coordinates of an ee.Geometry to Plus
+        Codes.
+
+    Examples
+    --------
+    >>> import ee, eemont
+    >>> ee.Authenticate()
+    >>> ee.Initialize()
+    >>> f1 = ee.Feature(ee.Geometry.Point([-105, 40]),{'ID':'A'})
+    >>> f2 = ee.Feature(ee.Geometry.Point([-104, 40]),{'ID':'B'})
+    >>> fc = ee.FeatureCollection([f1,f2])
+    >>> fc.plusCodes()
+    id
+    0    85GQ2222+22
+    1    85GR2222+22
+    Name: plusCodes, dtype: object
+    """
+    features = _get_features(self, [], pageSize, maxWorkers, geometries=True)
+    located = [i for i, feature in enumerate(features) if feature.get("geometry")]
+    coordinates = [_geometry_coordinates(features[i]["geometry"]) for i in located]
+
+    codes = [None] * len(features)
+    for i, code in zip(located, _convert_lnglats_to_pluscodes(coordinates, codeLength)):
+        codes[i] = code
+
+    index = pd.Index(
+        [feature.get("id", str(i)) for i, feature in enumerate(features)], name="id"
+    )
+    return pd.Series(codes, index=index, name="plusCodes", dtype=object)
@@ -2,9 +2,8 @@ import ee
 import geopy
 from geopy.geocoders import get_geocoder_for_service
 
-from .common import (_convert_lnglats_to_pluscodes,
-                     _convert_pluscodes_to_lnglats, _lnglat_from_location,
-                     _retrieve_location)
+from ._geocoding import _lnglat_from_location, _retrieve_location, _retrieve_locations
+from ._pluscodes import _convert_lnglats_to_pluscodes, _convert_pluscodes_to_lnglats
 from .extending import extend
 
 
@@ -230,13 +229,67 @@ def MultiPointFromQuery(query, geocoder="nominatim", **kwargs):
     return ee.Geometry.MultiPoint(coords)
 
 
+@extend(ee.geometry.Geometry, static=True)
+def MultiPointFromQueries(queries, geocoder="nominatim", maxWorkers=8, **kwargs):
+    """Constructs an ee.Geometry describing a multi-point from a list of queries
+    submitted concurrently to a geodocer using the geopy package.
+
+    This returns one pair of coordinates per query, in the order of the queries.
+    Identical queries are geocoded once and the requests are limited by the rate limit
+    of the geocoder (Nominatim is limited to 1 request per second). Queries without
+    matches are skipped with a warning.
+
+    Tip
+    ----------
+    Check more info about constructors in the :ref:`User Guide<Constructors>`.
+
+    Parameters
+    ----------
+    queries : list
+        Addresses, queries or structured queries to geocode.
+    geocoder : str | type, default = 'nominatim'
+        Geocoder to use (name of the service or geopy geocoder class). Please visit
+        https://geopy.readthedocs.io/ for more info.
+    maxWorkers : int, default = 8
+        Maximum number of concurrent requests.
+    **kwargs :
+        Keywords arguments for the geocoder. The user_agent argument is mandatory
+        (this argument can be set as user_agent = 'my-gee-username' or user_agent =
+        'my-gee-app-name'). Please visit https://geopy.readthedocs.io/ for more info.
+
+    Returns
+    -------
+    ee.Geometry.MultiPoint
+        Geometry describing a multi-point from the specified queries.
+
+    See Also
+    --------
+    MultiPointFromQuery : Constructs an ee.Geometry describing a multi-point from a
+        query submitted to a geodocer using the geopy package.
+
+    Examples
+    --------
+    >>> import ee, eemont
+    >>> ee.Authenticate()
+    >>> ee.Initialize()
+    >>> ee.Geometry.MultiPointFromQueries(['Cali, Colombia','Bogotá, Colombia'],
+    ...                                   geocoder = 'arcgis')
+    """
+    locations = _retrieve_locations(queries, geocoder, maxWorkers, **kwargs)
+    coords = [
+        _lnglat_from_location(location)
+        for location in locations
+        if location is not None
+    ]
+    return ee.Geometry.MultiPoint(coords)
+
+
 @extend(ee.geometry.Geometry, static=True)
 def PointFromPlusCode(pluscode, geocoder="nominatim", **kwargs):
     """Constructs an ee.Geometry describing a point from a Plus Code.
 
-    If the Plus Code is full, it will be decoded directly using the openlocationcode
-    package. If it is a short Code with a reference location, the reference will be
-    geocoded using the geopy package.
+    If the Plus Code is full, it will be decoded directly. If it is a short Code with a
+    reference location, the reference will be geocoded using the geopy package.
 
     Tip
     ----------
@@ -293,9 +346,8 @@ def PointFromPlusCode(pluscode, geocoder="nominatim", **kwargs):
 def MultiPointFromPlusCodes(pluscodes, geocoder="nominatim", **kwargs):
     """Constructs an ee.Geometry describing multiple points from a list of Plus Codes.
 
-    If the Plus Codes are full, they will be decoded directly using the openlocationcode
-    package. If they are short Codes with reference locations, the references will be
-    geocoded using the geopy package.
+    If the Plus Codes are full, they will be decoded directly. If they are short Codes
+    with reference locations, the references will be geocoded using the geopy package.
 
     Tip
     ----------
@@ -351,9 +403,8 @@ def MultiPointFromPlusCodes(pluscodes, geocoder="nominatim", **kwargs):
 def PolygonFromPlusCodes(pluscodes, geocoder="nominatim", **kwargs):
     """Constructs an ee.Geometry describing a polygon from a list of Plus Codes.
 
-    If the Plus Codes are full, they will be decoded directly using the openlocationcode
-    package. If they are short Codes with reference locations, the references will be
-    geocoded using the geopy package.
+    If the Plus Codes are full, they will be decoded directly. If they are short Codes
+    with reference locations, the references will be geocoded using the geopy package.
 
     Tip
     ----------
@@ -413,9 +464,8 @@ def MultiPolygonFromPlusCodes(pluscodes, geocoder="nominatim", **kwargs):
     """Constructs an ee.Geometry describing multiple polygons from a list of lists of
     Plus Codes.
 
-    If the Plus Codes are full, they will be decoded directly using the openlocationcode
-    package. If they are short Codes with reference locations, the references will be
-    geocoded using the geopy package.
+    If the Plus Codes are full, they will be decoded directly. If they are short Codes
+    with reference locations, the references will be geocoded using the geopy package.
 
     Tip
     ----------
@@ -481,9 +531,8 @@ def MultiPolygonFromPlusCodes(pluscodes, geocoder="nominatim", **kwargs):
 def LineStringFromPlusCodes(pluscodes, geocoder="nominatim", **kwargs):
     """Constructs an ee.Geometry describing a line from a list of Plus Codes.
 
-    If the Plus Codes are full, they will be decoded directly using the openlocationcode
-    package. If they are short Codes with reference locations, the references will be
-    geocoded using the geopy package.
+    If the Plus Codes are full, they will be decoded directly. If they are short Codes
+    with reference locations, the references will be geocoded using the geopy package.
 
     Tip
     ----------
@@ -540,9 +589,8 @@ def MultiLineStringFromPlusCodes(pluscodes, geocoder="nominatim", **kwargs):
     """Constructs an ee.Geometry describing multiple lines from a list of lists of Plus
     Codes.
 
-    If the Plus Codes are full, they will be decoded directly using the openlocationcode
-    package. If they are short Codes with reference locations, the references will be
-    geocoded using the geopy package.
+    If the Plus Codes are full, they will be decoded directly. If they are short Codes
+    with reference locations, the references will be geocoded using the geopy package.
 
     Tip
     ----------
@@ -602,9 +650,8 @@ def MultiLineStringFromPlusCodes(pluscodes, geocoder="nominatim", **kwargs):
 def LinearRingFromPlusCodes(pluscodes, geocoder="nominatim", **kwargs):
     """Constructs an ee.Geometry describing a linear ring from a list of Plus Codes.
 
-    If the Plus Codes are full, they will be decoded directly using the openlocationcode
-    package. If they are short Codes with reference locations, the references will be
-    geocoded using the geopy package.
+    If the Plus Codes are full, they will be decoded directly. If they are short Codes
+    with reference locations, the references will be geocoded using the geopy package.
 
     Tip
     ----------
@@ -665,9 +712,8 @@ def RectangleFromPlusCodes(pluscodes, geocoder="nominatim", **kwargs):
     """Constructs an ee.Geometry describing a rectangle from a list of two Plus Code
     corners.
 
-    If the Plus Codes are full, they will be decoded directly using the openlocationcode
-    package. If they are short Codes with reference locations, the references will be
-    geocoded using the geopy package.
+    If the Plus Codes are full, they will be decoded directly. If they are short Codes
+    with reference locations, the references will be geocoded using the geopy package.
 
     Tip
     ----------
@@ -6,6 +6,17 @@ import ee_extra.Spectral.core
 import ee_extra.Algorithms.core
 import requests
 
+from ._catalog import (
+    _get_citation,
+    _get_DOI,
+    _get_offset_params,
+    _get_scale_params,
+    _get_STAC,
+    _preprocess,
+    _scale_and_offset,
+)
+from ._formulas import _spectral_indices
+from ._operators import _apply_operator, _apply_unary_operator, _lazy_band
 from .extending import extend
 
 
@@ -43,7 +54,9 @@ def __getitem__(self, key):
         selected = self.slice(start, stop)
 
     else:
-        selected = self.select(key)
+        selected = _lazy_band(self, key)
+        if selected is None:
+            selected = self.select(key)
 
     return selected
 
@@ -65,7 +78,7 @@ def __add__(self, other):
     ee.Image
         Addition of two images.
     """
-    return self.add(other)
+    return _apply_operator(self, other, "add", ee.Image)
 
 
 @extend(ee.image.Image)
@@ -85,7 +98,7 @@ def __radd__(self, other):
     ee.Image
         Addition of two images.
     """
-    return self.add(other)
+    return _apply_operator(self, other, "add", ee.Image)
 
 
 @extend(ee.image.Image)
@@ -105,7 +118,7 @@ def __sub__(self, other):
     ee.Image
         Subtraction of two images.
     """
-    return self.subtract(other)
+    return _apply_operator(self, other, "subtract", ee.Image)
 
 
 @extend(ee.image.Image)
@@ -125,7 +138,7 @@ def __rsub__(self, other):
     ee.Image
         Subtraction of two images.
     """
-    return ee.Image(other).subtract(self)
+    return _apply_operator(other, self, "subtract", ee.Image)
 
 
 @extend(ee.image.Image)
@@ -145,7 +158,7 @@ def __mul__(self, other):
     ee.Image
         Multiplication of two images.
     """
-    return self.multiply(other)
+    return _apply_operator(self, other, "multiply", ee.Image)
 
 
 @extend(ee.image.Image)
@@ -165,7 +178,7 @@ def __rmul__(self, other):
     ee.Image
         Multiplication of two images.
     """
-    return self.multiply(other)
+    return _apply_operator(self, other, "multiply", ee.Image)
 
 
 @extend(ee.image.Image)
@@ -185,7 +198,7 @@ def __truediv__(self, other):
     ee.Image
         Division of two images.
     """
-    return self.divide(other)
+    return _apply_operator(self, other, "divide", ee.Image)
 
 
 @extend(ee.image.Image)
@@ -205,7 +218,7 @@ def __rtruediv__(self, other):
     ee.Image
         Division of two images.
     """
-    return ee.Image(other).divide(self)
+    return _apply_operator(other, self, "divide", ee.Image)
 
 
 @extend(ee.image.Image)
@@ -265,7 +278,7 @@ def __mod__(self, other):
     ee.Image
         Modulo of two images.
     """
-    return self.mod(other)
+    return _apply_operator(self, other, "mod", ee.Image)
 
 
 @extend(ee.image.Image)
@@ -285,7 +298,7 @@ def __rmod__(self, other):
     ee.Image
         Modulo of two images.
     """
-    return ee.Image(other).mod(self)
+    return _apply_operator(other, self, "mod", ee.Image)
 
 
 @extend(ee.image.Image)
@@ -305,7 +318,7 @@ def __pow__(self, other):
     ee.Image
         Bsae to the power of two images.
     """
-    return self.pow(other)
+    return _apply_operator(self, other, "pow", ee.Image)
 
 
 @extend(ee.image.Image)
@@ -325,7 +338,7 @@ def __rpow__(self, other):
     ee.Image
         Base to the power of two images.
     """
-    return ee.Image(other).pow(self)
+    return _apply_operator(other, self, "pow", ee.Image)
 
 
 @extend(ee.image.Image)
@@ -425,7 +438,7 @@ def __and__(self, other):
     ee.Image
         Binary operator AND.
     """
-    return self.And(other)
+    return _apply_operator(self, other, "And", ee.Image)
 
 
 @extend(ee.image.Image)
@@ -445,7 +458,7 @@ def __rand__(self, other):
     ee.Image
         Binary operator AND.
     """
-    return ee.Image(other).And(self)
+    return _apply_operator(other, self, "And", ee.Image)
 
 
 @extend(ee.image.Image)
@@ -465,7 +478,7 @@ def __or__(self, other):
     ee.Image
         Binary operator OR.
     """
-    return self.Or(other)
+    return _apply_operator(self, other, "Or", ee.Image)
 
 
 @extend(ee.image.Image)
@@ -485,7 +498,7 @@ def __ror__(self, other):
     ee.Image
         Binary operator OR.
     """
-    return ee.Image(other).Or(self)
+    return _apply_operator(other, self, "Or", ee.Image)
 
 
 @extend(ee.image.Image)
@@ -505,7 +518,7 @@ def __lt__(self, other):
     ee.Image
         Rich comparison LOWER THAN.
     """
-    return self.lt(other)
+    return _apply_operator(self, other, "lt", ee.Image)
 
 
 @extend(ee.image.Image)
@@ -525,7 +538,7 @@ def __le__(self, other):
     ee.Image
         Rich comparison LOWER THAN OR EQUAL.
     """
-    return self.lte(other)
+    return _apply_operator(self, other, "lte", ee.Image)
 
 
 @extend(ee.image.Image)
@@ -545,7 +558,7 @@ def __eq__(self, other):
     ee.Image
         Rich comparison EQUAL.
     """
-    return self.eq(other)
+    return _apply_operator(self, other, "eq", ee.Image)
 
 
 @extend(ee.image.Image)
@@ -565,7 +578,7 @@ def __ne__(self, other):
     ee.Image
         Rich comparison NOT EQUAL.
     """
-    return self.neq(other)
+    return _apply_operator(self, other, "neq", ee.Image)
 
 
 @extend(ee.image.Image)
@@ -585,7 +598,7 @@ def __gt__(self, other):
     ee.Image
         Rich comparison GREATER THAN.
     """
-    return self.gt(other)
+    return _apply_operator(self, other, "gt", ee.Image)
 
 
 @extend(ee.image.Image)
@@ -605,7 +618,7 @@ def __ge__(self, other):
     ee.Image
         Rich comparison GREATER THAN OR EQUAL.
     """
-    return self.gte(other)
+    return _apply_operator(self, other, "gte", ee.Image)
 
 
 @extend(ee.image.Image)
@@ -622,7 +635,7 @@ def __neg__(self):
     ee.Image
         Unary operator NEGATIVE.
     """
-    return self.multiply(-1)
+    return _apply_unary_operator(self, "negate")
 
 
 @extend(ee.image.Image)
@@ -639,7 +652,7 @@ def __invert__(self):
     ee.Image
         Unary operator NOT.
     """
-    return self.Not()
+    return _apply_unary_operator(self, "Not")
 
 
 @extend(ee.image.Image)
@@ -832,6 +845,9 @@ def spectralIndices(
             - 'water' : Compute all water indices.
             - 'snow' : Compute all snow indices.
             - 'urban' : Compute all urban (built-up) indices.
+            - 'soil' : Compute all soil indices.
+            - 'radar' : Compute all radar indices.
+            - 'clouds' : Compute all cloud indices.
             - 'kernel' : Compute all kernel indices.
             - 'all' : Compute all indices listed below.
         Awesome Spectral Indices for GEE:
@@ -940,7 +956,7 @@ def spectralIndices(
 
     >>> S2.spectralIndices('all')
     """
-    return ee_extra.Spectral.core.spectralIndices(
+    return _spectral_indices(
         self,
         index,
         G,
@@ -1099,7 +1115,7 @@ def scale(self):
         DeprecationWarning,
     )
 
-    return ee_extra.STAC.core.scaleAndOffset(self)
+    return _scale_and_offset(self)
 
 
 @extend(ee.image.Image)
@@ -1140,7 +1156,7 @@ def getScaleParams(self):
      'QC_Day': 1.0,
      'QC_Night': 1.0}
     """
-    return ee_extra.STAC.core.getScaleParams(self)
+    return _get_scale_params(self)
 
 
 @extend(ee.image.Image)
@@ -1181,7 +1197,7 @@ def getOffsetParams(self):
      'QC_Day': 0.0,
      'QC_Night': 0.0}
     """
-    return ee_extra.STAC.core.getOffsetParams(self)
+    return _get_offset_params(self)
 
 
 @extend(ee.image.Image)
@@ -1215,7 +1231,7 @@ def scaleAndOffset(self):
     >>> ee.Initialize()
     >>> S2 = ee.ImageCollection('COPERNICUS/S2_SR').first().scaleAndOffset()
     """
-    return ee_extra.STAC.core.scaleAndOffset(self)
+    return _scale_and_offset(self)
 
 
 @extend(ee.image.Image)
@@ -1253,7 +1269,7 @@ def preprocess(self, **kwargs):
     >>> ee.Initialize()
     >>> S2 = ee.ImageCollection('COPERNICUS/S2_SR').first().preprocess()
     """
-    return ee_extra.QA.pipelines.preprocess(self, **kwargs)
+    return _preprocess(self, **kwargs)
 
 
 @extend(ee.image.Image)
@@ -1284,7 +1300,7 @@ def getSTAC(self):
      'gee:type': 'image_collection',
      ...}
     """
-    return ee_extra.STAC.core.getSTAC(self)
+    return _get_STAC(self)
 
 
 @extend(ee.image.Image)
@@ -1313,7 +1329,7 @@ def getDOI(self):
     >>> ee.ImageCollection('NASA/GPM_L3/IMERG_V06').first().getDOI()
     '10.5067/GPM/IMERG/3B-HH/06'
     """
-    return ee_extra.STAC.core.getDOI(self)
+    return _get_DOI(self)
 
 
 @extend(ee.image.Image)
@@ -1346,7 +1362,7 @@ def getCitation(self):
     Accessed: [Data Access Date],
     [doi:10.5067/GPM/IMERG/3B-HH/06](https://doi.org/10.5067/GPM/IMERG/3B-HH/06)'
     """
-    return ee_extra.STAC.core.getCitation(self)
+    return _get_citation(self)
 
 
 @extend(ee.image.Image)
@@ -7,6 +7,18 @@ import ee_extra.Algorithms.core
 import numpy as np
 import requests
 
+from ._catalog import (
+    _get_citation,
+    _get_DOI,
+    _get_offset_params,
+    _get_scale_params,
+    _get_STAC,
+    _preprocess,
+    _scale_and_offset,
+)
+from ._evaluation import _get_info
+from ._formulas import _spectral_indices
+from ._timeseries import _get_time_series_by_regions_chunked, _iter_pages
 from .extending import extend
 
 
@@ -24,7 +36,7 @@ def __len__(self):
     int
         Size of the image collection.
     """
-    return self.size().getInfo()
+    return _get_info(self.size())
 
 
 @extend(ee.imagecollection.ImageCollection)
@@ -334,6 +346,385 @@ def getTimeSeriesByRegions(
     )
 
 
+@extend(ee.imagecollection.ImageCollection)
+def getTimeSeriesByRegionsChunked(
+    self,
+    reducer,
+    collection,
+    bands=None,
+    scale=None,
+    crs=None,
+    crsTransform=None,
+    tileScale=1,
+    dateColumn="date",
+    dateFormat="ISO",
+    naValue=-9999,
+    chunkSize=500,
+    dateWindow=None,
+    chunkBy="count",
+    maxWorkers=8,
+    maxRetries=3,
+    backoff=1.0,
+):
+    """Gets the time series by regions for the given image collection and feature
+    collection in concurrent chunks, and retrieves it as a pandas data frame.
+
+    The feature collection is split into chunks of features and, optionally, the image
+    collection is split into date windows. Each chunk is computed by a separate request,
+    the requests are sent concurrently by a bounded thread pool and failed requests are
+    retried. This keeps every request small enough to avoid the memory and time limits
+    of a single large computation.
+
+    Tip
+    ----------
+    Check more info about time series in the :ref:`User Guide<Time Series By Regions>`.
+
+    Parameters
+    ----------
+    self : ee.ImageCollection (this)
+        Image collection to get the time series from.
+    reducer : ee.Reducer | list[ee.Reducer]
+        Reducer or list of reducers to use for region reduction.
+    collection : ee.FeatureCollection
+        Feature Collection to perform the reductions on. Image reductions are applied to
+        each feature in the collection.
+    bands : str | list[str], default = None
+        Selection of bands to get the time series from. Defaults to all bands in the image
+        collection.
+    scale : numeric, default = None
+        Nomical scale in meters.
+    crs : Projection, default = None
+        The projection to work in. If unspecified, the projection of the image's first
+        band is used. If specified in addition to scale, rescaled to the specified scale.
+    crsTransform : list, default = None
+        The list of CRS transform values. This is a row-major ordering of the 3x2
+        transform matrix. This option is mutually exclusive with 'scale', and replaces
+        any transform already set on the projection.
+    tileScale : numeric, default = 1
+        A scaling factor used to reduce aggregation tile size; using a larger tileScale
+        (e.g. 2 or 4) may enable computations that run out of memory with the default.
+    dateColumn : str, default = 'date'
+        Output name of the date column.
+    dateFormat : str, default = 'ISO'
+        Output format of the date column. Defaults to ISO. Available options: 'ms' (for
+        milliseconds), 'ISO' (for ISO Standard Format) or a custom format pattern.
+    naValue : numeric, default = -9999
+        Value to use as NA when the region reduction doesn't retrieve a value due to
+        masked pixels.
+    chunkSize : int, default = 500
+        Maximum number of features per chunk.
+    dateWindow : numeric, default = None
+        Length in days of the date windows the image collection is split into. If None,
+        the image collection is not split.
+    chunkBy : str, default = 'count'
+        How to group features into chunks.\n
+        Available options:
+            - 'count' : Chunks of consecutive features of the collection.
+            - 'space' : Features are sorted by 1 degree grid cells of their centroids
+              first, so each chunk covers a compact area.
+    maxWorkers : int, default = 8
+        Maximum number of concurrent requests.
+    maxRetries : int, default = 3
+        Maximum number of retries of a chunk that failed with a transient error (e.g. a
+        timeout, too many requests or too many concurrent aggregations). Other errors are
+        raised at once.
+    backoff : float, default = 1.0
+        Seconds to wait before the first retry of a chunk. The wait doubles after each
+        retry.
+
+    Returns
+    -------
+    pd.DataFrame
+        Time series by regions retrieved as a pandas data frame. Chunks are concatenated
+        in order: by chunk of features and, within it, by date window.
+
+    See Also
+    --------
+    getTimeSeriesByRegions : Gets the time series by regions for the given image
+        collection and feature collection according to the specified reducer (or
+        reducers).
+
+    Examples
+    --------
+    >>> import ee, eemont
+    >>> ee.Initialize()
+    >>> fc = ee.FeatureCollection('projects/my-project/assets/my-10k-polygons')
+    >>> S2 = (ee.ImageCollection('COPERNICUS/S2_SR')
+    ...      .filterBounds(fc)
+    ...      .filterDate('2018-01-01','2021-01-01')
+    ...      .maskClouds()
+    ...      .scaleAndOffset()
+    ...      .spectralIndices(['EVI','NDVI']))
+    >>> ts = S2.getTimeSeriesByRegionsChunked(reducer = ee.Reducer.mean(),
+    ...                                       collection = fc,
+    ...                                       bands = ['EVI','NDVI'],
+    ...                                       scale = 10,
+    ...                                       chunkSize = 250,
+    ...                                       dateWindow = 365,
+    ...                                       chunkBy = 'space')
+    """
+    return _get_time_series_by_regions_chunked(
+        self,
+        reducer,
+        collection,
+        bands,
+        scale,
+        crs,
+        crsTransform,
+        tileScale,
+        dateColumn,
+        dateFormat,
+        naValue,
+        chunkSize,
+        dateWindow,
+        chunkBy,
+        maxWorkers,
+        maxRetries,
+        backoff,
+    )
+
+
+@extend(ee.imagecollection.ImageCollection)
+def iterTimeSeriesByRegion(
+    self,
+    reducer,
+    bands=None,
+    geometry=None,
+    scale=None,
+    crs=None,
+    crsTransform=None,
+    bestEffort=False,
+    maxPixels=1e12,
+    tileScale=1,
+    dateColumn="date",
+    dateFormat="ISO",
+    naValue=-9999,
+    pageSize=5000,
+    format="pandas",
+):
+    """Streams the time series by region for the given image collection and geometry
+    page by page.
+
+    The time series of getTimeSeriesByRegion() is retrieved in pages of at most pageSize
+    rows, each one with a separate request, and the pages are yielded as soon as they
+    are received. Only one page is held in memory at a time, regardless of the number
+    of dates in the time series. The rows are sorted by system:index.
+
+    Tip
+    ----------
+    Check more info about time series in the :ref:`User Guide<Time Series By Regions>`.
+
+    Parameters
+    ----------
+    self : ee.ImageCollection (this)
+        Image collection to get the time series from.
+    reducer : ee.Reducer | list[ee.Reducer]
+        Reducer or list of reducers to use for region reduction.
+    bands : str | list[str], default = None
+        Selection of bands to get the time series from. Defaults to all bands in the image
+        collection.
+    geometry : ee.Geometry | ee.Feature | ee.FeatureCollection, default = None
+        Geometry to perform the region reduction. If ee.Feature or ee.FeatureCollection,
+        the geometry() method is called. In order to get reductions by each feature please
+        see the getTimeSeriesByRegions() method. Defaults to the footprint of the first
+        band for each image in the collection.
+    scale : numeric, default = None
+        Nomical scale in meters.
+    crs : Projection, default = None
+        The projection to work in. If unspecified, the projection of the image's first
+        band is used. If specified in addition to scale, rescaled to the specified scale.
+    crsTransform : list, default = None
+        The list of CRS transform values. This is a row-major ordering of the 3x2
+        transform matrix. This option is mutually exclusive with 'scale', and replaces any
+        transform already set on the projection.
+    bestEffort : boolean, default = False
+        If the polygon would contain too many pixels at the given scale, compute and use a
+        larger scale which would allow the operation to succeed.
+    maxPixels : numeric, default = 1e12
+        The maximum number of pixels to reduce.
+    tileScale : numeric, default = 1
+        A scaling factor used to reduce aggregation tile size; using a larger tileScale
+        (e.g. 2 or 4) may enable computations that run out of memory with the default.
+    dateColumn : str, default = 'date'
+        Output name of the date column.
+    dateFormat : str, default = 'ISO'
+        Output format of the date column. Defaults to ISO. Available options: 'ms' (for
+        milliseconds), 'ISO' (for ISO Standard Format) or a custom format pattern.
+    naValue : numeric, default = -9999
+        Value to use as NA when the region reduction doesn't retrieve a value due to
+        masked pixels.
+    pageSize : int, default = 5000
+        Maximum number of rows per page. Each page is retrieved in a separate request.
+    format : str, default = 'pandas'
+        Format of the pages.\n
+        Available options:
+            - 'pandas' : pd.DataFrame.
+            - 'arrow' : pyarrow.RecordBatch (requires pyarrow).
+
+    Yields
+    ------
+    pd.DataFrame | pyarrow.RecordBatch
+        Pages of the time series by region.
+
+    See Also
+    --------
+    getTimeSeriesByRegion : Gets the time series by region for the given image
+        collection and geometry (feature or feature collection are also supported)
+        according to the specified reducer (or reducers).
+    iterTimeSeriesByRegions : Streams the time series by regions for the given image
+        collection and feature collection page by page.
+
+    Examples
+    --------
+    >>> import ee, eemont
+    >>> ee.Initialize()
+    >>> point = ee.Geometry.Point([3.984770,48.767221])
+    >>> S2 = (ee.ImageCollection('COPERNICUS/S2_SR')
+    ...      .filterBounds(point)
+    ...      .scaleAndOffset()
+    ...      .spectralIndices(['EVI','NDVI']))
+    >>> for page in S2.iterTimeSeriesByRegion(reducer = ee.Reducer.mean(),
+    ...                                       geometry = point,
+    ...                                       bands = ['EVI','NDVI'],
+    ...                                       scale = 10,
+    ...                                       pageSize = 1000):
+    ...     print(len(page))
+    """
+    ts = ee_extra.TimeSeries.core.getTimeSeriesByRegion(
+        self,
+        reducer,
+        bands,
+        geometry,
+        scale,
+        crs,
+        crsTransform,
+        bestEffort,
+        maxPixels,
+        tileScale,
+        dateColumn,
+        dateFormat,
+        naValue,
+    )
+    return _iter_pages(ts, pageSize, format)
+
+
+@extend(ee.imagecollection.ImageCollection)
+def iterTimeSeriesByRegions(
+    self,
+    reducer,
+    collection,
+    bands=None,
+    scale=None,
+    crs=None,
+    crsTransform=None,
+    tileScale=1,
+    dateColumn="date",
+    dateFormat="ISO",
+    naValue=-9999,
+    pageSize=5000,
+    format="pandas",
+):
+    """Streams the time series by regions for the given image collection and feature
+    collection page by page.
+
+    The time series of getTimeSeriesByRegions() is retrieved in pages of at most
+    pageSize rows, each one with a separate request, and the pages are yielded as soon
+    as they are received. Only one page is held in memory at a time, regardless of the
+    number of dates and regions in the time series. The rows are sorted by
+    system:index.
+
+    Tip
+    ----------
+    To write the time series to a CSV or Parquet file incrementally, use
+    getTimeSeriesByRegions() followed by ee.FeatureCollection.toFile().
+
+    Parameters
+    ----------
+    self : ee.ImageCollection (this)
+        Image collection to get the time series from.
+    reducer : ee.Reducer | list[ee.Reducer]
+        Reducer or list of reducers to use for region reduction.
+    collection : ee.FeatureCollection
+        Feature Collection to perform the reductions on. Image reductions are applied to
+        each feature in the collection.
+    bands : str | list[str], default = None
+        Selection of bands to get the time series from. Defaults to all bands in the image
+        collection.
+    scale : numeric, default = None
+        Nomical scale in meters.
+    crs : Projection, default = None
+        The projection to work in. If unspecified, the projection of the image's first
+        band is used. If specified in addition to scale, rescaled to the specified scale.
+    crsTransform : list, default = None
+        The list of CRS transform values. This is a row-major ordering of the 3x2
+        transform matrix. This option is mutually exclusive with 'scale', and replaces
+        any transform already set on the projection.
+    tileScale : numeric, default = 1
+        A scaling factor used to reduce aggregation tile size; using a larger tileScale
+        (e.g. 2 or 4) may enable computations that run out of memory with the default.
+    dateColumn : str, default = 'date'
+        Output name of the date column.
+    dateFormat : str, default = 'ISO'
+        Output format of the date column. Defaults to ISO. Available options: 'ms' (for
+        milliseconds), 'ISO' (for ISO Standard Format) or a custom format pattern.
+    naValue : numeric, default = -9999
+        Value to use as NA when the region reduction doesn't retrieve a value due to
+        masked pixels.
+    pageSize : int, default = 5000
+        Maximum number of rows per page. Each page is retrieved in a separate request.
+    format : str, default = 'pandas'
+        Format of the pages.\n
+        Available options:
+            - 'pandas' : pd.DataFrame.
+            - 'arrow' : pyarrow.RecordBatch (requires pyarrow).
+
+    Yields
+    ------
+    pd.DataFrame | pyarrow.RecordBatch
+        Pages of the time series by regions.
+
+    See Also
+    --------
+    getTimeSeriesByRegions : Gets the time series by regions for the given image
+        collection and feature collection according to the specified reducer (or
+        reducers).
+    iterTimeSeriesByRegion : Streams the time series by region for the given image
+        collection and geometry page by page.
+
+    Examples
+    --------
+    >>> import ee, eemont
+    >>> ee.Initialize()
+    >>> f1 = ee.Feature(ee.Geometry.Point([3.984770,48.767221]).buffer(50),{'ID':'A'})
+    >>> f2 = ee.Feature(ee.Geometry.Point([4.101367,48.748076]).buffer(50),{'ID':'B'})
+    >>> fc = ee.FeatureCollection([f1,f2])
+    >>> S2 = (ee.ImageCollection('COPERNICUS/S2_SR')
+    ...      .filterBounds(fc)
+    ...      .scaleAndOffset()
+    ...      .spectralIndices(['EVI','NDVI']))
+    >>> for page in S2.iterTimeSeriesByRegions(reducer = ee.Reducer.mean(),
+    ...                                        collection = fc,
+    ...                                        bands = ['EVI','NDVI'],
+    ...                                        scale = 10,
+    ...                                        format = 'arrow'):
+    ...     print(page.num_rows)
+    """
+    ts = ee_extra.TimeSeries.core.getTimeSeriesByRegions(
+        self,
+        reducer,
+        collection,
+        bands,
+        scale,
+        crs,
+        crsTransform,
+        tileScale,
+        dateColumn,
+        dateFormat,
+        naValue,
+    )
+    return _iter_pages(ts, pageSize, format)
+
+
 @extend(ee.imagecollection.ImageCollection)
 def index(
     self,
@@ -529,6 +920,9 @@ def spectralIndices(
             - 'water' : Compute all water indices.
             - 'snow' : Compute all snow indices.
             - 'urban' : Compute all urban (built-up) indices.
+            - 'soil' : Compute all soil indices.
+            - 'radar' : Compute all radar indices.
+            - 'clouds' : Compute all cloud indices.
             - 'kernel' : Compute all kernel indices.
             - 'all' : Compute all indices listed below.
         Awesome Spectral Indices for GEE:
@@ -637,7 +1031,7 @@ def spectralIndices(
 
     >>> S2.spectralIndices('all')
     """
-    return ee_extra.Spectral.core.spectralIndices(
+    return _spectral_indices(
         self,
         index,
         G,
@@ -796,7 +1190,7 @@ def scale(self):
         DeprecationWarning,
     )
 
-    return ee_extra.STAC.core.scaleAndOffset(self)
+    return _scale_and_offset(self)
 
 
 @extend(ee.imagecollection.ImageCollection)
@@ -838,7 +1232,7 @@ def getScaleParams(self):
      'QC_Day': 1.0,
      'QC_Night': 1.0}
     """
-    return ee_extra.STAC.core.getScaleParams(self)
+    return _get_scale_params(self)
 
 
 @extend(ee.imagecollection.ImageCollection)
@@ -880,7 +1274,7 @@ def getOffsetParams(self):
      'QC_Day': 0.0,
      'QC_Night': 0.0}
     """
-    return ee_extra.STAC.core.getOffsetParams(self)
+    return _get_offset_params(self)
 
 
 @extend(ee.imagecollection.ImageCollection)
@@ -914,7 +1308,7 @@ def scaleAndOffset(self):
     >>> ee.Initialize()
     >>> S2 = ee.ImageCollection('COPERNICUS/S2_SR').scaleAndOffset()
     """
-    return ee_extra.STAC.core.scaleAndOffset(self)
+    return _scale_and_offset(self)
 
 
 @extend(ee.imagecollection.ImageCollection)
@@ -954,7 +1348,7 @@ def preprocess(self, **kwargs):
     >>> ee.Initialize()
     >>> S2 = ee.ImageCollection('COPERNICUS/S2_SR').preprocess()
     """
-    return ee_extra.QA.pipelines.preprocess(self, **kwargs)
+    return _preprocess(self, **kwargs)
 
 
 @extend(ee.imagecollection.ImageCollection)
@@ -985,7 +1379,7 @@ def getSTAC(self):
      'gee:type': 'image_collection',
      ...}
     """
-    return ee_extra.STAC.core.getSTAC(self)
+    return _get_STAC(self)
 
 
 @extend(ee.imagecollection.ImageCollection)
@@ -1014,7 +1408,7 @@ def getDOI(self):
     >>> ee.ImageCollection('NASA/GPM_L3/IMERG_V06').getDOI()
     '10.5067/GPM/IMERG/3B-HH/06'
     """
-    return ee_extra.STAC.core.getDOI(self)
+    return _get_DOI(self)
 
 
 @extend(ee.imagecollection.ImageCollection)
@@ -1047,7 +1441,7 @@ def getCitation(self):
     Accessed: [Data Access Date],
     [doi:10.5067/GPM/IMERG/3B-HH/06](https://doi.org/10.5067/GPM/IMERG/3B-HH/06)'
     """
-    return ee_extra.STAC.core.getCitation(self)
+    return _get_citation(self)
 
 
 @extend(ee.imagecollection.ImageCollection)
@@ -2,6 +2,7 @@ import warnings
 
 import ee
 
+from ._operators import _apply_operator
 from .extending import extend
 
 
@@ -21,7 +22,7 @@ def __add__(self, other):
     ee.Number
         Addition of two numbers.
     """
-    return self.add(other)
+    return _apply_operator(self, other, "add", ee.Number)
 
 
 @extend(ee.ee_number.Number)
@@ -40,7 +41,7 @@ def __radd__(self, other):
     ee.Number
         Addition of two numbers.
     """
-    return self.add(other)
+    return _apply_operator(self, other, "add", ee.Number)
 
 
 @extend(ee.ee_number.Number)
@@ -59,7 +60,7 @@ def __sub__(self, other):
     ee.Number
         Subtraction of two numbers.
     """
-    return self.subtract(other)
+    return _apply_operator(self, other, "subtract", ee.Number)
 
 
 @extend(ee.ee_number.Number)
@@ -78,7 +79,7 @@ def __rsub__(self, other):
     ee.Number
         Subtraction of two numbers.
     """
-    return ee.Number(other).subtract(self)
+    return _apply_operator(other, self, "subtract", ee.Number)
 
 
 @extend(ee.ee_number.Number)
@@ -97,7 +98,7 @@ def __mul__(self, other):
     ee.Number
         Multiplication of two numbers.
     """
-    return self.multiply(other)
+    return _apply_operator(self, other, "multiply", ee.Number)
 
 
 @extend(ee.ee_number.Number)
@@ -116,7 +117,7 @@ def __rmul__(self, other):
     ee.Number
         Multiplication of two numbers.
     """
-    return self.multiply(other)
+    return _apply_operator(self, other, "multiply", ee.Number)
 
 
 @extend(ee.ee_number.Number)
@@ -135,7 +136,7 @@ def __truediv__(self, other):
     ee.Number
         Division of two numbers.
     """
-    return self.divide(other)
+    return _apply_operator(self, other, "divide", ee.Number)
 
 
 @extend(ee.ee_number.Number)
@@ -154,7 +155,7 @@ def __rtruediv__(self, other):
     ee.Number
         Division of two numbers.
     """
-    return ee.Number(other).divide(self)
+    return _apply_operator(other, self, "divide", ee.Number)
 
 
 @extend(ee.ee_number.Number)
@@ -249,7 +250,7 @@ def __pow__(self, other):
     ee.Number
         Bsae to the power of two numbers.
     """
-    return self.pow(other)
+    return _apply_operator(self, other, "pow", ee.Number)
 
 
 @extend(ee.ee_number.Number)
@@ -268,7 +269,7 @@ def __rpow__(self, other):
     ee.Number
         Base to the power of two numbers.
     """
-    return ee.Number(other).pow(self)
+    return _apply_operator(other, self, "pow", ee.Number)
 
 
 @extend(ee.ee_number.Number)
@@ -1,13 +1,40 @@
+import os
+import subprocess
+import sys
+import tempfile
 import unittest
+import warnings
+from unittest import mock
 
 import box
 import ee
+import ee_extra.QA.clouds
+import ee_extra.STAC.utils
+import numpy as np
+import pandas as pd
+from geopy.location import Location
 
 import eemont
 
 ee.Initialize()
 
 
+class FakeGeocoder:
+    """Local geocoder that locates each query at (len(query), 0) and records it."""
+
+    queries = []
+
+    def __init__(self, **kwargs):
+        pass
+
+    def geocode(self, query, exactly_one=True):
+        FakeGeocoder.queries.append(query)
+        if query == "Nowhere":
+            return None
+        location = Location(query, (0, len(query)), {"name": query})
+        return location if exactly_one else [location]
+
+
 class Test(unittest.TestCase):
     """Tests for `eemont` package."""
 
@@ -31,6 +58,382 @@ class Test(unittest.TestCase):
         test = eemont.listIndices(online=True)
         self.assertIsInstance(test, list)
 
+    def test_lazy_catalogs_on_import(self):
+        """Test that importing eemont does not parse any bundled catalog"""
+        code = "import eemont; print(eemont._catalog._load_JSON.cache_info().currsize)"
+        test = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        )
+        self.assertEqual(test.stdout.strip(), "0")
+
+    def test_lazy_catalogs_parsed_once(self):
+        """Test that a bundled catalog is parsed just once"""
+        first = eemont._catalog._load_JSON("spectral-indices-dict.json")
+        second = eemont._catalog._load_JSON("spectral-indices-dict.json")
+        self.assertIs(first, second)
+
+    def test_scale_offset_catalog(self):
+        """Test the packed scale and offset catalog against the JSON catalogs"""
+        catalog = eemont._catalog._load_scale_offset_catalog()
+        scale, offset = catalog.get("COPERNICUS/S2_SR")
+        self.assertEqual(
+            scale,
+            eemont._catalog._load_JSON("ee-catalog-scale.json")["COPERNICUS/S2_SR"],
+        )
+        self.assertEqual(
+            offset,
+            eemont._catalog._load_JSON("ee-catalog-offset.json")["COPERNICUS/S2_SR"],
+        )
+        self.assertIsNone(catalog.get("NOT/A/DATASET"))
+
+    def test_catalogCacheInfo(self):
+        """Test the catalogCacheInfo function"""
+        eemont.clearCatalogCache()
+        S2 = ee.Image(ee.ImageCollection("COPERNICUS/S2_SR").toList(1).get(0))
+        S2.getScaleParams()
+        S2.getOffsetParams()
+        test = eemont.catalogCacheInfo()
+        self.assertEqual(test["platforms"]["misses"], 1)
+        self.assertEqual(test["platforms"]["hits"], 1)
+
+    def test_computeIndices(self):
+        """Test the local computation of spectral indices"""
+        data = {"N": np.array([0.6, 0.5, 0.0]), "R": np.array([0.1, 0.2, 0.0])}
+        test = eemont.computeIndices(data, ["NDVI", "SAVI"], L=0.5)
+        np.testing.assert_allclose(test["NDVI"], [5 / 7, 3 / 7, 0.0])
+        np.testing.assert_allclose(test["SAVI"], [0.625, 0.375, 0.0])
+
+    def test_computeIndices_wavelengths(self):
+        """Test that each wavelength parameter is used by the formulas as passed"""
+        data = {"S1": np.array([0.3]), "N2": np.array([0.2]), "S2": np.array([0.4])}
+        test = eemont.computeIndices(
+            data, "CRSWIR", lambdaN2=800, lambdaS1=1600, lambdaS2=2200
+        )
+        np.testing.assert_allclose(test["CRSWIR"], [0.3 / (0.2 + 0.2 * 800 / 1400)])
+
+    def test_computeIndices_scalars(self):
+        """Test the local computation of spectral indices on scalars"""
+        data = {"N": np.float32(0.6), "R": np.array(0.1)}
+        test = eemont.computeIndices(data, ["NDVI", "SAVI"], L=0.5)
+        self.assertAlmostEqual(test["NDVI"], 5 / 7, places=6)
+        self.assertAlmostEqual(test["SAVI"], 0.625, places=6)
+        test = eemont.computeIndices({"N": np.int64(0), "R": 0}, ["NDVI"])
+        self.assertEqual(test["NDVI"], 0.0)
+
+    def test_computeIndices_missing(self):
+        """Test the warning of the indices whose inputs are missing"""
+        data = {"N": np.array([0.6]), "R": np.array([0.1])}
+        with self.assertWarnsRegex(UserWarning, "inputs for EVI computation: B"):
+            test = eemont.computeIndices(data, ["NDVI", "EVI"])
+        self.assertEqual(list(test), ["NDVI"])
+
+    def test_batch(self):
+        """Test the batched evaluation of the dunder methods"""
+        eeList = ee.List([1, 2, 3])
+        with eemont.batch() as b:
+            size = b.len(eeList)
+            contains = b.contains(ee.Dictionary({"a": 1}), "a")
+            test = len(eeList)
+        self.assertEqual(size.value, 3)
+        self.assertTrue(contains)
+        self.assertEqual(test, 3)
+
+    def test_retry(self):
+        """Test that only the transient errors are retried"""
+        calls = []
+
+        def failing(message):
+            calls.append(message)
+            raise ee.EEException(message)
+
+        with self.assertRaises(ee.EEException):
+            eemont._timeseries._retry(lambda: failing("Band 'B0' not found"), backoff=0)
+        self.assertEqual(len(calls), 1)
+        with self.assertRaises(ee.EEException):
+            eemont._timeseries._retry(
+                lambda: failing("Too many concurrent aggregations."), 2, backoff=0
+            )
+        self.assertEqual(len(calls), 4)
+
+    def test_dateWindow(self):
+        """Test the validation of the date windows of the time series chunks"""
+        collection = ee.ImageCollection("COPERNICUS/S2_SR")
+        points = ee.FeatureCollection([ee.Feature(ee.Geometry.Point([0, 0]))])
+        with self.assertRaisesRegex(Exception, "dateWindow"):
+            eemont._timeseries._get_time_series_chunks(collection, points, dateWindow=0)
+
+    def test_parse_dates(self):
+        """Test the parsing of ISO dates with and without the ISO8601 format"""
+        dates = pd.Series(["2020-01-01T00:00:00", "2020-01-02T12:00:00"])
+        expected = pd.to_datetime(dates)
+        test = eemont._timeseries._parse_dates(dates)
+        self.assertTrue(test.equals(expected))
+
+        toDatetime = pd.to_datetime
+
+        def toDatetimePandas1(arg, format=None, **kwargs):
+            if format == "ISO8601":
+                raise ValueError("'ISO8601' is a bad directive")
+            return toDatetime(arg, format=format, **kwargs)
+
+        with mock.patch.object(pd, "to_datetime", toDatetimePandas1):
+            test = eemont._timeseries._parse_dates(dates)
+        self.assertTrue(test.equals(expected))
+
+    def test_iter_pages(self):
+        """Test the validation and the requests of the paged retrieval"""
+        fc = ee.FeatureCollection("projects/eemont/assets/table")
+        with self.assertRaisesRegex(Exception, "pageSize"):
+            eemont._timeseries._iter_pages(fc, 0)
+        with self.assertRaisesRegex(Exception, "format"):
+            eemont._timeseries._iter_pages(fc, 10, "csv")
+
+        pages = [
+            [{"id": "a", "properties": {"v": 1}}, {"id": "b", "properties": {"v": 2}}],
+            [{"id": "c", "properties": {"v": 3}}],
+        ]
+        requests = []
+
+        def computeValue(obj):
+            requests.append(ee.serializer.toJSON(obj))
+            return pages[len(requests) - 1]
+
+        with mock.patch.object(ee.data, "computeValue", computeValue):
+            test = list(eemont._timeseries._iter_pages(fc, 2))
+        self.assertEqual([page["v"].tolist() for page in test], [[1, 2], [3]])
+        self.assertEqual(len(requests), 2)
+        self.assertNotIn('"b"', requests[0])
+        self.assertIn('"b"', requests[1])
+        self.assertNotIn("offset", "".join(requests))
+
+    def test_time_series_chunks(self):
+        """Test the client-side split of a time series into chunks"""
+        S2 = ee.ImageCollection("COPERNICUS/S2_SR")
+        points = ee.FeatureCollection("projects/eemont/assets/points")
+        day = 86400000
+        info = [["a", "b", "c", "d", "e"], [3, 1, 2, 1, 3], 0, 3 * day, ["B2"]]
+
+        with mock.patch.object(ee.data, "computeValue", lambda obj: info):
+            chunks, bands = eemont._timeseries._get_time_series_chunks(
+                S2, points, chunkSize=2, dateWindow=2
+            )
+        self.assertEqual(bands, ["B2"])
+        self.assertEqual(len(chunks), 3 * 2)
+        self.assertIn('["a", "b"]', ee.serializer.toJSON(chunks[0][1]))
+        self.assertIn('["e"]', ee.serializer.toJSON(chunks[-1][1]))
+
+        with mock.patch.object(ee.data, "computeValue", lambda obj: info):
+            chunks, _ = eemont._timeseries._get_time_series_chunks(
+                S2, points, chunkSize=2, chunkBy="space"
+            )
+        self.assertEqual(len(chunks), 3)
+        self.assertIn('["b", "d"]', ee.serializer.toJSON(chunks[0][1]))
+        self.assertIn('["c", "a"]', ee.serializer.toJSON(chunks[1][1]))
+        self.assertNotIn("Collection.toList", ee.serializer.toJSON(chunks[0][1]))
+
+    def test_time_series_chunked(self):
+        """Test the retries of the chunks of a time series"""
+        S2 = ee.ImageCollection("COPERNICUS/S2_SR")
+        points = ee.FeatureCollection("projects/eemont/assets/points")
+        failures = []
+
+        def computeValue(obj):
+            if isinstance(obj, ee.List):
+                return [["a", "b", "c"], [], 0, 0, ["B2"]]
+            if '"a"' in ee.serializer.toJSON(obj) and not failures:
+                failures.append(obj)
+                raise ee.EEException("Too many concurrent aggregations.")
+            ID = "a" if '"a"' in ee.serializer.toJSON(obj) else "c"
+            return {"features": [{"properties": {"ID": ID}}]}
+
+        with mock.patch.object(ee.data, "computeValue", computeValue):
+            test = eemont._timeseries._get_time_series_by_regions_chunked(
+                S2, ee.Reducer.mean(), points, chunkSize=2, backoff=0
+            )
+        self.assertEqual(len(failures), 1)
+        self.assertEqual(test["ID"].tolist(), ["a", "c"])
+
+    def test_result_cache(self):
+        """Test the cache of the results of the dunder methods"""
+        eeList = ee.List([1, 2, 3])
+        eemont.enableResultCache()
+        len(eeList)
+        len(eeList)
+        test = eemont.resultCacheInfo()
+        eemont.disableResultCache()
+        self.assertEqual(test["hits"], 1)
+        self.assertEqual(test["misses"], 1)
+
+    def test_result_cache_sqlite(self):
+        """Test the persistence of the result cache"""
+        eeList = ee.List([1, 2, 3])
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "results.sqlite")
+            eemont.enableResultCache(path=path)
+            len(eeList)
+            eemont.enableResultCache(path=path)
+            len(eeList)
+            test = eemont.resultCacheInfo()
+            eemont.disableResultCache()
+        self.assertEqual(test["hits"], 1)
+
+    def test_geocoding_cache(self):
+        """Test the cache of the geocoded locations"""
+        FakeGeocoder.queries.clear()
+        eemont.enableGeocodingCache()
+        self.addCleanup(eemont.disableGeocodingCache)
+        for i in range(2):
+            ee.Geometry.PointFromQuery("Cali, Colombia", geocoder=FakeGeocoder)
+            with self.assertRaisesRegex(Exception, "No matches"):
+                ee.Geometry.PointFromQuery("Nowhere", geocoder=FakeGeocoder)
+        test = eemont.geocodingCacheInfo()
+        self.assertEqual(test["hits"], 2)
+        self.assertEqual(FakeGeocoder.queries, ["Cali, Colombia", "Nowhere"])
+
+    def test_geocoder_pool(self):
+        """Test the reuse of the geocoders"""
+        geolocator = eemont.getGeocoder(user_agent="eemont-common-test-geocoder-pool")
+        test = eemont.getGeocoder(user_agent="eemont-common-test-geocoder-pool")
+        self.assertIs(test, geolocator)
+
+    def test_geocoder_rate_limit(self):
+        """Test the token bucket that limits the requests to a geocoding service"""
+        clock = [100.0]
+        sleeps = []
+
+        def sleep(seconds):
+            sleeps.append(seconds)
+            clock[0] += seconds
+
+        eemont.setGeocoderRateLimit(FakeGeocoder, 2)
+        self.addCleanup(eemont.setGeocoderRateLimit, FakeGeocoder, None)
+        FakeGeocoder.queries.clear()
+        with mock.patch.object(eemont._geocoding.time, "monotonic", lambda: clock[0]):
+            with mock.patch.object(eemont._geocoding.time, "sleep", sleep):
+                eemont._geocoding._retrieve_locations(
+                    ["a", "b", "a", "c"], FakeGeocoder, maxWorkers=1
+                )
+                self.assertEqual(FakeGeocoder.queries, ["a", "b", "c"])
+                self.assertEqual(sleeps, [0.5, 0.5])
+                clock[0] += 10
+                eemont._geocoding._retrieve_locations(["d", "e"], FakeGeocoder)
+        self.assertEqual(sleeps, [0.5, 0.5, 0.5])
+
+    def test_formula_table(self):
+        """Test that the formulas are parsed once per catalog"""
+        table = eemont._formulas._get_formula_table(False)
+        self.assertIs(table, eemont._formulas._get_formula_table(False))
+        self.assertIs(table.formula("NDVI"), table.formula("NDVI"))
+
+    def test_formula_compiler(self):
+        """Test the deduplication of shared subexpressions across formulas"""
+        S2 = ee.ImageCollection("COPERNICUS/S2_SR").first()
+        compiler = eemont._formulas._FormulaCompiler(
+            {"N": S2.select("B8"), "R": S2.select("B4")}
+        )
+        NDVI = compiler.image(compiler.compile("(N - R) / (N + R)"))
+        RDVI = compiler.image(compiler.compile("(N - R) / ((N + R) ** 0.5)"))
+        self.assertIs(NDVI.args["image1"], RDVI.args["image1"])
+        self.assertIs(NDVI.args["image2"], RDVI.args["image2"].args["image1"])
+
+    def test_platform_from_graph(self):
+        """Test the offline platform resolution"""
+        S2 = ee.ImageCollection("COPERNICUS/S2_SR").filterDate(
+            "2020-01-01", "2020-02-01"
+        )
+        test = eemont._catalog._get_ID_from_graph(S2.first().maskClouds())
+        self.assertEqual(test, ("COPERNICUS/S2_SR", True))
+
+    def test_platform_from_graph_changed(self):
+        """Test that the offline platform resolution stops where the ID may change"""
+        S2 = ee.ImageCollection("COPERNICUS/S2_SR")
+        preserved = [S2.first().set("a", 1), S2.map(lambda x: x.select("B4"))]
+        changed = [
+            S2.first().set("system:id", "COPERNICUS/S2"),
+            S2.map(lambda x: x.set("system:id", "COPERNICUS/S2")),
+            S2.map(lambda x: ee.Image(1)),
+        ]
+        for x in preserved:
+            self.assertIsNotNone(eemont._catalog._get_ID_from_graph(x))
+        for x in changed:
+            self.assertIsNone(eemont._catalog._get_ID_from_graph(x))
+
+    def test_platform_resolver_scope(self):
+        """Test that platforms are resolved from the graph without patching ee_extra"""
+        self.assertIs(
+            ee_extra.QA.clouds._get_platform_STAC,
+            ee_extra.STAC.utils._get_platform_STAC,
+        )
+        L8 = ee.ImageCollection("LANDSAT/LC08/C02/T1_L2").first()
+        with eemont.traceRequests() as tracer:
+            L8.scaleAndOffset().spectralIndices("NDVI")
+        self.assertEqual(tracer.records, [])
+
+    def test_pluscodes(self):
+        """Test the vectorized Plus Codes encoder and decoder"""
+        coordinates = [[[-105, 40], [-104, 40]], [[-105, 41]]]
+        codes = eemont._pluscodes._convert_lnglats_to_pluscodes(coordinates, 10)
+        self.assertEqual(codes, [["85GQ2222+22", "85GR2222+22"], ["85HQ2222+22"]])
+        test = eemont._pluscodes._convert_pluscodes_to_lnglats(codes, "nominatim")
+        np.testing.assert_allclose(test[0][1], [-103.9999375, 40.0000625])
+        self.assertEqual(len(test[1]), 1)
+
+    def test_recover_pluscodes(self):
+        """Test the recovery of short Plus Codes of mixed lengths"""
+        from openlocationcode import openlocationcode as olc
+
+        lat, lng = 47.37, 8.52
+        codes = [
+            olc.encode(47.3655, 8.5249, length)[prefix:]
+            for length, prefix in [(10, 4), (11, 4), (12, 4), (10, 2), (11, 2), (13, 2)]
+        ]
+        self.assertEqual([len(code) for code in codes], [7, 8, 9, 9, 10, 12])
+        test = eemont._pluscodes._recover_pluscodes(
+            codes, np.full(len(codes), lng), np.full(len(codes), lat)
+        )
+        for code, testLng, testLat in zip(codes, *test):
+            area = olc.decode(olc.recoverNearest(code, lat, lng))
+            self.assertAlmostEqual(testLng, area.longitudeCenter, places=10)
+            self.assertAlmostEqual(testLat, area.latitudeCenter, places=10)
+
+    def test_graphStats(self):
+        """Test the statistics of the graph of an ee object"""
+        S2 = ee.Image("COPERNICUS/S2_SR/20190828T151811_20190828T151809_T18GYT")
+        test = eemont.graphStats(S2.select("B4").add(S2.select("B4")), top=1)
+        self.assertEqual(test["nodes"], 3)
+        self.assertEqual(test["depth"], 3)
+        self.assertEqual(test["duplicated"], 1)
+        self.assertEqual(test["functions"], {"Image.add": 1})
+
+    def test_spectral_indices_depth(self):
+        """Test that the depth of the graph doesn't grow with the number of indices"""
+        S2 = ee.Image("COPERNICUS/S2_SR/20190828T151811_20190828T151809_T18GYT")
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            test = eemont.graphStats(S2.spectralIndices("all"), top=None)
+        self.assertEqual(test["functions"]["Image.addBands"], 1)
+        self.assertEqual(test["functions"]["ImageCollection.toBands"], 1)
+        self.assertLess(test["depth"], 30)
+
+    def test_profileGraphs(self):
+        """Test the profiling of the graphs built by the extension methods"""
+        S2 = ee.Image("COPERNICUS/S2_SR/20190828T151811_20190828T151809_T18GYT")
+        with eemont.profileGraphs() as profiler:
+            S2.spectralIndices("NDVI")
+            S2["B4"]
+        self.assertEqual(len(profiler.records), 1)
+        self.assertEqual(profiler.records[0]["method"], "Image.spectralIndices")
+
+    def test_traceRequests(self):
+        """Test the tracing of the requests sent to Earth Engine"""
+        eeList = ee.List([1, 2, 3])
+        with eemont.traceRequests() as tracer:
+            for i in range(3):
+                2 in eeList
+        test = tracer.summary()["List.__contains__"]
+        self.assertEqual(test["calls"], 3)
+        self.assertEqual(test["requests"], 3)
+
 
 if __name__ == "__main__":
     unittest.main()
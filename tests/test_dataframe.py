@@ -1,4 +1,6 @@
+import importlib.util
 import unittest
+from unittest import mock
 
 import ee
 import pandas as pd
@@ -22,6 +24,72 @@ class Test(unittest.TestCase):
         dataframe_tested = df.toEEFeatureCollection("y", "x")
         self.assertIsInstance(dataframe_tested, ee.featurecollection.FeatureCollection)
 
+    def test_dataframe_no_geometries(self):
+        """Test the image module for pd.DataFrame with missing values"""
+        dataframe_tested = df.reindex([0, 1, 2]).toEEFeatureCollection()
+        self.assertEqual(dataframe_tested.size().getInfo(), 3)
+
+    def test_json_rows(self):
+        """Test the encoding of the rows of a pd.DataFrame"""
+        dates = pd.to_datetime(["2020-01-01", None])
+        test = pd.DataFrame(
+            {
+                "value": [0.1 + 0.2, float("nan")],
+                "naive": dates,
+                "aware": dates.tz_localize("America/Bogota"),
+            }
+        )
+        self.assertEqual(
+            dataframe._to_json_rows(test),
+            '[[0.30000000000000004,"2020-01-01T00:00:00.000Z","2020-01-01T05:00:00.000Z"],'
+            "[null,null,null]]",
+        )
+
+    def test_dataframe_duplicated_columns(self):
+        """Test the image module for pd.DataFrame with duplicated column names"""
+        test = pd.concat([df, df[["z"]]], axis=1)
+        with self.assertRaisesRegex(Exception, "Duplicated columns: \\['z'\\]"):
+            test.toEEFeatureCollection("y", "x")
+
+    def test_dataframe_chunks(self):
+        """Test the image module for pd.DataFrame in chunks"""
+        self.assertEqual(len(dataframe._split_json_rows(df, 30)), 2)
+        dataframe_tested, sizes = df.toEEFeatureCollection(
+            "y", "x", chunkBytes=30, returnSizes=True
+        )
+        self.assertEqual(len(sizes), 2)
+
+    def test_dataframe_chunks_assets(self):
+        """Test the image module for pd.DataFrame in chunks exported to assets"""
+        with mock.patch.object(ee.batch.Export.table, "toAsset") as toAsset:
+            dataframe_tested, sizes = df.toEEFeatureCollection(
+                "y", "x", chunkBytes=30, assetId="users/eemont/df", returnSizes=True
+            )
+        self.assertEqual(toAsset.call_count, 2)
+        self.assertEqual(toAsset.return_value.start.call_count, 2)
+        self.assertEqual(len(sizes), 2)
+        self.assertIn("users/eemont/df_1", ee.serializer.toJSON(dataframe_tested))
+
+    @unittest.skipUnless(importlib.util.find_spec("geopandas"), "requires geopandas")
+    def test_geodataframe(self):
+        """Test the image module for gpd.GeoDataFrame"""
+        import geopandas as gpd
+
+        gdf = gpd.GeoDataFrame(
+            df, geometry=gpd.points_from_xy(df["x"], df["y"]).buffer(0.01), crs=4326
+        )
+        dataframe_tested = gdf.toEEFeatureCollection(precision=6)
+        self.assertEqual(dataframe_tested.size().getInfo(), 2)
+
+    @unittest.skipUnless(importlib.util.find_spec("geopandas"), "requires geopandas")
+    def test_geodataframe_no_geometries(self):
+        """Test the image module for gpd.GeoDataFrame with missing geometries"""
+        import geopandas as gpd
+
+        gdf = gpd.GeoDataFrame(df, geometry=[None, None], crs=4326)
+        dataframe_tested = gdf.toEEFeatureCollection()
+        self.assertEqual(dataframe_tested.size().getInfo(), 2)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,12 +1,31 @@
+import importlib.util
+import os
+import tempfile
 import unittest
+from unittest import mock
 
 import ee
+import pandas as pd
+from geopy.location import Location
 
 from eemont import featurecollection
 
 ee.Initialize()
 
 
+class FakeGeocoder:
+    """Local geocoder that locates each query at (len(query), 0) and records it."""
+
+    queries = []
+
+    def __init__(self, **kwargs):
+        pass
+
+    def geocode(self, query, exactly_one=True):
+        FakeGeocoder.queries.append(query)
+        return Location(query, (0, len(query)), {"name": query})
+
+
 class Test(unittest.TestCase):
     """Tests for `eemont` package."""
 
@@ -29,6 +48,100 @@ class Test(unittest.TestCase):
         )
         self.assertIsInstance(test, ee.featurecollection.FeatureCollection)
 
+    def test_MultiPointFromQueries(self):
+        """Test the MultiPointFromQueries constructor"""
+        FakeGeocoder.queries.clear()
+        test = ee.FeatureCollection.MultiPointFromQueries(
+            ["a", "bb", "a"], geocoder=FakeGeocoder
+        )
+        self.assertEqual(sorted(FakeGeocoder.queries), ["a", "bb"])
+        features = test.args["features"]
+        self.assertEqual(len(features), 3)
+        self.assertEqual(
+            [feature.args["metadata"]["query"] for feature in features],
+            ["a", "bb", "a"],
+        )
+
+    def test_Iter_Pages(self):
+        """Test the paged retrieval"""
+        test = ee.FeatureCollection("TIGER/2018/States").iterPages(pageSize=10)
+        self.assertIsInstance(len(next(test)), int)
+
+    def test_To_File(self):
+        """Test the incremental file writing"""
+        with tempfile.TemporaryDirectory() as directory:
+            test = ee.FeatureCollection("TIGER/2018/States").toFile(
+                os.path.join(directory, "states.csv"), pageSize=20
+            )
+        self.assertIsInstance(test, int)
+
+    def test_To_Pandas(self):
+        """Test the conversion to pandas"""
+        test = ee.FeatureCollection("TIGER/2018/States").toPandas(
+            columns=["NAME", "ALAND"], pageSize=20
+        )
+        self.assertIsInstance(test, pd.DataFrame)
+
+    @unittest.skipUnless(importlib.util.find_spec("pyarrow"), "requires pyarrow")
+    def test_To_Arrow(self):
+        """Test the conversion to pyarrow"""
+        test = ee.FeatureCollection(
+            [ee.Feature(None, {"ID": i, "value": [1.5, -9999][i]}) for i in range(2)]
+        ).toArrow(naValue=-9999)
+        self.assertEqual(test.column("ID").to_pylist(), [0, 1])
+        self.assertEqual(test.column("value").to_pylist(), [1.5, None])
+
+    @unittest.skipUnless(importlib.util.find_spec("pyarrow"), "requires pyarrow")
+    def test_Iter_Pages_Arrow(self):
+        """Test the paged retrieval as record batches"""
+        import pyarrow as pa
+
+        test = ee.FeatureCollection(
+            [ee.Feature(None, {"ID": i}) for i in range(3)]
+        ).iterPages(pageSize=2, format="arrow")
+        test = list(test)
+        self.assertTrue(all(isinstance(page, pa.RecordBatch) for page in test))
+        self.assertEqual([page.num_rows for page in test], [2, 1])
+
+    @unittest.skipUnless(importlib.util.find_spec("pyarrow"), "requires pyarrow")
+    def test_To_File_Parquet(self):
+        """Test the incremental Parquet writing"""
+        import pyarrow.parquet as pq
+
+        fc = ee.FeatureCollection(
+            [ee.Feature(None, {"ID": i, "name": str(i)}) for i in range(3)]
+        )
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "features.parquet")
+            test = fc.toFile(path, pageSize=2)
+            table = pq.read_table(path)
+        self.assertEqual(test, 3)
+        self.assertEqual(table.column("ID").to_pylist(), [0, 1, 2])
+        self.assertEqual(table.column("name").to_pylist(), ["0", "1", "2"])
+
+    def test_plusCodes(self):
+        """Test the conversion of the geometries to plus codes"""
+        f1 = ee.Feature(ee.Geometry.Point([-105, 40]), {"ID": "A"})
+        f2 = ee.Feature(ee.Geometry.Point([-104, 40]), {"ID": "B"})
+        test = ee.FeatureCollection([f1, f2]).plusCodes()
+        self.assertEqual(test.tolist(), ["85GQ2222+22", "85GR2222+22"])
+
+    def test_plusCodes_no_ids(self):
+        """Test the conversion to plus codes of features without IDs"""
+        features = [
+            {
+                "type": "Feature",
+                "geometry": {"type": "Point", "coordinates": [-105, 40]},
+            },
+            {"type": "Feature", "geometry": None},
+        ]
+        with mock.patch.object(
+            featurecollection, "_get_features", lambda *a, **k: features
+        ):
+            test = ee.FeatureCollection([]).plusCodes()
+        self.assertEqual(test.index.tolist(), ["0", "1"])
+        self.assertEqual(test.tolist(), ["85GQ2222+22", None])
+
 
 if __name__ == "__main__":
     unittest.main()
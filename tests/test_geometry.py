@@ -1,12 +1,27 @@
+import collections
 import unittest
 
 import ee
+from geopy.location import Location
 
 from eemont import geometry
 
 ee.Initialize()
 
 
+class FakeGeocoder:
+    """Local geocoder that locates every query in Denver and records it."""
+
+    queries = []
+
+    def __init__(self, **kwargs):
+        pass
+
+    def geocode(self, query, exactly_one=True):
+        FakeGeocoder.queries.append(query)
+        return Location(query, (39.74, -104.99), {"name": query})
+
+
 class Test(unittest.TestCase):
     """Tests for `eemont` package."""
 
@@ -65,6 +80,22 @@ class Test(unittest.TestCase):
         test = ee.Geometry.PolygonFromPlusCodes(codes)
         self.assertIsInstance(test, ee.geometry.Geometry)
 
+    def test_PolygonFromShortPlusCodes(self):
+        """Test that each distinct reference of short plus codes is geocoded once"""
+        FakeGeocoder.queries.clear()
+        codes = [
+            "QXGV+XH Denver, CO, USA",
+            "QXGW+XH Denver, CO, USA",
+            "QXHV+XH Denver, CO",
+            "QXHW+XH Denver, CO, USA",
+        ]
+        test = ee.Geometry.PolygonFromPlusCodes(codes, geocoder=FakeGeocoder)
+        self.assertIsInstance(test, ee.geometry.Geometry)
+        self.assertEqual(
+            collections.Counter(FakeGeocoder.queries),
+            {"Denver, CO, USA": 1, "Denver, CO": 1},
+        )
+
     def test_MultiPolygonFromPlusCodes(self):
         """Test the MultiPolygonFromPlusCodes constructor with a list of lists of plus codes"""
         codes = [
@@ -2,6 +2,7 @@ import unittest
 
 import ee
 
+import eemont
 from eemont import image
 
 ee.Initialize()
@@ -105,6 +106,47 @@ class Test(unittest.TestCase):
         unary_tested = unary_tested_a + unary_tested_b
         self.assertIsInstance(unary_tested, ee.image.Image)
 
+    def test_constant_folding(self):
+        """Test the constant folding of the arithmetic operators"""
+        eemont.enableConstantFolding()
+        self.addCleanup(eemont.disableConstantFolding)
+        merged = (S2 + 1) + 2
+        self.assertIs(merged.args["image1"], S2)
+        self.assertEqual(merged.args["image2"].args["value"], 3)
+        self.assertIsNot(S2 * 1, S2)
+        self.assertIsNot(S2 * 1.0, S2)
+        self.assertIsNot((S2 * 2) * 0.5, S2)
+
+    def test_lazy_operators(self):
+        """Test the fusion of the operators into a single expression"""
+        eemont.enableLazyOperators()
+        self.addCleanup(eemont.disableLazyOperators)
+        test = ~((S2["B8"] - L8C2["SR_B5"]) > 0) & (-S2["B4"] < 2) | (S2["B2"] == 1)
+        expression = (
+            "((!(((b('B8') - v0.SR_B5) > 0)) && (-(b('B4')) < 2)) || (b('B2') == 1))"
+        )
+        self.assertIsInstance(test, ee.image.Image)
+        self.assertIn(expression, ee.serializer.toJSON(test))
+        self.assertIn("func", vars(test))
+        self.assertIn("args", vars(test))
+
+    def test_lazy_operators_eager(self):
+        """Test the operations that can't be fused into an expression"""
+        eemont.enableLazyOperators()
+        self.addCleanup(eemont.disableLazyOperators)
+        tests = [
+            -ee.Image(5),
+            ~ee.Image(1),
+            S2 * float("nan"),
+            S2["B4"] * float("inf"),
+            S2 * 2,
+            S2 + L8C2,
+            S2["B4"] + L8C2,
+            -S2,
+        ]
+        for test in tests:
+            self.assertNotIn("Image.parseExpression", ee.serializer.toJSON(test))
+
     # SENTINEL MISSIONS
 
     def test_S3(self):
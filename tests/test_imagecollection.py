@@ -1,6 +1,7 @@
 import unittest
 
 import ee
+import pandas as pd
 
 from eemont import imagecollection
 
@@ -84,6 +85,20 @@ class Test(unittest.TestCase):
         test = S2.getTimeSeriesByRegions(ee.Reducer.mean(), points, "B2", 100)
         self.assertIsInstance(test, ee.featurecollection.FeatureCollection)
 
+    def test_TS_Regions_Chunked(self):
+        """Test the chunked time series by regions"""
+        test = S2.filterDate("2020-01-01", "2020-03-01").getTimeSeriesByRegionsChunked(
+            ee.Reducer.mean(), points, "B2", 100, chunkSize=1, dateWindow=30
+        )
+        self.assertIsInstance(test, pd.DataFrame)
+
+    def test_TS_Regions_Iter(self):
+        """Test the streamed time series by regions"""
+        test = S2.filterDate("2020-01-01", "2020-03-01").iterTimeSeriesByRegions(
+            ee.Reducer.mean(), points, "B2", 100, pageSize=10
+        )
+        self.assertIsInstance(next(test), pd.DataFrame)
+
     # CONTAINER EMULATION METHODS
 
     def test_Container_Get_Item_By_Key(self):
@@ -2,6 +2,7 @@ import unittest
 
 import ee
 
+import eemont
 from eemont import number
 
 ee.Initialize()
@@ -14,7 +15,7 @@ class Test(unittest.TestCase):
 
     def test_binary1(self):
         """Test the number module for binary operators 1"""
-        binary1_tested = ee.Number(1) + 0 - 0 * 1 / 1 // 1 % 1 ** 1 << 1 >> 1
+        binary1_tested = ee.Number(1) + 0 - 0 * 1 / 1 // 1 % 1**1 << 1 >> 1
         self.assertIsInstance(binary1_tested, ee.ee_number.Number)
 
     def test_binary2(self):
@@ -32,6 +33,19 @@ class Test(unittest.TestCase):
         unary_tested = unary_tested_a + unary_tested_b
         self.assertIsInstance(unary_tested, ee.ee_number.Number)
 
+    def test_constant_folding(self):
+        """Test the constant folding of the arithmetic operators"""
+        eemont.enableConstantFolding()
+        self.addCleanup(eemont.disableConstantFolding)
+        folded = ee.Number(2) * 3 + 1
+        merged = (ee.Number.parse("5") + 1) + 2
+        unmerged = (ee.Number.parse("5") + 0.1) + 0.2
+        number = ee.Number.parse("5")
+        self.assertIs((number * 1 + 0) / 1, number)
+        self.assertEqual(folded.encode(None), 7)
+        self.assertEqual(merged.args["right"].encode(None), 3)
+        self.assertEqual(unmerged.args["right"].encode(None), 0.2)
+
 
 if __name__ == "__main__":
     unittest.main()